@@ -0,0 +1,44 @@
+"""Add rate limit tables
+
+Revision ID: 3f1c2a9b7d40
+Revises: dd9e8cb112a6
+Create Date: 2026-10-19 09:12:03.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c2a9b7d40"
+down_revision: Union[str, None] = "dd9e8cb112a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_buckets",
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("tokens", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_table(
+        "rate_limit_leases",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_rate_limit_leases_key"), "rate_limit_leases", ["key"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_rate_limit_leases_key"), table_name="rate_limit_leases")
+    op.drop_table("rate_limit_leases")
+    op.drop_table("rate_limit_buckets")
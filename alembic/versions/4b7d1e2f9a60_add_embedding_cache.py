@@ -0,0 +1,34 @@
+"""Add embedding cache
+
+Revision ID: 4b7d1e2f9a60
+Revises: c52d7e9a4f13
+Create Date: 2026-10-19 16:22:48.091536
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4b7d1e2f9a60"
+down_revision: Union[str, None] = "c52d7e9a4f13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "embedding_cache",
+        sa.Column("model", sa.String(length=255), nullable=False),
+        sa.Column("text_hash", sa.String(length=64), nullable=False),
+        sa.Column("dimensions", sa.Integer(), nullable=False),
+        sa.Column("embedding", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("model", "text_hash"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("embedding_cache")
@@ -0,0 +1,68 @@
+"""Add meal catalog tables
+
+Revision ID: 8a4e6f0c1b27
+Revises: 3f1c2a9b7d40
+Create Date: 2026-10-19 11:40:27.502113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "8a4e6f0c1b27"
+down_revision: Union[str, None] = "3f1c2a9b7d40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "meals",
+        sa.Column("id", sa.String(length=64), nullable=False),
+        sa.Column("database_id", sa.String(length=64), nullable=False),
+        sa.Column("title", sa.String(length=500), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("cuisine_type", sa.String(length=255), nullable=True),
+        sa.Column("prep_time", sa.Integer(), nullable=True),
+        sa.Column("cook_time", sa.Integer(), nullable=True),
+        sa.Column("difficulty", sa.String(length=255), nullable=True),
+        sa.Column("ingredients", sa.JSON(), nullable=True),
+        sa.Column("tags", sa.JSON(), nullable=True),
+        sa.Column("last_made", sa.DateTime(), nullable=True),
+        sa.Column("rating", sa.Integer(), nullable=True),
+        sa.Column("page_content", sa.Text(), nullable=True),
+        sa.Column("raw_notion_data", sa.JSON(), nullable=True),
+        sa.Column(
+            "notion_last_edited_time", sa.DateTime(timezone=True), nullable=False
+        ),
+        sa.Column("synced_at", sa.DateTime(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_meals_database_id"), "meals", ["database_id"], unique=False
+    )
+    op.create_index(op.f("ix_meals_title"), "meals", ["title"], unique=False)
+    op.create_index(
+        op.f("ix_meals_cuisine_type"), "meals", ["cuisine_type"], unique=False
+    )
+
+    op.create_table(
+        "notion_sync_state",
+        sa.Column("database_id", sa.String(length=64), nullable=False),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_synced_at", sa.DateTime(), nullable=True),
+        sa.Column("last_full_scan_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("database_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("notion_sync_state")
+    op.drop_index(op.f("ix_meals_cuisine_type"), table_name="meals")
+    op.drop_index(op.f("ix_meals_title"), table_name="meals")
+    op.drop_index(op.f("ix_meals_database_id"), table_name="meals")
+    op.drop_table("meals")
@@ -0,0 +1,55 @@
+"""Unique generated meal plan per user and week
+
+Revision ID: b6d2f8a3c915
+Revises: 7c3e9b5d2a14
+Create Date: 2026-10-19 21:12:44.208531
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b6d2f8a3c915"
+down_revision: Union[str, None] = "7c3e9b5d2a14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the latest plan of each user and week; past meals of the dropped
+    # plans move to it
+    op.execute(
+        """
+        WITH ranked AS (
+            SELECT id, first_value(id) OVER (
+                PARTITION BY user_id, week_starting ORDER BY id DESC
+            ) AS keep_id
+            FROM generated_meal_plans
+        )
+        UPDATE past_meals SET plan_id = ranked.keep_id
+        FROM ranked
+        WHERE past_meals.plan_id = ranked.id AND ranked.id <> ranked.keep_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM generated_meal_plans AS p
+        USING generated_meal_plans AS newer
+        WHERE newer.user_id = p.user_id
+            AND newer.week_starting = p.week_starting
+            AND newer.id > p.id
+        """
+    )
+    op.create_unique_constraint(
+        "uq_generated_meal_plans_user_week",
+        "generated_meal_plans",
+        ["user_id", "week_starting"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "uq_generated_meal_plans_user_week", "generated_meal_plans", type_="unique"
+    )
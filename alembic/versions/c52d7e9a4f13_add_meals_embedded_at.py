@@ -0,0 +1,26 @@
+"""Add embedded_at to meals
+
+Revision ID: c52d7e9a4f13
+Revises: 8a4e6f0c1b27
+Create Date: 2026-10-19 14:05:12.318440
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c52d7e9a4f13"
+down_revision: Union[str, None] = "8a4e6f0c1b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("meals", sa.Column("embedded_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("meals", "embedded_at")
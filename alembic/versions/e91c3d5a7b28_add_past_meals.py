@@ -0,0 +1,58 @@
+"""Add past meals
+
+Revision ID: e91c3d5a7b28
+Revises: 4b7d1e2f9a60
+Create Date: 2026-10-19 17:48:03.662914
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e91c3d5a7b28"
+down_revision: Union[str, None] = "4b7d1e2f9a60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_table(
+        "past_meals",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("week_start", sa.Date(), nullable=False),
+        sa.Column("meal_date", sa.Date(), nullable=False),
+        sa.Column("slot", sa.String(length=16), nullable=False),
+        sa.Column("name", sa.String(length=500), nullable=False),
+        sa.Column("normalized_name", sa.String(length=500), nullable=False),
+        sa.Column("source", sa.String(length=16), nullable=False),
+        sa.Column("plan_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["plan_id"], ["generated_meal_plans.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id", "meal_date", "slot", name="uq_past_meals_user_slot"
+        ),
+    )
+    op.create_index(
+        "ix_past_meals_user_week", "past_meals", ["user_id", "week_start"], unique=False
+    )
+    op.create_index(
+        "ix_past_meals_normalized_name_trgm",
+        "past_meals",
+        ["normalized_name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"normalized_name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_past_meals_normalized_name_trgm", table_name="past_meals")
+    op.drop_index("ix_past_meals_user_week", table_name="past_meals")
+    op.drop_table("past_meals")
@@ -4,7 +4,8 @@ import { RunRequest } from "@/types/agent";
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
 const TOKEN_KEY = "access_token";
-/** 7 days in seconds, match backend token expiry */
+const REFRESH_TOKEN_KEY = "refresh_token";
+/** 7 days in seconds, match backend refresh token expiry */
 const TOKEN_MAX_AGE = 60 * 60 * 24 * 7;
 
 class ApiError extends Error {
@@ -22,9 +23,10 @@ function getToken(): string | null {
   return null;
 }
 
-function setToken(token: string): void {
+function setTokens(token: string, refreshToken: string): void {
   if (typeof window !== "undefined") {
     localStorage.setItem(TOKEN_KEY, token);
+    localStorage.setItem(REFRESH_TOKEN_KEY, refreshToken);
     // Set cookie on this origin so Next.js middleware sees it (backend cookie is on API domain only)
     const secure = window.location.protocol === "https:";
     document.cookie = `access_token=${encodeURIComponent(token)}; path=/; max-age=${TOKEN_MAX_AGE}; SameSite=Lax${secure ? "; Secure" : ""}`;
@@ -34,17 +36,75 @@ function setToken(token: string): void {
 function removeToken(): void {
   if (typeof window !== "undefined") {
     localStorage.removeItem(TOKEN_KEY);
+    localStorage.removeItem(REFRESH_TOKEN_KEY);
     document.cookie = "access_token=; path=/; max-age=0";
   }
 }
 
-async function fetchApi<T>(
-  endpoint: string,
-  options: RequestInit = {}
-): Promise<T> {
-  const url = `${API_URL}${endpoint}`;
-  const token = getToken();
+function getRefreshToken(): string | null {
+  if (typeof window !== "undefined") {
+    return localStorage.getItem(REFRESH_TOKEN_KEY);
+  }
+  return null;
+}
+
+// Access tokens are short-lived; concurrent 401s share one refresh
+let refreshing: Promise<boolean> | null = null;
+// Web Lock held while refreshing, so tabs refresh one at a time
+const REFRESH_LOCK = "mealworm-token-refresh";
+
+/** Run `refresh` under a lock shared by every tab, where Web Locks are supported */
+async function withRefreshLock(refresh: () => Promise<boolean>): Promise<boolean> {
+  if (typeof navigator !== "undefined" && navigator.locks) {
+    return navigator.locks.request(REFRESH_LOCK, refresh);
+  }
+  return refresh();
+}
+
+/**
+ * Replace the expired access token `staleToken`.
+ * Refresh tokens rotate on use, so a token another tab already used fails.
+ */
+async function refreshTokens(staleToken: string): Promise<boolean> {
+  if (!refreshing) {
+    refreshing = withRefreshLock(async () => {
+      // Another tab refreshed (or logged out) while this one waited
+      if (getToken() !== staleToken) {
+        return getToken() !== null;
+      }
+      const refreshToken = getRefreshToken();
+      const response = await fetch(`${API_URL}/v1/auth/refresh`, {
+        method: "POST",
+        credentials: "include", // Refresh token cookie fallback
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ refresh_token: refreshToken }),
+      });
+      if (!response.ok) {
+        // Without Web Locks another tab may have won the race with the same
+        // refresh token; keep the tokens it stored
+        if (getRefreshToken() !== refreshToken) {
+          return getToken() !== null;
+        }
+        removeToken();
+        return false;
+      }
+      const result: AuthResponse = await response.json();
+      setTokens(result.access_token, result.refresh_token);
+      return true;
+    }).finally(() => {
+      refreshing = null;
+    });
+  }
+  return refreshing;
+}
 
+/** fetch with the access token, refreshing it once if it has expired */
+async function authorizedFetch(
+  url: string,
+  options: RequestInit = {},
+  retry = true
+): Promise<Response> {
+  const token = getToken();
   const headers: HeadersInit = {
     "Content-Type": "application/json",
     ...(token && { Authorization: `Bearer ${token}` }),
@@ -57,6 +117,18 @@ async function fetchApi<T>(
     headers,
   });
 
+  if (response.status === 401 && retry && token && (await refreshTokens(token))) {
+    return authorizedFetch(url, options, false);
+  }
+  return response;
+}
+
+async function fetchApi<T>(
+  endpoint: string,
+  options: RequestInit = {}
+): Promise<T> {
+  const response = await authorizedFetch(`${API_URL}${endpoint}`, options);
+
   if (!response.ok) {
     const error = await response.json().catch(() => ({ detail: "An error occurred" }));
     throw new ApiError(response.status, error.detail || "An error occurred");
@@ -72,7 +144,7 @@ export const authApi = {
       method: "POST",
       body: JSON.stringify(data),
     });
-    setToken(response.access_token);
+    setTokens(response.access_token, response.refresh_token);
     return response.user;
   },
 
@@ -81,13 +153,15 @@ export const authApi = {
       method: "POST",
       body: JSON.stringify(data),
     });
-    setToken(response.access_token);
+    setTokens(response.access_token, response.refresh_token);
     return response.user;
   },
 
   logout: async (): Promise<{ message: string }> => {
+    const refreshToken = getRefreshToken();
     const result = await fetchApi<{ message: string }>("/v1/auth/logout", {
       method: "POST",
+      body: JSON.stringify({ refresh_token: refreshToken }),
     });
     removeToken();
     return result;
@@ -114,16 +188,8 @@ export const agentApi = {
   run: async (agentId: string, data: RunRequest): Promise<string> => {
     if (data.stream) {
       // Handle streaming response
-      const token = getToken();
-      const headers: HeadersInit = {
-        "Content-Type": "application/json",
-        ...(token && { Authorization: `Bearer ${token}` }),
-      };
-
-      const response = await fetch(`${API_URL}/v1/agents/${agentId}/runs`, {
+      const response = await authorizedFetch(`${API_URL}/v1/agents/${agentId}/runs`, {
         method: "POST",
-        credentials: "include",
-        headers,
         body: JSON.stringify(data),
       });
 
@@ -151,16 +217,8 @@ export const agentApi = {
     data: RunRequest,
     onChunk: (chunk: string) => void
   ): Promise<void> => {
-    const token = getToken();
-    const headers: HeadersInit = {
-      "Content-Type": "application/json",
-      ...(token && { Authorization: `Bearer ${token}` }),
-    };
-
-    const response = await fetch(`${API_URL}/v1/agents/${agentId}/runs`, {
+    const response = await authorizedFetch(`${API_URL}/v1/agents/${agentId}/runs`, {
       method: "POST",
-      credentials: "include",
-      headers,
       body: JSON.stringify({ ...data, stream: true }),
     });
 
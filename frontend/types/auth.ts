@@ -17,5 +17,6 @@ export interface RegisterRequest {
 export interface AuthResponse {
   user: User;
   access_token: string;
+  refresh_token: string;
   token_type: string;
 }
@@ -0,0 +1,284 @@
+"""Content-addressed embedding cache shared by knowledge ingestion and search.
+
+Embeddings are keyed by the embedder model and the sha256 of the normalized
+text (Unicode NFC, whitespace collapsed), and stored in the embedding_cache
+table as float16 bytes (3 KB for a 1536-dimension embedding instead of 12 KB
+as float32). An in-process LRU sits in front of the table, so a repeated query
+costs a dict lookup and an unchanged chunk of a re-ingested plan costs one
+indexed read instead of a provider round trip.
+
+Values are rounded to float16 on the way in, so a text always gets the same
+vector whether or not it was cached. Cache read or write failures are logged
+and fall back to the wrapped embedder. Empty or wrongly sized vectors (agno's
+embedders return [] when the provider call fails) are passed through uncached,
+so a transient failure is retried on the next call instead of being stored.
+"""
+
+import asyncio
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from hashlib import sha256
+from os import getenv
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from agno.knowledge.embedder.base import Embedder
+from agno.knowledge.embedder.openai import OpenAIEmbedder
+from agno.utils.log import logger
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from mealworm.db.models import EmbeddingCacheEntry
+from mealworm.db.session import SessionLocal
+
+# Embeddings kept in memory per worker
+EMBEDDING_CACHE_SIZE = int(getenv("EMBEDDING_CACHE_SIZE", "2048"))
+
+Key = Tuple[str, str]
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different copies share a cache entry"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def text_hash(text: str) -> str:
+    return sha256(normalize_text(text).encode()).hexdigest()
+
+
+def encode_embedding(embedding: Sequence[float]) -> bytes:
+    return np.asarray(embedding, dtype="<f2").tobytes()
+
+
+def decode_embedding(data: bytes) -> List[float]:
+    return np.frombuffer(data, dtype="<f2").astype(np.float32).tolist()
+
+
+class _LRUCache:
+    """Thread-safe LRU of encoded embeddings (embedders run in worker threads too)"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Key, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Key) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key: Key, data: bytes) -> None:
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+_memory_cache = _LRUCache(EMBEDDING_CACHE_SIZE)
+
+
+def _load_cached(model: str, hashes: List[str]) -> Dict[str, bytes]:
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(EmbeddingCacheEntry.text_hash, EmbeddingCacheEntry.embedding).where(
+                EmbeddingCacheEntry.model == model,
+                EmbeddingCacheEntry.text_hash.in_(hashes),
+            )
+        ).all()
+    return {row.text_hash: row.embedding for row in rows}
+
+
+def _store_cached(model: str, dimensions: int, entries: Dict[str, bytes]) -> None:
+    insert = postgresql.insert(EmbeddingCacheEntry).values(
+        [
+            {
+                "model": model,
+                "text_hash": hash_,
+                "dimensions": dimensions,
+                "embedding": data,
+            }
+            for hash_, data in entries.items()
+        ]
+    )
+    with SessionLocal() as db:
+        # Overwrite rows left invalid by older versions, which cached failures
+        db.execute(
+            insert.on_conflict_do_update(
+                index_elements=[
+                    EmbeddingCacheEntry.model,
+                    EmbeddingCacheEntry.text_hash,
+                ],
+                set_={
+                    "dimensions": insert.excluded.dimensions,
+                    "embedding": insert.excluded.embedding,
+                },
+                where=EmbeddingCacheEntry.embedding != insert.excluded.embedding,
+            )
+        )
+        db.commit()
+
+
+@dataclass
+class CachedEmbedder(Embedder):
+    """
+    Embedder that serves repeated texts from the embedding cache.
+
+    Args:
+        embedder: Embedder that computes embeddings on a cache miss
+    """
+
+    embedder: Embedder = field(default_factory=OpenAIEmbedder)
+
+    def __post_init__(self):
+        self.dimensions = self.embedder.dimensions
+
+    @property
+    def model(self) -> str:
+        """Cache key prefix identifying the wrapped embedder's output"""
+        model_id = getattr(self.embedder, "id", None)
+        return f"{type(self.embedder).__name__}:{model_id}:{self.dimensions}"
+
+    def _lookup(self, hashes: List[str]) -> Dict[str, List[float]]:
+        """Cached embeddings for text hashes, from memory then Postgres"""
+        found: Dict[str, bytes] = {}
+        missing = []
+        for hash_ in hashes:
+            data = _memory_cache.get((self.model, hash_))
+            if data is None:
+                missing.append(hash_)
+            else:
+                found[hash_] = data
+        if missing:
+            try:
+                stored = _load_cached(self.model, missing)
+            except Exception as e:
+                logger.warning(f"Embedding cache read failed: {e}")
+                stored = {}
+            for hash_, data in stored.items():
+                _memory_cache.put((self.model, hash_), data)
+            found.update(stored)
+        embeddings = {hash_: decode_embedding(data) for hash_, data in found.items()}
+        # Treat invalid entries as misses, so they are recomputed and replaced
+        return {
+            hash_: embedding
+            for hash_, embedding in embeddings.items()
+            if self._is_valid(embedding)
+        }
+
+    def _is_valid(self, embedding: Sequence[float]) -> bool:
+        if not embedding:
+            return False
+        return self.dimensions is None or len(embedding) == self.dimensions
+
+    def _store(self, embeddings: Dict[str, List[float]]) -> Dict[str, List[float]]:
+        """
+        Cache fresh embeddings.
+
+        Args:
+            embeddings: Embeddings from the wrapped embedder by text hash
+
+        Returns:
+            The embeddings rounded as they are cached; invalid ones (empty after
+            a provider failure, or of the wrong size) unchanged and uncached
+        """
+        invalid = {
+            hash_: embedding
+            for hash_, embedding in embeddings.items()
+            if not self._is_valid(embedding)
+        }
+        if invalid:
+            logger.warning(
+                f"Not caching {len(invalid)} empty or wrongly sized embeddings"
+            )
+        encoded = {
+            hash_: encode_embedding(embedding)
+            for hash_, embedding in embeddings.items()
+            if hash_ not in invalid
+        }
+        for hash_, data in encoded.items():
+            _memory_cache.put((self.model, hash_), data)
+        if encoded:
+            try:
+                _store_cached(self.model, self.dimensions or 0, encoded)
+            except Exception as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+        stored = {hash_: decode_embedding(data) for hash_, data in encoded.items()}
+        stored.update(invalid)
+        return stored
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embedding_and_usage(text)[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        hash_ = text_hash(text)
+        cached = self._lookup([hash_])
+        if hash_ in cached:
+            return cached[hash_], None
+        embedding, usage = self.embedder.get_embedding_and_usage(text)
+        return self._store({hash_: embedding})[hash_], usage
+
+    async def async_get_embedding(self, text: str) -> List[float]:
+        return (await self.async_get_embedding_and_usage(text))[0]
+
+    async def async_get_embedding_and_usage(
+        self, text: str
+    ) -> Tuple[List[float], Optional[Dict]]:
+        hash_ = text_hash(text)
+        cached = await asyncio.to_thread(self._lookup, [hash_])
+        if hash_ in cached:
+            return cached[hash_], None
+        embedding, usage = await self.embedder.async_get_embedding_and_usage(text)
+        stored = await asyncio.to_thread(self._store, {hash_: embedding})
+        return stored[hash_], usage
+
+    def get_embeddings_batch(
+        self, texts: List[str], batch_size: int = 100
+    ) -> List[List[float]]:
+        """
+        Get embeddings for multiple texts, embedding only uncached ones.
+
+        Args:
+            texts: Texts to embed
+            batch_size: Texts per call to the wrapped embedder
+
+        Returns:
+            One embedding per text, in order
+        """
+        hashes = [text_hash(text) for text in texts]
+        embeddings = self._lookup(list(set(hashes)))
+        misses = {h: t for h, t in zip(hashes, texts) if h not in embeddings}
+        if misses:
+            if hasattr(self.embedder, "get_embeddings_batch"):
+                fresh = self.embedder.get_embeddings_batch(
+                    list(misses.values()), batch_size=batch_size
+                )
+            else:
+                fresh = [self.embedder.get_embedding(text) for text in misses.values()]
+            embeddings.update(self._store(dict(zip(misses, fresh))))
+        return [embeddings[hash_] for hash_ in hashes]
+
+    async def async_get_embeddings_batch(
+        self, texts: List[str], batch_size: int = 100
+    ) -> List[List[float]]:
+        hashes = [text_hash(text) for text in texts]
+        embeddings = await asyncio.to_thread(self._lookup, list(set(hashes)))
+        misses = {h: t for h, t in zip(hashes, texts) if h not in embeddings}
+        if misses:
+            if hasattr(self.embedder, "async_get_embeddings_batch"):
+                fresh = await self.embedder.async_get_embeddings_batch(
+                    list(misses.values()), batch_size=batch_size
+                )
+            else:
+                fresh = [
+                    await self.embedder.async_get_embedding(text)
+                    for text in misses.values()
+                ]
+            embeddings.update(
+                await asyncio.to_thread(self._store, dict(zip(misses, fresh)))
+            )
+        return [embeddings[hash_] for hash_ in hashes]
@@ -0,0 +1,294 @@
+"""Hybrid lexical + vector search over the meal plan PgVector table.
+
+Full-text search (a `tsvector` GIN index on the chunk content) finds exact
+dish and ingredient names such as "Moqueca"; pgvector finds meals that are
+similar in meaning. Both candidate lists are computed in one query and merged
+with reciprocal-rank fusion (RRF): each chunk scores sum(1 / (RRF_K + rank))
+over the lists it appears in, so chunks found both ways come first.
+
+Chunks are tagged with the owning user's id in their metadata. Searches for a
+user first narrow the table to that user's rows through a btree index, then
+rank only those, so their cost follows one user's history rather than the
+whole table.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+import agno.knowledge  # noqa: F401  # agno.vectordb fails to import before it
+from agno.knowledge.document import Document
+from agno.utils.log import log_info
+from agno.vectordb.pgvector import HNSW, Ivfflat, PgVector
+from sqlalchemy import inspect, text
+
+from mealworm.agents.vector_index import OPERATOR_CLASSES
+
+# Text search configuration for the GIN index and queries (must match)
+TEXT_SEARCH_CONFIG = "english"
+# Candidates taken from each of the lexical and vector rankings
+HYBRID_CANDIDATES = 20
+# RRF damping constant; 60 is the usual choice
+RRF_K = 60
+# Chunks returned to the agent when it does not ask for a number
+HYBRID_DEFAULT_LIMIT = 5
+
+# Distance operator matching each operator class, for ORDER BY
+DISTANCE_OPERATORS = {
+    "vector_cosine_ops": "<=>",
+    "vector_l2_ops": "<->",
+    "vector_ip_ops": "<#>",
+}
+
+
+# Retriever filters that bound the meal date instead of matching metadata
+DATE_RANGE_FILTERS = ("date_from", "date_to")
+
+# Expression the user index is built on; filters must use it verbatim
+USER_ID_SQL = "(meta_data->>'user_id')"
+
+
+def _tsvector_sql() -> str:
+    return f"to_tsvector('{TEXT_SEARCH_CONFIG}', content)"
+
+
+def _ensure_index(vector_db: PgVector, name: str, definition: str) -> None:
+    if not vector_db.table_exists():
+        return
+    indexes = inspect(vector_db.db_engine).get_indexes(
+        vector_db.table_name, schema=vector_db.schema
+    )
+    if any(idx["name"] == name for idx in indexes):
+        return
+
+    log_info(f"Creating index {name}")
+    with vector_db.Session() as sess, sess.begin():
+        sess.execute(
+            text(f'CREATE INDEX "{name}" ON {vector_db.table.fullname} {definition}')
+        )
+
+
+def ensure_text_index(vector_db: PgVector) -> None:
+    """
+    Create the full-text GIN index on a PgVector table's content if missing.
+
+    Args:
+        vector_db: PgVector table to index
+    """
+    _ensure_index(
+        vector_db,
+        f"{vector_db.table_name}_content_fts_index",
+        f"USING GIN ({_tsvector_sql()})",
+    )
+
+
+def ensure_user_index(vector_db: PgVector) -> None:
+    """
+    Create the btree index on the user_id metadata of a PgVector table if missing.
+
+    Args:
+        vector_db: PgVector table to index
+    """
+    _ensure_index(
+        vector_db,
+        f"{vector_db.table_name}_user_id_index",
+        f"USING btree ({USER_ID_SQL})",
+    )
+
+
+def delete_unscoped_rows(vector_db: PgVector) -> int:
+    """
+    Delete rows whose id is not prefixed with their user_id.
+
+    Rows were once keyed on a hash of their content alone, so identical meals
+    of different users collapsed into one row owned by whichever user was
+    loaded last. Deleting them (and so their plans' content hashes) makes the
+    next load insert them again with user-scoped ids.
+
+    Args:
+        vector_db: PgVector table to clean up
+
+    Returns:
+        Number of rows deleted
+    """
+    if not vector_db.table_exists():
+        return 0
+    with vector_db.Session() as sess, sess.begin():
+        deleted = sess.execute(
+            text(
+                f"DELETE FROM {vector_db.table.fullname} "
+                f"WHERE {USER_ID_SQL} IS NULL OR id NOT LIKE {USER_ID_SQL} || '-%'"
+            )
+        ).rowcount
+    if deleted:
+        log_info(f"Deleted {deleted} meal plan rows without user-scoped ids")
+    return deleted
+
+
+def hybrid_search(
+    vector_db: PgVector,
+    query: str,
+    limit: int = HYBRID_DEFAULT_LIMIT,
+    filters: Optional[Dict[str, Any]] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> List[Document]:
+    """
+    Search a PgVector table with full-text and vector search fused by RRF.
+
+    Args:
+        vector_db: PgVector table to search
+        query: Search text, e.g. "Moqueca" or "chicken burgers"
+        limit: Maximum number of chunks to return
+        filters: Metadata values chunks must match, e.g. {"slot": "dinner"}
+        date_from: Earliest meal date to include (ISO format, inclusive)
+        date_to: Latest meal date to include (ISO format, inclusive)
+        user_id: Only search chunks owned by this user
+
+    Returns:
+        Matching chunks, best first, with their RRF score as reranking_score
+    """
+    table = vector_db.table.fullname
+    ops = OPERATOR_CLASSES.get(vector_db.distance, "vector_cosine_ops")
+    distance = f"embedding {DISTANCE_OPERATORS[ops]} CAST(:embedding AS vector)"
+    tsvector = _tsvector_sql()
+
+    conditions = ["TRUE"]
+    params: Dict[str, Any] = {
+        "query": query,
+        "candidates": max(HYBRID_CANDIDATES, limit),
+        "limit": limit,
+        "rrf_k": RRF_K,
+        "embedding": str(vector_db.embedder.get_embedding(query)),
+    }
+    if user_id is not None:
+        conditions.append(f"{USER_ID_SQL} = :user_id")
+        params["user_id"] = user_id
+    if filters:
+        conditions.append("meta_data @> CAST(:filters AS jsonb)")
+        params["filters"] = json.dumps(filters)
+    # Dates are ISO strings, so they compare correctly as text
+    if date_from:
+        conditions.append("meta_data->>'date' >= :date_from")
+        params["date_from"] = date_from
+    if date_to:
+        conditions.append("meta_data->>'date' <= :date_to")
+        params["date_to"] = date_to
+    where = " AND ".join(conditions)
+
+    if user_id is not None:
+        # Rank the user's rows exactly: the ANN index would search everyone's
+        # rows and filter afterwards, dropping results for small histories
+        scoped = f"""scoped AS MATERIALIZED (
+            SELECT id, embedding FROM {table} WHERE {where}
+        ),"""
+        semantic_from, semantic_where = "scoped", "TRUE"
+    else:
+        scoped = ""
+        semantic_from, semantic_where = table, where
+
+    statement = text(
+        f"""
+        WITH {scoped}
+        lexical AS (
+            SELECT id, row_number() OVER (ORDER BY score DESC) AS rank
+            FROM (
+                SELECT id, ts_rank_cd({tsvector}, q) AS score
+                FROM {table}, websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', :query) AS q
+                WHERE {tsvector} @@ q AND {where}
+                ORDER BY score DESC
+                LIMIT :candidates
+            ) AS hits
+        ),
+        semantic AS (
+            SELECT id, row_number() OVER (ORDER BY distance) AS rank
+            FROM (
+                SELECT id, {distance} AS distance
+                FROM {semantic_from}
+                WHERE {semantic_where}
+                ORDER BY {distance}
+                LIMIT :candidates
+            ) AS hits
+        ),
+        fused AS (
+            SELECT id,
+                COALESCE(1.0 / (:rrf_k + lexical.rank), 0)
+                + COALESCE(1.0 / (:rrf_k + semantic.rank), 0) AS score
+            FROM lexical FULL OUTER JOIN semantic USING (id)
+        )
+        SELECT t.id, t.name, t.meta_data, t.content, fused.score
+        FROM fused JOIN {table} AS t USING (id)
+        ORDER BY fused.score DESC
+        LIMIT :limit
+        """
+    )
+
+    with vector_db.Session() as sess, sess.begin():
+        # Same search-time index settings PgVector applies to its own searches
+        if isinstance(vector_db.vector_index, HNSW):
+            sess.execute(
+                text(
+                    f"SET LOCAL hnsw.ef_search = {int(vector_db.vector_index.ef_search)}"
+                )
+            )
+        elif isinstance(vector_db.vector_index, Ivfflat):
+            sess.execute(
+                text(f"SET LOCAL ivfflat.probes = {int(vector_db.vector_index.probes)}")
+            )
+        rows = sess.execute(statement, params).all()
+
+    return [
+        Document(
+            id=row.id,
+            name=row.name,
+            meta_data=row.meta_data or {},
+            content=row.content,
+            reranking_score=float(row.score),
+        )
+        for row in rows
+    ]
+
+
+async def meal_plan_retriever(
+    agent: Any,
+    query: str,
+    num_documents: Optional[int] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    **kwargs: Any,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Knowledge retriever for the meal planning agent, using hybrid search.
+
+    Searches are scoped to the user the agent is bound to. "date_from" and
+    "date_to" in filters restrict the meal date range; other filters must
+    match the chunk metadata exactly. agno drops filter keys the knowledge
+    base does not know, so these are registered with it (see
+    load_meal_plans_to_vector_db). The query embedding and the search run in
+    a worker thread, off the event loop.
+
+    Args:
+        agent: Agent whose knowledge base to search
+        query: Search text
+        num_documents: Maximum number of chunks to return
+        filters: Metadata filters
+
+    Returns:
+        Matching chunks as dicts, or None if the agent has no knowledge base
+    """
+    if agent.knowledge is None or agent.knowledge.vector_db is None:
+        return None
+    filters = dict(filters or {})
+    date_from = filters.pop("date_from", None)
+    date_to = filters.pop("date_to", None)
+    documents = await asyncio.to_thread(
+        hybrid_search,
+        agent.knowledge.vector_db,
+        query,
+        limit=num_documents or HYBRID_DEFAULT_LIMIT,
+        filters=filters,
+        date_from=date_from,
+        date_to=date_to,
+        user_id=agent.user_id,
+    )
+    return [document.to_dict() for document in documents]
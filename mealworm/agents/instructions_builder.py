@@ -134,6 +134,9 @@ The meal plan should have the following requirements:
 
 **IMPORTANT:** Don't include any meals that have been made in the last 10 meal plans. Search your knowledge base to check for recent meals. If you can't find specific past meal plans, proceed anyway with your best judgment to create a diverse and interesting week of meals.
 
+## Saved Recipes
+Use the search_recipe_catalog tool to find recipes I have saved in Notion before searching the web. Prefer a saved recipe when it fits the requirements, and use its link in the meal plan.
+
 ## Meal Plan Ingredients
 If there is a meal that doesn't have a link to the recipe, do a web search for the meal and include the link in the meal plan.
 NOTE: the link must actually be a link to the recipe, not a website that lists the recipe. If it's a website that lists the recipe, you must find the actual recipe link.
@@ -146,6 +149,12 @@ Here are my meal preferences:
 {preferences_text}
 {dietary_section}
 
+## Follow-up Requests
+If a "Current Meal Plan" is included in your context, this is a follow-up to that plan.
+Apply only the requested change (e.g. swapping one dinner) and keep every other day, meal, ingredient list and link as it is.
+Do not search your knowledge base again or regenerate the whole week; only research the meals you are changing.
+Present the full updated meal plan.
+
 ## How to Proceed
 1. Search your knowledge base for recent meal plans to avoid repetition
 2. Choose reasonable defaults for any unspecified preferences (e.g., pick Friday or Saturday for eating out, choose a mid-week day for the easy meal)
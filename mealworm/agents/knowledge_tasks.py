@@ -0,0 +1,190 @@
+"""Background knowledge loading tasks with progress reporting.
+
+Loads run as asyncio tasks in the API worker that started them, so a large
+backfill does not hold a request open. Each task reports its progress through
+a KnowledgeLoadProgress the loader updates as it goes. Only one load per agent
+runs at a time: starting a load while one is running returns the running task.
+
+Tasks live in the memory of one worker; with several workers, poll the worker
+that started the task (or run a single worker for backfills).
+"""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from enum import Enum
+from logging import getLogger
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = getLogger(__name__)
+
+# Finished tasks kept for status lookups
+MAX_FINISHED_TASKS = 50
+# Seconds cancel waits for a load to stop before returning its progress
+CANCEL_WAIT_SECONDS = 5.0
+
+
+class KnowledgeLoadStatus(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class KnowledgeLoadProgress:
+    """Progress of one knowledge load, updated by the loader"""
+
+    task_id: str
+    agent_id: str
+    status: KnowledgeLoadStatus = KnowledgeLoadStatus.RUNNING
+    files_discovered: int = 0
+    files_chunked: int = 0
+    files_embedded: int = 0
+    # Files already stored by an earlier load
+    files_skipped: int = 0
+    chunks: int = 0
+    chunks_embedded: int = 0
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def chunks_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.chunks_embedded / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated seconds left, assuming the remaining files are like the done ones"""
+        if self.status != KnowledgeLoadStatus.RUNNING:
+            return 0.0 if self.status == KnowledgeLoadStatus.COMPLETED else None
+        if not self.files_embedded or not self.chunks_per_second:
+            return None
+        chunks_per_file = self.chunks_embedded / self.files_embedded
+        remaining_files = (
+            self.files_discovered - self.files_embedded - self.files_skipped
+        )
+        # Chunks of files that are chunked but not yet embedded are known exactly
+        remaining_chunks = (self.chunks - self.chunks_embedded) + chunks_per_file * (
+            remaining_files - (self.files_chunked - self.files_embedded)
+        )
+        return max(remaining_chunks, 0) / self.chunks_per_second
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "task_id": self.task_id,
+            "agent_id": self.agent_id,
+            "status": self.status.value,
+            "files_discovered": self.files_discovered,
+            "files_chunked": self.files_chunked,
+            "files_embedded": self.files_embedded,
+            "files_skipped": self.files_skipped,
+            "chunks": self.chunks,
+            "chunks_embedded": self.chunks_embedded,
+            "elapsed_seconds": round(self.elapsed_seconds, 1),
+            "chunks_per_second": round(self.chunks_per_second, 2),
+            "eta_seconds": (
+                round(self.eta_seconds, 1) if self.eta_seconds is not None else None
+            ),
+            "error": self.error,
+        }
+
+
+Loader = Callable[[KnowledgeLoadProgress], Awaitable[Any]]
+
+
+class KnowledgeLoadTasks:
+    """Registry of knowledge load tasks in this worker"""
+
+    def __init__(self) -> None:
+        self._progress: Dict[str, KnowledgeLoadProgress] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # agent_id -> task_id of its running load
+        self._running: Dict[str, str] = {}
+
+    def start(self, agent_id: str, loader: Loader) -> KnowledgeLoadProgress:
+        """
+        Start loading an agent's knowledge in the background.
+
+        Args:
+            agent_id: Agent whose knowledge to load
+            loader: Coroutine function doing the load and updating the progress
+
+        Returns:
+            Progress of the new load, or of the agent's load already running
+        """
+        running = self.running(agent_id)
+        if running is not None:
+            return running
+
+        progress = KnowledgeLoadProgress(task_id=uuid.uuid4().hex, agent_id=agent_id)
+        self._progress[progress.task_id] = progress
+        self._running[agent_id] = progress.task_id
+        self._tasks[progress.task_id] = asyncio.create_task(self._run(progress, loader))
+        self._prune()
+        return progress
+
+    async def _run(self, progress: KnowledgeLoadProgress, loader: Loader) -> None:
+        try:
+            await loader(progress)
+            progress.status = KnowledgeLoadStatus.COMPLETED
+        except asyncio.CancelledError:
+            progress.status = KnowledgeLoadStatus.CANCELLED
+        except Exception as e:
+            logger.error(
+                f"Knowledge load {progress.task_id} for {progress.agent_id} failed: {e}",
+                exc_info=True,
+            )
+            progress.status = KnowledgeLoadStatus.FAILED
+            progress.error = str(e)
+        finally:
+            progress.finished_at = time.time()
+            self._running.pop(progress.agent_id, None)
+            self._tasks.pop(progress.task_id, None)
+
+    def running(self, agent_id: str) -> Optional[KnowledgeLoadProgress]:
+        """Progress of the agent's running load, if any"""
+        task_id = self._running.get(agent_id)
+        return self._progress[task_id] if task_id is not None else None
+
+    def get(self, task_id: str) -> Optional[KnowledgeLoadProgress]:
+        return self._progress.get(task_id)
+
+    async def cancel(self, task_id: str) -> Optional[KnowledgeLoadProgress]:
+        """
+        Cancel a running load.
+
+        Waits up to CANCEL_WAIT_SECONDS for the load to stop, so the returned
+        status is "cancelled" unless the loader is slow to react (it is then
+        still "running" and turns "cancelled" once the load stops).
+
+        Args:
+            task_id: Task to cancel
+
+        Returns:
+            The task's progress (unchanged if it already finished), or None if
+            the task is unknown
+        """
+        task = self._tasks.get(task_id)
+        if task is not None:
+            task.cancel()
+            await asyncio.wait({task}, timeout=CANCEL_WAIT_SECONDS)
+        return self._progress.get(task_id)
+
+    def _prune(self) -> None:
+        finished = [
+            task_id
+            for task_id, progress in self._progress.items()
+            if progress.status != KnowledgeLoadStatus.RUNNING
+        ]
+        for task_id in finished[: max(len(finished) - MAX_FINISHED_TASKS, 0)]:
+            del self._progress[task_id]
+
+
+knowledge_load_tasks = KnowledgeLoadTasks()
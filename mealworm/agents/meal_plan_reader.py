@@ -0,0 +1,339 @@
+"""Reader that splits weekly meal plan markdown into one document per meal."""
+
+import asyncio
+import re
+from datetime import date, datetime, timedelta
+from os import getenv
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Tuple, Union
+
+from agno.knowledge.document import Document
+from agno.knowledge.reader.base import Reader
+from agno.knowledge.types import ContentType
+from agno.utils.log import log_info, logger
+
+# Historical plans: <dir>/<user_id>/*.md per user, <dir>/*.md for the default user
+HISTORICAL_PLANS_DIR = Path("historical-meal-plans")
+# Owner of the meal plans directly in historical-meal-plans/
+MEAL_PLANS_DEFAULT_USER_ID = getenv("MEAL_PLANS_DEFAULT_USER_ID", "1")
+
+# Metadata of every meal document, usable as knowledge filters
+MEAL_PLAN_METADATA_KEYS = (
+    "week_start",
+    "date",
+    "day",
+    "slot",
+    "meal",
+    "protein",
+    "recipe_url",
+    "leftover",
+)
+
+# Meal plans start on a Sunday
+WEEK_DAYS = [
+    "Sunday",
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+]
+
+# Protein keywords, checked in order against the meal name, then its body
+PROTEIN_KEYWORDS = {
+    "chicken": ["chicken"],
+    "fish": [
+        "fish",
+        "salmon",
+        "cod",
+        "tilapia",
+        "halibut",
+        "tuna",
+        "trout",
+        "moqueca",
+    ],
+    "seafood": ["shrimp", "prawn", "scallop", "mussel", "crab"],
+    "beef": ["beef", "steak", "brisket", "meatball"],
+    "pork": ["pork", "carnitas", "bacon", "sausage", "ham"],
+    "lamb": ["lamb"],
+    "turkey": ["turkey"],
+    "vegetarian": ["vegetarian", "tofu", "lentil", "chickpea", "bean", "paneer"],
+}
+
+# Whole-word keyword patterns (plurals included) per protein, e.g. "ham" but
+# not "hamburger"
+PROTEIN_PATTERNS = {
+    protein: re.compile(rf"\b(?:{'|'.join(keywords)})s?\b")
+    for protein, keywords in PROTEIN_KEYWORDS.items()
+}
+
+# Slots that are not meals cooked at home; they are not stored
+EATING_OUT = re.compile(
+    r"^(?:eating out|eat out|dining out|take ?out)\b", re.IGNORECASE
+)
+
+DAY_HEADING = re.compile(rf"^#\s+({'|'.join(WEEK_DAYS)})\b", re.IGNORECASE)
+SLOT_HEADING = re.compile(
+    r"^(?:#{2,3}\s*)?(breakfast|lunch|dinner|snacks?)\s*:\s*(.*)$", re.IGNORECASE
+)
+OTHER_ITEMS_HEADING = re.compile(r"^#{1,3}\s*other items\b", re.IGNORECASE)
+# Any other heading (e.g. "## Notes / Constraints") ends the current meal
+HEADING = re.compile(r"^#{1,6}\s")
+URL = re.compile(r"https?://[^\s)>\]]+")
+ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+LONG_DATE = re.compile(r"[A-Z][a-z]+ \d{1,2}, \d{4}")
+
+
+def parse_week_start(file_name: str, text: str) -> Optional[date]:
+    """
+    Find the first day of the week a plan covers.
+
+    Args:
+        file_name: Plan file name, e.g. "2026-01-11"
+        text: Plan markdown; its title is used if the file name has no date
+
+    Returns:
+        The week's start date, or None if none was found
+    """
+    title = text.lstrip().split("\n", 1)[0]
+    for candidate in (file_name, title):
+        match = ISO_DATE.search(candidate)
+        if match:
+            try:
+                return date.fromisoformat(match.group(0))
+            except ValueError:
+                pass
+        match = LONG_DATE.search(candidate)
+        if match:
+            try:
+                return datetime.strptime(match.group(0), "%B %d, %Y").date()
+            except ValueError:
+                pass
+    return None
+
+
+def discover_meal_plans(
+    plans_dir: Path = HISTORICAL_PLANS_DIR,
+) -> List[Tuple[str, Path]]:
+    """
+    List historical meal plan files with the user each belongs to.
+
+    Args:
+        plans_dir: Directory of historical meal plans
+
+    Returns:
+        (user_id, path) pairs, grouped by user and sorted by file name
+    """
+    if not plans_dir.exists():
+        return []
+    plans_by_user = {MEAL_PLANS_DEFAULT_USER_ID: plans_dir}
+    for user_dir in sorted(plans_dir.iterdir()):
+        if user_dir.is_dir() and user_dir.name.isdigit():
+            plans_by_user[user_dir.name] = user_dir
+    return [
+        (user_id, path)
+        for user_id, user_plans_dir in plans_by_user.items()
+        for path in sorted(user_plans_dir.glob("*.md"))
+    ]
+
+
+def detect_protein(meal: str, body: str) -> Optional[str]:
+    """Guess the main protein of a meal from its name, then its ingredients"""
+    for text in (meal.lower(), body.lower()):
+        for protein, pattern in PROTEIN_PATTERNS.items():
+            if pattern.search(text):
+                return protein
+    return None
+
+
+class MealPlanReader(Reader):
+    """
+    Reads a weekly meal plan into one document per day and meal slot.
+
+    The shopping list ("Other Items"), other sections such as notes and
+    eating-out slots are dropped. Each document carries the week start, date,
+    day, slot, meal name, protein and recipe URL as metadata so retrieval can
+    filter on them.
+
+    Args:
+        user_id: Owner of the plans read; prefixes the document ids so that
+            identical meals of different users are stored as separate rows
+
+    Attributes:
+        documents_read: Documents returned by read so far
+    """
+
+    def __init__(
+        self,
+        user_id: Optional[str] = None,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+    ):
+        # Sections are already small; no further chunking
+        super().__init__(chunk=False, name=name, description=description)
+        self.user_id = user_id
+        self.documents_read = 0
+
+    @classmethod
+    def get_supported_content_types(cls) -> List[ContentType]:
+        return [ContentType.MARKDOWN]
+
+    def read(  # type: ignore[override]
+        self, file: Union[Path, IO[Any]], name: Optional[str] = None
+    ) -> List[Document]:
+        try:
+            if isinstance(file, Path):
+                if not file.exists():
+                    raise FileNotFoundError(f"Could not find file: {file}")
+                log_info(f"Reading meal plan: {file}")
+                file_name = name or file.stem
+                text = file.read_text(encoding=self.encoding or "utf-8")
+            else:
+                log_info(f"Reading uploaded meal plan: {file.name}")
+                file_name = name or file.name.split(".")[0]
+                file.seek(0)
+                text = file.read().decode(self.encoding or "utf-8")
+            documents = self.parse(text, file_name)
+            self.documents_read += len(documents)
+            return documents
+        except Exception as e:
+            logger.error(f"Error reading meal plan: {file}: {e}")
+            return []
+
+    async def async_read(  # type: ignore[override]
+        self, file: Union[Path, IO[Any]], name: Optional[str] = None
+    ) -> List[Document]:
+        return await asyncio.to_thread(self.read, file, name)
+
+    def parse(self, text: str, file_name: str) -> List[Document]:
+        """
+        Split meal plan markdown into per-meal documents.
+
+        Args:
+            text: Meal plan markdown
+            file_name: Name of the plan, used as the document name
+
+        Returns:
+            One document per day and meal slot
+        """
+        week_start = parse_week_start(file_name, text)
+        documents: List[Document] = []
+        # Documents per id, to keep ids unique when a day repeats a slot
+        # (e.g. both "Snack:" and "Snacks:")
+        id_counts: Dict[str, int] = {}
+
+        day: Optional[str] = None
+        # Days since week_start; plans can run into the next Sunday
+        offset = -1
+        slot: Optional[str] = None
+        meal = ""
+        body: List[str] = []
+        in_other_items = False
+
+        def flush() -> None:
+            if day is None or slot is None or EATING_OUT.match(meal):
+                return
+            document = self._build_document(
+                file_name, week_start, day, offset, slot, meal, body
+            )
+            doc_id = document.id or ""
+            count = id_counts.get(doc_id, 0) + 1
+            id_counts[doc_id] = count
+            if count > 1:
+                document.id = f"{doc_id}-{count}"
+            documents.append(document)
+
+        for line in text.splitlines():
+            stripped = line.strip()
+
+            day_match = DAY_HEADING.match(stripped)
+            if day_match:
+                flush()
+                day = day_match.group(1).capitalize()
+                index = WEEK_DAYS.index(day)
+                if offset < 0:
+                    offset = index
+                else:
+                    offset += (index - offset) % 7 or 7
+                slot, meal, body = None, "", []
+                in_other_items = False
+                continue
+
+            if OTHER_ITEMS_HEADING.match(stripped):
+                flush()
+                day, slot, meal, body = None, None, "", []
+                in_other_items = True
+                continue
+            if in_other_items:
+                continue
+
+            slot_match = SLOT_HEADING.match(stripped)
+            if slot_match and day is not None:
+                flush()
+                slot = slot_match.group(1).lower().rstrip("s")
+                meal = slot_match.group(2).strip()
+                body = []
+                continue
+
+            if HEADING.match(stripped):
+                flush()
+                slot, meal, body = None, "", []
+                continue
+
+            if slot is None:
+                continue
+            if not meal and stripped:
+                # Meal name on the line after the "Dinner:" heading
+                meal = stripped
+            else:
+                body.append(line)
+
+        flush()
+        return documents
+
+    def _build_document(
+        self,
+        file_name: str,
+        week_start: Optional[date],
+        day: str,
+        offset: int,
+        slot: str,
+        meal: str,
+        body: List[str],
+    ) -> Document:
+        body_text = "\n".join(body).strip()
+        meta_data: Dict[str, Any] = {
+            "week_start": week_start.isoformat() if week_start else None,
+            "date": (
+                (week_start + timedelta(days=offset)).isoformat()
+                if week_start
+                else None
+            ),
+            "day": day,
+            "slot": slot,
+            "meal": meal,
+            "protein": detect_protein(meal, body_text),
+            "recipe_url": None,
+            "leftover": meal.lower().startswith("leftover"),
+        }
+        url = URL.search(meal + "\n" + body_text)
+        if url:
+            meta_data["recipe_url"] = url.group(0).rstrip(".,")
+
+        heading = f"{day} {slot}"
+        if week_start:
+            heading += f" ({meta_data['date']}, week of {meta_data['week_start']})"
+        content = f"{heading}: {meal}"
+        if body_text:
+            content += f"\n{body_text}"
+
+        document_id = f"{week_start or file_name}-{offset}-{day.lower()}-{slot}"
+        if self.user_id is not None:
+            document_id = f"{self.user_id}-{document_id}"
+        return Document(
+            id=document_id,
+            name=file_name,
+            content=content,
+            meta_data=meta_data,
+        )
@@ -1,53 +1,116 @@
-from pathlib import Path
+import asyncio
+from os import getenv
 
 from typing import Optional, Union
 
 from agno.agent import Agent
 from agno.knowledge.knowledge import Knowledge
-from agno.knowledge.reader.markdown_reader import MarkdownReader
 from agno.models.anthropic import Claude
 from agno.models.openai import OpenAIChat
 from agno.tools.firecrawl import FirecrawlTools
 from agno.tools.tavily import TavilyTools
-from agno.vectordb.pgvector import PgVector
-from sqlalchemy.orm import Session
 
-from mealworm.db.url import get_db_url
-from mealworm.db.session import SessionLocal
-from mealworm.db.models import UserPreferences
+from mealworm.db.preferences_cache import preferences_cache
+from mealworm.agents.hybrid_search import (
+    DATE_RANGE_FILTERS,
+    HYBRID_DEFAULT_LIMIT,
+    delete_unscoped_rows,
+    ensure_text_index,
+    ensure_user_index,
+    meal_plan_retriever,
+)
 from mealworm.agents.instructions_builder import build_custom_instructions
+from mealworm.agents.knowledge_tasks import KnowledgeLoadProgress
+from mealworm.agents.meal_plan_reader import (
+    HISTORICAL_PLANS_DIR,
+    MEAL_PLAN_METADATA_KEYS,
+    MealPlanReader,
+    discover_meal_plans,
+)
+from mealworm.agents.past_meals import record_historical_plan
+from mealworm.agents.vector_index import ensure_vector_index, get_meal_plans_db
+from mealworm.agents.recipe_catalog import search_recipe_catalog
+from mealworm.agents.sessions import (
+    RollingSessionSummaryManager,
+    build_session_context,
+    get_session_db,
+)
+
+# Optional cheaper model used to maintain session summaries
+SESSION_SUMMARY_MODEL_ID = getenv("SESSION_SUMMARY_MODEL_ID")
 
 # Note: Custom instructions are now dynamically generated from user preferences
 # See mealworm/agents/instructions_builder.py for the template builder
 
 
-async def load_meal_plans_to_vector_db():
-    """Load historical meal plans from markdown files into PGVector database."""
-    db_url = get_db_url()
+async def load_meal_plans_to_vector_db(
+    progress: Optional[KnowledgeLoadProgress] = None,
+):
+    """
+    Load historical meal plans from markdown files into PGVector database.
 
-    knowledge = Knowledge(
-        vector_db=PgVector(
-            table_name="meal_plans",
-            db_url=db_url,
-        ),
+    Each plan is stored as one row per day and meal slot (see
+    mealworm/agents/meal_plan_reader.py), with its date, slot, protein and
+    recipe URL as metadata. Plans in historical-meal-plans/<user_id>/ belong to
+    that user; plans directly in historical-meal-plans/ belong to
+    MEAL_PLANS_DEFAULT_USER_ID. Every row is tagged with its user_id and has
+    an id prefixed with it, so identical meals of two users stay separate
+    rows, and searches only see the bound user's rows. Each plan's meals are
+    also recorded in past_meals for repeat detection.
+
+    Args:
+        progress: Updated with file and chunk counts as plans are loaded
+    """
+    vector_db = get_meal_plans_db()
+    knowledge = Knowledge(vector_db=vector_db, max_results=HYBRID_DEFAULT_LIMIT)
+    # Filter keys agno passes on to meal_plan_retriever
+    knowledge.add_filters(
+        {key: None for key in (*MEAL_PLAN_METADATA_KEYS, *DATE_RANGE_FILTERS)}
     )
+    if progress is None:
+        progress = KnowledgeLoadProgress(task_id="", agent_id="meal_planning_agent")
 
     # Add Markdown content from historical meal plans to knowledge base
-    historical_plans_dir = Path("historical-meal-plans")
-    if historical_plans_dir.exists():
+    if HISTORICAL_PLANS_DIR.exists():
         print(
-            f"Adding historical meal plans to knowledge base from {historical_plans_dir}"
+            f"Adding historical meal plans to knowledge base from {HISTORICAL_PLANS_DIR}"
         )
-        paths = list(historical_plans_dir.glob("*.md"))
-        if paths:
-            await knowledge.add_contents_async(
-                paths=paths,
-                reader=MarkdownReader(),
+        plans = discover_meal_plans()
+        progress.files_discovered = len(plans)
+        await asyncio.to_thread(delete_unscoped_rows, vector_db)
+
+        for user_id, path in plans:
+            reader = MealPlanReader(user_id=user_id)
+            # Insert rather than upsert: agno's upsert keys rows on a hash of
+            # their content, ignoring the user-scoped document ids
+            await knowledge.add_content_async(
+                path=str(path),
+                reader=reader,
+                metadata={"user_id": user_id},
+                upsert=False,
                 skip_if_exists=True,
             )
-            print(f"Added {len(paths)} meal plans to knowledge base")
+            try:
+                await asyncio.to_thread(record_historical_plan, int(user_id), path)
+            except Exception as e:
+                print(f"Could not record past meals of {path}: {e}")
+            # agno only reads plans it has not stored yet
+            if reader.documents_read:
+                progress.files_chunked += 1
+                progress.files_embedded += 1
+                progress.chunks += reader.documents_read
+                progress.chunks_embedded += reader.documents_read
+            else:
+                progress.files_skipped += 1
+
+        if plans:
+            users = len({user_id for user_id, _ in plans})
+            print(f"Added {len(plans)} meal plans for {users} users to knowledge base")
+            await asyncio.to_thread(ensure_vector_index, vector_db)
+            await asyncio.to_thread(ensure_text_index, vector_db)
+            await asyncio.to_thread(ensure_user_index, vector_db)
     else:
-        print(f"Directory {historical_plans_dir} does not exist")
+        print(f"Directory {HISTORICAL_PLANS_DIR} does not exist")
 
     return knowledge
 
@@ -87,6 +150,121 @@ def get_model_instance(model_id: str) -> Union[Claude, OpenAIChat]:
         )
 
 
+def build_meal_planning_agent(model_id: str, knowledge: Knowledge) -> Agent:
+    """
+    Build a meal planning agent that is not yet bound to a user.
+
+    The model client, tools and knowledge are the expensive parts of an agent
+    and are identical for every user, so unbound agents can be pooled and
+    reused (see mealworm/agents/pool.py).
+
+    Args:
+        model_id: Model identifier (supports Anthropic Claude and OpenAI models)
+        knowledge: Knowledge base to search
+
+    Returns:
+        Agent instance without instructions or session
+    """
+    return Agent(
+        name="mealworm-meal-planner",
+        model=get_model_instance(model_id),
+        tools=[
+            search_recipe_catalog,
+            TavilyTools(),
+            FirecrawlTools(enable_scrape=True, enable_crawl=True),
+        ],
+        knowledge=knowledge,
+        # Full-text + vector search fused by RRF (see mealworm/agents/hybrid_search.py).
+        # agno awaits async retrievers, though it annotates only sync ones
+        knowledge_retriever=meal_plan_retriever,  # type: ignore[arg-type]
+        search_knowledge=True,
+        markdown=True,
+    )
+
+
+async def bind_meal_planning_agent(
+    agent: Agent,
+    user_id: Optional[int] = None,
+    session_id: Optional[str] = None,
+) -> Agent:
+    """
+    Bind a meal planning agent to a user's preferences and session.
+
+    Args:
+        agent: Agent from build_meal_planning_agent
+        user_id: User identifier (REQUIRED for authenticated requests)
+        session_id: Optional session identifier. When given, runs are persisted
+            and follow-up runs see a summary of the session plus the latest plan
+
+    Returns:
+        The same agent, bound to the user
+
+    Raises:
+        ValueError: If user_id is not provided, preferences not found, or the
+            session belongs to another user
+    """
+    if user_id is None:
+        raise ValueError("user_id is required to create a meal planning agent")
+
+    # Fetch user preferences (from the cache unless they changed)
+    cached = await preferences_cache.async_get(user_id)
+    if cached is None or cached.preferences is None:
+        raise ValueError(f"No preferences found for user_id: {user_id}")
+
+    # Build custom instructions from preferences
+    agent.instructions = build_custom_instructions(cached.preferences)
+
+    agent.user_id = str(user_id)
+
+    if session_id is not None:
+        agent.db = get_session_db()
+        agent.session_id = session_id
+        # The session row is read once here and reused by the run
+        agent.cache_session = True
+        agent.enable_session_summaries = True
+        # The summary is added (truncated) by build_session_context; agno would
+        # otherwise add it to the system prompt a second time
+        agent.add_session_summary_to_context = False
+        agent.session_summary_manager = RollingSessionSummaryManager(
+            model=get_model_instance(SESSION_SUMMARY_MODEL_ID)
+            if SESSION_SUMMARY_MODEL_ID
+            else None
+        )
+
+        # Single indexed lookup on session_id; the session is cached on the agent.
+        # agno's session storage is synchronous, so read it off the event loop
+        session = await asyncio.to_thread(agent.get_session, session_id=session_id)
+        if session is not None:
+            if session.user_id is not None and session.user_id != str(user_id):
+                raise ValueError(f"Session {session_id} not found")
+            agent.additional_context = build_session_context(session)
+
+    return agent
+
+
+def reset_meal_planning_agent(agent: Agent) -> None:
+    """
+    Clear everything bind_meal_planning_agent and a run set on an agent.
+
+    Args:
+        agent: Agent to return to its unbound state
+    """
+    agent.instructions = None
+    agent.additional_context = None
+    agent.user_id = None
+    agent.session_id = None
+    agent.session_state = None
+    agent.db = None
+    agent.cache_session = False
+    agent.enable_session_summaries = False
+    agent.add_session_summary_to_context = False
+    agent.session_summary_manager = None
+    agent._agent_session = None
+    # agno makes streaming sticky once a run has streamed
+    agent.stream = None
+    agent.stream_intermediate_steps = False
+
+
 async def create_meal_planning_agent(
     model_id: str = "claude-sonnet-4-0",
     user_id: Optional[int] = None,
@@ -106,45 +284,17 @@ async def create_meal_planning_agent(
         Configured Agent instance
 
     Raises:
-        ValueError: If user_id is not provided or preferences not found
+        ValueError: If user_id is not provided, preferences not found, or the
+            session belongs to another user
     """
     if user_id is None:
         raise ValueError("user_id is required to create a meal planning agent")
 
-    # Fetch user preferences from database
-    db: Session = SessionLocal()
-    try:
-        preferences = (
-            db.query(UserPreferences).filter(UserPreferences.user_id == user_id).first()
-        )
-
-        if not preferences:
-            raise ValueError(f"No preferences found for user_id: {user_id}")
-
-        # Build custom instructions from preferences
-        custom_instructions = build_custom_instructions(preferences)
-    finally:
-        db.close()
-
-    model = get_model_instance(model_id)
-
-    agent = Agent(
-        name="mealworm-meal-planner",
-        model=model,
-        instructions=custom_instructions,
-        tools=[
-            TavilyTools(),
-            FirecrawlTools(enable_scrape=True, enable_crawl=True),
-        ],
-        knowledge=await get_meal_planning_knowledge(),
-        search_knowledge=True,
-        markdown=True,
-    )
-    return agent
+    agent = build_meal_planning_agent(model_id, await get_meal_planning_knowledge())
+    return await bind_meal_planning_agent(agent, user_id=user_id, session_id=session_id)
 
 
 if __name__ == "__main__":
-    import asyncio
-
     agent = asyncio.run(create_meal_planning_agent())
-    agent.run("Generate a meal plan for the week.")
+    # The knowledge retriever is async, so runs must be too
+    asyncio.run(agent.arun("Generate a meal plan for the week."))
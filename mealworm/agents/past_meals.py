@@ -0,0 +1,307 @@
+"""Past meals index and repeat detection for generated meal plans.
+
+Every meal of a user's historical and generated plans is recorded in the
+past_meals table under a normalized name with a trigram index. After a plan is
+generated, its dinners are fuzzy-matched against the meals of the user's last
+REPEAT_LOOKBACK_PLANS plans in one query. Only the dinners that repeat are sent
+back to the agent to be replaced, instead of regenerating the whole plan.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from os import getenv
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import delete, text
+from sqlalchemy.dialects import postgresql
+
+from mealworm.agents.instructions_builder import get_start_of_coming_week
+from mealworm.agents.meal_plan_reader import MealPlanReader, parse_week_start
+from mealworm.db.models import GeneratedMealPlan, PastMeal
+from mealworm.db.session import SessionLocal
+
+# Number of earlier plans a new dinner must not repeat
+REPEAT_LOOKBACK_PLANS = int(getenv("REPEAT_LOOKBACK_PLANS", "10"))
+# Trigram similarity (0-1) from which two meal names count as the same meal
+REPEAT_SIMILARITY_THRESHOLD = float(getenv("REPEAT_SIMILARITY_THRESHOLD", "0.5"))
+# Times the agent is asked to replace repeated dinners before the plan is kept
+REPEAT_MAX_REPROMPTS = int(getenv("REPEAT_MAX_REPROMPTS", "2"))
+
+# Slot entries that are not meal choices and never count as repeats
+NOT_A_MEAL = re.compile(r"^(leftovers?\b|eating out|eat out|take ?out|tbd\b)")
+FILLER_WORDS = {"a", "and", "the", "with", "of", "on", "in", "style", "easy", "quick"}
+
+
+@dataclass
+class PlannedMeal:
+    week_start: date
+    meal_date: date
+    day: str
+    slot: str
+    name: str
+    normalized_name: str
+
+
+@dataclass
+class RepeatedMeal:
+    """A new dinner that matches a meal from a recent plan"""
+
+    day: str
+    meal_date: date
+    name: str
+    past_name: str
+    past_date: date
+    similarity: float
+
+
+def normalize_meal_name(name: str) -> str:
+    """
+    Normalize a meal name for fuzzy matching.
+
+    Lowercases, and drops notes in parentheses, links, punctuation and filler
+    words, e.g. "Baja-style fish tacos with slaw (fish)" -> "baja fish tacos slaw".
+    """
+    name = re.sub(r"https?://\S+", " ", name.lower())
+    name = re.sub(r"\([^)]*\)", " ", name)
+    name = re.sub(r"[^a-z0-9]+", " ", name)
+    return " ".join(word for word in name.split() if word not in FILLER_WORDS)
+
+
+def extract_meals(plan: str, week_start: Optional[date] = None) -> List[PlannedMeal]:
+    """
+    Extract the meals of a meal plan that can repeat.
+
+    Leftovers, eating out and empty slots are skipped.
+
+    Args:
+        plan: Meal plan markdown
+        week_start: Start of the plan's week; otherwise taken from the plan
+            title, falling back to the coming Sunday
+
+    Returns:
+        Meals with their date and slot
+    """
+    if week_start is None:
+        week_start = parse_week_start("", plan) or get_start_of_coming_week().date()
+    documents = MealPlanReader().parse(plan, week_start.isoformat())
+
+    meals = []
+    for document in documents:
+        meta = document.meta_data
+        name = meta["meal"].strip()
+        normalized = normalize_meal_name(name)
+        if not normalized or meta["leftover"] or NOT_A_MEAL.match(name.lower()):
+            continue
+        meals.append(
+            PlannedMeal(
+                week_start=week_start,
+                meal_date=date.fromisoformat(meta["date"]),
+                day=meta["day"],
+                slot=meta["slot"],
+                name=name[:500],
+                normalized_name=normalized[:500],
+            )
+        )
+    return meals
+
+
+def unique_slots(meals: List[PlannedMeal]) -> List[PlannedMeal]:
+    """
+    Keep one meal per date and slot, the last one.
+
+    A plan can fill a slot twice (e.g. "Snack:" and "Snacks:" on one day), and
+    one upsert cannot write the same past_meals row twice.
+    """
+    return list({(meal.meal_date, meal.slot): meal for meal in meals}.values())
+
+
+def record_meals(
+    user_id: int,
+    meals: List[PlannedMeal],
+    source: str,
+    plan_id: Optional[int] = None,
+) -> None:
+    """
+    Record meals in past_meals, replacing what was recorded for the same slots.
+
+    Args:
+        user_id: Owner of the plan
+        meals: Meals to record
+        source: "historical" or "generated"
+        plan_id: GeneratedMealPlan the meals come from
+    """
+    meals = unique_slots(meals)
+    if not meals:
+        return
+    insert_stmt = postgresql.insert(PastMeal).values(
+        [
+            {
+                "user_id": user_id,
+                "week_start": meal.week_start,
+                "meal_date": meal.meal_date,
+                "slot": meal.slot,
+                "name": meal.name,
+                "normalized_name": meal.normalized_name,
+                "source": source,
+                "plan_id": plan_id,
+            }
+            for meal in meals
+        ]
+    )
+    with SessionLocal() as db:
+        db.execute(
+            insert_stmt.on_conflict_do_update(
+                constraint="uq_past_meals_user_slot",
+                set_={
+                    column: insert_stmt.excluded[column]
+                    for column in (
+                        "week_start",
+                        "name",
+                        "normalized_name",
+                        "source",
+                        "plan_id",
+                    )
+                },
+            )
+        )
+        db.commit()
+
+
+def record_historical_plan(user_id: int, path: Path) -> None:
+    """Record the meals of a historical plan file (named by its week, e.g. 2026-01-11.md)"""
+    plan = path.read_text(encoding="utf-8")
+    week_start = parse_week_start(path.stem, plan)
+    if week_start is not None:
+        record_meals(user_id, extract_meals(plan, week_start), "historical")
+
+
+def record_generated_plan(user_id: int, plan: str) -> None:
+    """
+    Store a generated meal plan and record its meals.
+
+    A user has one plan per week: a revised plan (e.g. a follow-up run in the
+    same session) replaces the one stored for its week, and the meals recorded
+    from it. Responses that are not meal plans (no meals found) are ignored.
+
+    Args:
+        user_id: User the plan was generated for
+        plan: Meal plan markdown
+    """
+    meals = extract_meals(plan)
+    if not meals:
+        return
+    insert_stmt = postgresql.insert(GeneratedMealPlan).values(
+        user_id=user_id,
+        week_starting=datetime.combine(meals[0].week_start, datetime.min.time()),
+        markdown_content=plan,
+    )
+    with SessionLocal() as db:
+        plan_id = db.execute(
+            insert_stmt.on_conflict_do_update(
+                constraint="uq_generated_meal_plans_user_week",
+                set_={"markdown_content": insert_stmt.excluded.markdown_content},
+            ).returning(GeneratedMealPlan.id)
+        ).scalar_one()
+        # Slots the revision dropped would otherwise keep the old meals
+        db.execute(delete(PastMeal).where(PastMeal.plan_id == plan_id))
+        db.commit()
+    record_meals(user_id, meals, "generated", plan_id=plan_id)
+
+
+def find_repeated_dinners(user_id: int, plan: str) -> List[RepeatedMeal]:
+    """
+    Find dinners of a plan that repeat meals from the user's recent plans.
+
+    All dinners are matched in one query through the trigram index.
+
+    Args:
+        user_id: User the plan is for
+        plan: Meal plan markdown
+
+    Returns:
+        The repeated dinners with their closest past match
+    """
+    dinners = [meal for meal in extract_meals(plan) if meal.slot == "dinner"]
+    if not dinners:
+        return []
+
+    statement = text(
+        """
+        WITH recent_weeks AS (
+            SELECT DISTINCT week_start FROM past_meals
+            WHERE user_id = :user_id AND week_start < :week_start
+            ORDER BY week_start DESC
+            LIMIT :lookback
+        ),
+        candidates AS (
+            SELECT * FROM unnest(CAST(:dates AS date[]), CAST(:names AS text[]))
+                AS c(meal_date, normalized_name)
+        )
+        SELECT DISTINCT ON (c.meal_date)
+            c.meal_date, p.name AS past_name, p.meal_date AS past_date,
+            similarity(p.normalized_name, c.normalized_name) AS similarity
+        FROM candidates AS c
+        JOIN past_meals AS p ON p.normalized_name % c.normalized_name
+        WHERE p.user_id = :user_id
+            AND p.week_start IN (SELECT week_start FROM recent_weeks)
+        ORDER BY c.meal_date, similarity DESC
+        """
+    )
+    with SessionLocal() as db:
+        # % matches pairs at or above this similarity, using the trigram index
+        db.execute(
+            text("SELECT set_config('pg_trgm.similarity_threshold', :threshold, true)"),
+            {"threshold": str(REPEAT_SIMILARITY_THRESHOLD)},
+        )
+        rows = db.execute(
+            statement,
+            {
+                "user_id": user_id,
+                "week_start": dinners[0].week_start,
+                "lookback": REPEAT_LOOKBACK_PLANS,
+                "dates": [meal.meal_date for meal in dinners],
+                "names": [meal.normalized_name for meal in dinners],
+            },
+        ).all()
+
+    # A plan can have two Sundays, so dinners are told apart by date
+    by_date = {meal.meal_date: meal for meal in dinners}
+    return [
+        RepeatedMeal(
+            day=by_date[row.meal_date].day,
+            meal_date=row.meal_date,
+            name=by_date[row.meal_date].name,
+            past_name=row.past_name,
+            past_date=row.past_date,
+            similarity=float(row.similarity),
+        )
+        for row in rows
+    ]
+
+
+def build_repeat_reprompt(plan: str, repeats: List[RepeatedMeal]) -> str:
+    """
+    Build the follow-up message asking the agent to replace repeated dinners.
+
+    Args:
+        plan: The generated meal plan
+        repeats: Its repeated dinners
+
+    Returns:
+        Message for a follow-up run
+    """
+    lines = [
+        f'- {repeat.day} ({repeat.meal_date.isoformat()}) dinner: "{repeat.name}" repeats "{repeat.past_name}" '
+        f"from {repeat.past_date.isoformat()}"
+        for repeat in repeats
+    ]
+    return (
+        f"These dinners repeat meals from my last {REPEAT_LOOKBACK_PLANS} meal plans:\n"
+        + "\n".join(lines)
+        + "\n\nReplace only these dinners with new meals that are not in my recent "
+        "plans, including their ingredients and recipe links. Keep every other day, "
+        "meal, ingredient list and link as it is, and present the full updated meal plan."
+        "\n\n## Current Meal Plan\n\n" + plan
+    )
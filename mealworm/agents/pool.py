@@ -0,0 +1,179 @@
+"""Warm pool of pre-built agents, keyed by model id."""
+
+import asyncio
+from dataclasses import dataclass, field
+from logging import getLogger
+from os import getenv
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from agno.agent import Agent
+from agno.knowledge.knowledge import Knowledge
+
+from mealworm.agents.meal_planner import (
+    build_meal_planning_agent,
+    get_meal_planning_knowledge,
+    reset_meal_planning_agent,
+)
+
+logger = getLogger(__name__)
+
+# Idle agents kept per model; checkouts beyond this build a fresh agent
+AGENT_POOL_SIZE = int(getenv("AGENT_POOL_SIZE", "4"))
+# Comma-separated model ids to pre-build at startup
+AGENT_POOL_WARM_MODELS = [
+    m.strip()
+    for m in getenv("AGENT_POOL_WARM_MODELS", "claude-sonnet-4-0").split(",")
+    if m.strip()
+]
+
+
+@dataclass
+class PoolStats:
+    """Counters for one model's pool."""
+
+    in_use: int = 0
+    created: int = 0
+    hits: int = 0
+    misses: int = 0
+    discarded: int = 0
+
+
+@dataclass
+class _ModelPool:
+    idle: List[Agent] = field(default_factory=list)
+    stats: PoolStats = field(default_factory=PoolStats)
+
+
+class AgentPool:
+    """
+    Pool of unbound agents per model id.
+
+    Agents are checked out for exactly one run, bound to a user by the caller,
+    and reset before they go back into the pool. When a pool is empty a new
+    agent is built rather than making the request wait.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], Awaitable[Agent]],
+        reset: Callable[[Agent], None],
+        size: int = AGENT_POOL_SIZE,
+    ):
+        self.factory = factory
+        self.reset = reset
+        self.size = size
+        self._pools: Dict[str, _ModelPool] = {}
+        self._lock = asyncio.Lock()
+
+    def _pool(self, model_id: str) -> _ModelPool:
+        return self._pools.setdefault(model_id, _ModelPool())
+
+    async def _build(self, model_id: str) -> Agent:
+        agent = await self.factory(model_id)
+        self._pool(model_id).stats.created += 1
+        return agent
+
+    async def warm(self, model_ids: List[str]) -> None:
+        """
+        Fill the pool for each model up to its size.
+
+        Args:
+            model_ids: Models to pre-build agents for
+        """
+        for model_id in model_ids:
+            pool = self._pool(model_id)
+            while len(pool.idle) < self.size:
+                pool.idle.append(await self._build(model_id))
+            logger.info(f"Agent pool warmed for {model_id}: {len(pool.idle)} idle")
+
+    async def checkout(self, model_id: str) -> Agent:
+        """
+        Take an agent for `model_id` out of the pool.
+
+        Args:
+            model_id: Model identifier
+
+        Returns:
+            An unbound agent; must be given back with `checkin`
+        """
+        async with self._lock:
+            pool = self._pool(model_id)
+            agent: Optional[Agent] = pool.idle.pop() if pool.idle else None
+            if agent is not None:
+                pool.stats.hits += 1
+            else:
+                pool.stats.misses += 1
+            pool.stats.in_use += 1
+
+        if agent is None:
+            try:
+                agent = await self._build(model_id)
+            except Exception:
+                pool.stats.in_use -= 1
+                raise
+        return agent
+
+    async def checkin(self, model_id: str, agent: Agent) -> None:
+        """
+        Reset an agent and return it to the pool.
+
+        Args:
+            model_id: Model the agent was checked out for
+            agent: Agent returned by `checkout`
+        """
+        pool = self._pool(model_id)
+        reusable = True
+        try:
+            self.reset(agent)
+        except Exception as e:
+            logger.error(f"Failed to reset pooled agent for {model_id}: {e}")
+            reusable = False
+
+        async with self._lock:
+            pool.stats.in_use -= 1
+            if reusable and len(pool.idle) < self.size:
+                pool.idle.append(agent)
+            else:
+                pool.stats.discarded += 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return pool counters per model id."""
+        return {
+            model_id: {
+                "size": self.size,
+                "idle": len(pool.idle),
+                "in_use": pool.stats.in_use,
+                "created": pool.stats.created,
+                "hits": pool.stats.hits,
+                "misses": pool.stats.misses,
+                "discarded": pool.stats.discarded,
+            }
+            for model_id, pool in self._pools.items()
+        }
+
+
+_knowledge: Optional[Knowledge] = None
+_knowledge_lock = asyncio.Lock()
+
+
+async def _build_meal_planning_agent(model_id: str) -> Agent:
+    # All pooled agents share one knowledge base instance
+    global _knowledge
+    async with _knowledge_lock:
+        if _knowledge is None:
+            _knowledge = await get_meal_planning_knowledge()
+    return build_meal_planning_agent(model_id, _knowledge)
+
+
+meal_planning_agent_pool = AgentPool(
+    factory=_build_meal_planning_agent,
+    reset=reset_meal_planning_agent,
+)
+
+
+async def warm_agent_pool() -> None:
+    """Pre-build pooled agents for AGENT_POOL_WARM_MODELS, logging failures."""
+    try:
+        await meal_planning_agent_pool.warm(AGENT_POOL_WARM_MODELS)
+    except Exception as e:
+        logger.error(f"Failed to warm agent pool: {e}")
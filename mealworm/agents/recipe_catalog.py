@@ -0,0 +1,294 @@
+"""Meal-level embeddings of the synced Notion recipe catalog.
+
+Every meal in the `meals` table (see mealworm/notion_sync.py) is embedded as one
+document in its own PgVector table, keyed by the Notion page id, so the planner
+can look up known recipes by similarity instead of searching the web.
+
+Usage: python -m mealworm.agents.recipe_catalog (after python -m mealworm.notion_sync)
+"""
+
+from datetime import datetime
+from hashlib import md5
+from os import getenv
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+from agno.knowledge.document import Document
+from agno.knowledge.embedder.openai import OpenAIEmbedder
+from agno.vectordb.pgvector import PgVector
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects import postgresql
+
+from mealworm.agents.embedding_cache import CachedEmbedder
+from mealworm.db.models import MealRecord
+from mealworm.db.session import SessionLocal
+from mealworm.db.url import get_db_url
+
+# PgVector table holding one row per meal
+RECIPE_CATALOG_TABLE = "meal_catalog"
+# Meals embedded per embedding API call and per upsert statement
+RECIPE_EMBED_BATCH_SIZE = int(getenv("RECIPE_EMBED_BATCH_SIZE", "64"))
+# Page content beyond this many characters is not embedded
+RECIPE_CONTENT_MAX_CHARS = int(getenv("RECIPE_CONTENT_MAX_CHARS", "4000"))
+
+_catalog_db: Optional[PgVector] = None
+
+
+def get_recipe_catalog_db() -> PgVector:
+    """Return the shared PgVector table for the recipe catalog, creating it if needed."""
+    global _catalog_db
+    if _catalog_db is None:
+        # Batch embedding is used when loading the catalog; the cache passes
+        # misses through to OpenAIEmbedder's batch API
+        _catalog_db = PgVector(
+            table_name=RECIPE_CATALOG_TABLE,
+            db_url=get_db_url(),
+            embedder=CachedEmbedder(embedder=OpenAIEmbedder()),
+        )
+        _catalog_db.create()
+    return _catalog_db
+
+
+def get_recipe_url(raw_notion_data: Dict[str, Any]) -> Optional[str]:
+    """
+    Find the recipe link of a Notion meal page.
+
+    Args:
+        raw_notion_data: Notion page object
+
+    Returns:
+        The first filled-in URL property, otherwise the Notion page URL
+    """
+    for prop in (raw_notion_data.get("properties") or {}).values():
+        if prop.get("type") == "url" and prop.get("url"):
+            return prop["url"]
+    return raw_notion_data.get("url")
+
+
+def meal_to_document(record: MealRecord) -> Document:
+    """
+    Build the catalog document for a meal.
+
+    The embedded text is the title, cuisine and tags followed by the start of
+    the page content; everything else is kept as filterable metadata.
+
+    Args:
+        record: Row of the meals table
+
+    Returns:
+        Document whose id is the Notion page id
+    """
+    lines = [record.title]
+    if record.cuisine_type:
+        lines.append(f"Cuisine: {record.cuisine_type}")
+    if record.tags:
+        lines.append(f"Tags: {', '.join(record.tags)}")
+    if record.description:
+        lines.append(record.description)
+    if record.page_content:
+        lines.append("")
+        lines.append(record.page_content[:RECIPE_CONTENT_MAX_CHARS])
+
+    return Document(
+        id=record.id,
+        name=record.title,
+        content="\n".join(lines),
+        meta_data={
+            "meal_id": record.id,
+            "title": record.title,
+            "cuisine_type": record.cuisine_type,
+            "tags": record.tags or [],
+            "prep_time": record.prep_time,
+            "cook_time": record.cook_time,
+            "rating": record.rating,
+            "last_made": record.last_made.isoformat() if record.last_made else None,
+            "recipe_url": get_recipe_url(record.raw_notion_data or {}),
+        },
+    )
+
+
+def _content_hash(document: Document) -> str:
+    return md5(document.content.encode()).hexdigest()
+
+
+def _pending_meals() -> List[MealRecord]:
+    """Meals synced (or deleted) since they were last embedded"""
+    with SessionLocal() as db:
+        return (
+            db.query(MealRecord)
+            .filter(
+                or_(
+                    MealRecord.embedded_at.is_(None),
+                    MealRecord.embedded_at < MealRecord.synced_at,
+                    MealRecord.deleted_at.is_not(None),
+                )
+            )
+            .filter(
+                # Deleted meals only need work if they were ever embedded
+                or_(
+                    MealRecord.deleted_at.is_(None), MealRecord.embedded_at.is_not(None)
+                )
+            )
+            .all()
+        )
+
+
+def _embed_batch(vector_db: PgVector, records: List[MealRecord]) -> int:
+    """Embed and upsert one batch of meals; returns how many were embedded"""
+    documents = [meal_to_document(record) for record in records]
+    table = vector_db.table
+
+    # Meals whose text is unchanged (e.g. only the rating changed) keep their
+    # embedding and only get their metadata updated
+    with vector_db.Session() as sess:
+        stored = dict(
+            sess.execute(
+                select(table.c.id, table.c.content_hash).where(
+                    table.c.id.in_([d.id for d in documents])
+                )
+            ).all()
+        )
+        to_embed = [d for d in documents if stored.get(d.id) != _content_hash(d)]
+        embed_ids = {d.id for d in to_embed}
+        for document in documents:
+            if document.id not in embed_ids:
+                sess.execute(
+                    table.update()
+                    .where(table.c.id == document.id)
+                    .values(meta_data=document.meta_data, name=document.name)
+                )
+
+        if to_embed:
+            # get_recipe_catalog_db always sets a CachedEmbedder
+            embedder = cast(CachedEmbedder, vector_db.embedder)
+            embeddings = embedder.get_embeddings_batch(
+                [d.content for d in to_embed], batch_size=RECIPE_EMBED_BATCH_SIZE
+            )
+            insert_stmt = postgresql.insert(table).values(
+                [
+                    {
+                        "id": document.id,
+                        "name": document.name,
+                        "meta_data": document.meta_data,
+                        "filters": {},
+                        "content": document.content,
+                        "embedding": embedding,
+                        "content_hash": _content_hash(document),
+                        "content_id": document.id,
+                    }
+                    for document, embedding in zip(to_embed, embeddings)
+                ]
+            )
+            sess.execute(
+                insert_stmt.on_conflict_do_update(
+                    index_elements=["id"],
+                    set_={
+                        column: insert_stmt.excluded[column]
+                        for column in (
+                            "name",
+                            "meta_data",
+                            "content",
+                            "embedding",
+                            "content_hash",
+                            "content_id",
+                        )
+                    },
+                )
+            )
+        sess.commit()
+    return len(to_embed)
+
+
+def embed_meal_catalog() -> Dict[str, int]:
+    """
+    Bring the recipe catalog embeddings up to date with the meals table.
+
+    Only meals synced since they were last embedded are processed, in batches
+    of RECIPE_EMBED_BATCH_SIZE with one embedding call per batch. Meals deleted
+    in Notion are removed from the catalog.
+
+    Returns:
+        Counts of embedded, metadata-only updated and removed meals
+    """
+    vector_db = get_recipe_catalog_db()
+    pending = _pending_meals()
+    live = [record for record in pending if record.deleted_at is None]
+    deleted = [record for record in pending if record.deleted_at is not None]
+    counts = {"embedded": 0, "updated": 0, "removed": 0}
+
+    for i in range(0, len(live), RECIPE_EMBED_BATCH_SIZE):
+        batch = live[i : i + RECIPE_EMBED_BATCH_SIZE]
+        embedded = _embed_batch(vector_db, batch)
+        counts["embedded"] += embedded
+        counts["updated"] += len(batch) - embedded
+        # Stamp with the sync time that was embedded, so a meal re-synced in
+        # the meantime is picked up again on the next run
+        _set_embedded_at([(record.id, record.synced_at) for record in batch])
+
+    if deleted:
+        ids = [record.id for record in deleted]
+        with vector_db.Session() as sess:
+            sess.execute(vector_db.table.delete().where(vector_db.table.c.id.in_(ids)))
+            sess.commit()
+        _set_embedded_at([(meal_id, None) for meal_id in ids])
+        counts["removed"] = len(ids)
+
+    return counts
+
+
+def _set_embedded_at(values: List[Tuple[str, Optional[datetime]]]) -> None:
+    with SessionLocal() as db:
+        db.execute(
+            update(MealRecord),
+            [{"id": meal_id, "embedded_at": at} for meal_id, at in values],
+        )
+        db.commit()
+
+
+def search_recipe_catalog(
+    query: str, cuisine_type: Optional[str] = None, limit: int = 5
+) -> str:
+    """
+    Search my saved recipes (from my Notion recipe catalog) for meals similar to a query.
+
+    Use this before searching the web: a saved recipe already has a working link.
+
+    Args:
+        query: What to look for, e.g. "spicy chicken stir fry" or "salmon traybake"
+        cuisine_type: Optional cuisine to restrict to, e.g. "Thai"
+        limit: Maximum number of recipes to return
+
+    Returns:
+        Matching recipes with cuisine, times, rating and recipe link
+    """
+    filters = {"cuisine_type": cuisine_type} if cuisine_type else None
+    documents = get_recipe_catalog_db().vector_search(
+        query, limit=limit, filters=filters
+    )
+    if not documents:
+        return "No saved recipes found."
+
+    results = []
+    for document in documents:
+        meta = document.meta_data or {}
+        details = [
+            f"cuisine: {meta['cuisine_type']}" if meta.get("cuisine_type") else None,
+            f"prep {meta['prep_time']} min" if meta.get("prep_time") else None,
+            f"cook {meta['cook_time']} min" if meta.get("cook_time") else None,
+            f"rating {meta['rating']}/5" if meta.get("rating") else None,
+            f"last made {meta['last_made'][:10]}" if meta.get("last_made") else None,
+        ]
+        line = f"- {meta.get('title', document.name)}"
+        if any(details):
+            line += f" ({', '.join(d for d in details if d)})"
+        if meta.get("recipe_url"):
+            line += f": {meta['recipe_url']}"
+        results.append(line)
+    return "\n".join(results)
+
+
+if __name__ == "__main__":
+    counts = embed_meal_catalog()
+    print(
+        f"Recipe catalog: {counts['embedded']} embedded, "
+        f"{counts['updated']} updated, {counts['removed']} removed"
+    )
@@ -1,7 +1,10 @@
 from enum import Enum
 from typing import List, Optional
 
-from mealworm.agents.meal_planner import create_meal_planning_agent
+from agno.agent import Agent
+
+from mealworm.agents.meal_planner import bind_meal_planning_agent
+from mealworm.agents.pool import meal_planning_agent_pool
 
 
 class AgentType(Enum):
@@ -20,14 +23,26 @@ async def get_agent(
     session_id: Optional[str] = None,
     debug_mode: bool = True,
 ):
+    """
+    Check an agent out of its warm pool and bind it to the user.
+    The agent must be handed back with `release_agent` once the run is done.
+    """
     if agent_id == AgentType.MEAL_PLANNING_AGENT:
-        agent = await create_meal_planning_agent(
-            model_id=model_id,
-            user_id=user_id,
-            session_id=session_id,
-            debug_mode=debug_mode,
-        )
+        agent = await meal_planning_agent_pool.checkout(model_id)
+        try:
+            await bind_meal_planning_agent(
+                agent, user_id=user_id, session_id=session_id
+            )
+        except Exception:
+            await meal_planning_agent_pool.checkin(model_id, agent)
+            raise
     else:
         raise ValueError(f"Agent: {agent_id} not found")
 
     return agent
+
+
+async def release_agent(agent_id: AgentType, model_id: str, agent: Agent) -> None:
+    """Return an agent from `get_agent` to its pool."""
+    if agent_id == AgentType.MEAL_PLANNING_AGENT:
+        await meal_planning_agent_pool.checkin(model_id, agent)
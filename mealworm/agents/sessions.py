@@ -0,0 +1,150 @@
+"""Persisted agent sessions with rolling, token-capped summaries."""
+
+from os import getenv
+from textwrap import dedent
+from typing import List, Optional
+
+from agno.db.postgres import PostgresDb
+from agno.models.message import Message
+from agno.session.agent import AgentSession
+from agno.session.summary import SessionSummaryManager, SessionSummaryResponse
+from agno.utils.prompts import get_json_output_prompt
+
+from mealworm.db.session import db_engine
+
+# Table holding agno agent sessions (one row per session_id, uniquely indexed)
+SESSION_TABLE = "agent_sessions"
+
+# Token budgets for what a follow-up run sees from earlier turns
+SESSION_HISTORY_MAX_TOKENS = int(getenv("SESSION_HISTORY_MAX_TOKENS", "6000"))
+SESSION_SUMMARY_MAX_TOKENS = int(getenv("SESSION_SUMMARY_MAX_TOKENS", "400"))
+
+# Rough chars-per-token ratio for English text; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+SUMMARY_PROMPT = dedent("""\
+    You maintain a running summary of a meal planning conversation.
+    Update the previous summary with the latest exchange. Keep decisions the
+    user made (swapped meals, new constraints, days changed) and drop detail
+    that is already visible in the current meal plan. Keep the summary under
+    {max_tokens} tokens.
+
+    <previous_summary>
+    {previous_summary}
+    </previous_summary>
+
+    <latest_exchange>
+    """)
+
+_session_db: Optional[PostgresDb] = None
+
+
+def get_session_db() -> PostgresDb:
+    """Return the shared agno Postgres storage for agent sessions."""
+    global _session_db
+    if _session_db is None:
+        _session_db = PostgresDb(db_engine=db_engine, session_table=SESSION_TABLE)
+    return _session_db
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Truncate text to roughly `max_tokens` tokens.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Approximate token budget
+
+    Returns:
+        The text, cut at the last line break that fits the budget
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n", 0, max_chars)
+    return text[: cut if cut > 0 else max_chars] + "\n[...]"
+
+
+def get_latest_plan(session: AgentSession) -> Optional[str]:
+    """
+    Return the content of the most recent completed run in a session.
+
+    Args:
+        session: Agent session loaded from storage
+
+    Returns:
+        The latest assistant output, or None if the session has no runs
+    """
+    for run in reversed(session.runs or []):
+        content = getattr(run, "content", None)
+        if isinstance(content, str) and content.strip():
+            return content
+    return None
+
+
+def build_session_context(session: AgentSession) -> Optional[str]:
+    """
+    Build the additional context given to a follow-up run.
+
+    The context is the rolling summary of earlier turns plus the latest meal
+    plan, capped at SESSION_HISTORY_MAX_TOKENS so follow-ups stay cheap no
+    matter how long the session has run.
+
+    Args:
+        session: Agent session loaded from storage
+
+    Returns:
+        Context string, or None if the session has nothing to carry over
+    """
+    parts: List[str] = []
+    summary = session.get_session_summary()
+    if summary is not None and summary.summary:
+        summary_text = truncate_to_tokens(summary.summary, SESSION_SUMMARY_MAX_TOKENS)
+        parts.append(f"## Conversation So Far\n{summary_text}")
+
+    latest_plan = get_latest_plan(session)
+    if latest_plan:
+        used = sum(len(p) for p in parts) // CHARS_PER_TOKEN
+        plan_budget = max(SESSION_HISTORY_MAX_TOKENS - used, 0)
+        parts.append(
+            f"## Current Meal Plan\n{truncate_to_tokens(latest_plan, plan_budget)}"
+        )
+
+    return "\n\n".join(parts) if parts else None
+
+
+class RollingSessionSummaryManager(SessionSummaryManager):
+    """
+    Session summary manager that folds only the latest exchange into the
+    previous summary, instead of re-reading the whole conversation each run.
+    """
+
+    def _prepare_summary_messages(  # type: ignore[override]
+        self, session: Optional[AgentSession] = None
+    ) -> List[Message]:
+        if session is None or self.model is None:
+            return []
+
+        response_format = self.get_response_format(self.model)
+        previous = session.get_session_summary()
+        previous_text = previous.summary if previous is not None else ""
+        latest_exchange = session.get_messages_for_session()[-2:]
+
+        system_prompt = SUMMARY_PROMPT.format(
+            max_tokens=SESSION_SUMMARY_MAX_TOKENS, previous_summary=previous_text
+        )
+        for message in latest_exchange:
+            content = truncate_to_tokens(
+                str(message.content or ""), SESSION_HISTORY_MAX_TOKENS
+            )
+            speaker = "User" if message.role == "user" else "Assistant"
+            system_prompt += f"{speaker}: {content}\n"
+        system_prompt += "</latest_exchange>"
+
+        if response_format == {"type": "json_object"}:
+            system_prompt += "\n" + get_json_output_prompt(SessionSummaryResponse)  # type: ignore
+
+        return [
+            Message(role="system", content=system_prompt),
+            Message(role="user", content="Provide the updated summary."),
+        ]
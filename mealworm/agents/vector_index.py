@@ -0,0 +1,266 @@
+"""ANN index management for the meal plan PgVector table.
+
+The index type and its build and search parameters come from the environment.
+The search parameters (`ef_search` / `probes`) are applied by PgVector on every
+query; the build parameters are used when the index is created. Changing
+build parameters or the index type needs a reindex, which builds the new index
+CONCURRENTLY and swaps it in, so searches and inserts keep working meanwhile.
+
+Usage: python -m mealworm.agents.vector_index [--reindex]
+"""
+
+import argparse
+from os import getenv
+from typing import List, Optional, Union
+
+import agno.knowledge  # noqa: F401  # agno.vectordb fails to import before it
+from agno.utils.log import log_info
+from agno.vectordb.pgvector import HNSW, Distance, Ivfflat, PgVector
+from sqlalchemy import inspect, text
+
+from mealworm.agents.embedding_cache import CachedEmbedder
+from mealworm.db.url import get_db_url
+
+# PgVector table holding meal plan chunks (see mealworm/agents/meal_plan_reader.py)
+MEAL_PLANS_TABLE = "meal_plan_meals"
+
+# hnsw, ivfflat or none
+MEAL_PLAN_INDEX_TYPE = getenv("MEAL_PLAN_INDEX_TYPE", "hnsw").lower()
+# HNSW: graph degree and candidate list sizes at build and search time
+HNSW_M = int(getenv("HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(getenv("HNSW_EF_CONSTRUCTION", "64"))
+HNSW_EF_SEARCH = int(getenv("HNSW_EF_SEARCH", "40"))
+# IVFFlat: number of clusters, and clusters scanned per query
+IVFFLAT_LISTS = int(getenv("IVFFLAT_LISTS", "100"))
+IVFFLAT_PROBES = int(getenv("IVFFLAT_PROBES", "10"))
+# Memory for index builds; an HNSW build much larger than this is slow
+INDEX_MAINTENANCE_WORK_MEM = getenv("INDEX_MAINTENANCE_WORK_MEM", "512MB")
+
+VectorIndex = Union[HNSW, Ivfflat]
+
+OPERATOR_CLASSES = {
+    Distance.cosine: "vector_cosine_ops",
+    Distance.l2: "vector_l2_ops",
+    Distance.max_inner_product: "vector_ip_ops",
+}
+
+
+def build_vector_index(index_type: str = MEAL_PLAN_INDEX_TYPE) -> Optional[VectorIndex]:
+    """
+    Build the configured index definition.
+
+    Args:
+        index_type: "hnsw", "ivfflat" or "none"
+
+    Returns:
+        Index definition for PgVector's vector_index, or None for exact search
+    """
+    configuration = {"maintenance_work_mem": INDEX_MAINTENANCE_WORK_MEM}
+    if index_type == "hnsw":
+        return HNSW(
+            m=HNSW_M,
+            ef_construction=HNSW_EF_CONSTRUCTION,
+            ef_search=HNSW_EF_SEARCH,
+            configuration=configuration,
+        )
+    if index_type == "ivfflat":
+        return Ivfflat(
+            lists=IVFFLAT_LISTS,
+            probes=IVFFLAT_PROBES,
+            dynamic_lists=False,
+            configuration=configuration,
+        )
+    if index_type == "none":
+        return None
+    raise ValueError(f"Unknown vector index type: {index_type}")
+
+
+def index_name(table_name: str, index: VectorIndex) -> str:
+    """Name of the vector index of a table, matching PgVector's naming"""
+    if index.name:
+        return index.name
+    index_type = "hnsw" if isinstance(index, HNSW) else "ivfflat"
+    return f"{table_name}_{index_type}_index"
+
+
+def create_index_sql(
+    table_fullname: str,
+    name: str,
+    index: VectorIndex,
+    distance: Distance = Distance.cosine,
+    concurrently: bool = False,
+) -> str:
+    """
+    Build the CREATE INDEX statement for a vector index.
+
+    Args:
+        table_fullname: Schema-qualified table name
+        name: Index name
+        index: Index definition
+        distance: Distance the table is searched with
+        concurrently: Build without blocking writes (not inside a transaction)
+
+    Returns:
+        SQL statement
+    """
+    ops = OPERATOR_CLASSES.get(distance, "vector_cosine_ops")
+    if isinstance(index, HNSW):
+        method = "hnsw"
+        params = f"m = {int(index.m)}, ef_construction = {int(index.ef_construction)}"
+    else:
+        method = "ivfflat"
+        params = f"lists = {int(index.lists)}"
+    return (
+        f'CREATE INDEX {"CONCURRENTLY " if concurrently else ""}"{name}" '
+        f"ON {table_fullname} USING {method} (embedding {ops}) WITH ({params})"
+    )
+
+
+def set_maintenance_work_mem(conn, value: str, local: bool) -> None:
+    """
+    Set maintenance_work_mem for index builds.
+
+    SET does not take bound parameters, so the value goes through set_config.
+
+    Args:
+        conn: Connection or session to set it on
+        value: Memory size, e.g. "512MB"
+        local: Only for the current transaction
+    """
+    conn.execute(
+        text("SELECT set_config('maintenance_work_mem', :value, :local)"),
+        {"value": value, "local": local},
+    )
+
+
+def _vector_index_names(vector_db: PgVector) -> List[str]:
+    """Names of the existing ANN indexes on a PgVector table"""
+    indexes = inspect(vector_db.db_engine).get_indexes(
+        vector_db.table_name, schema=vector_db.schema
+    )
+    names = [idx["name"] for idx in indexes]
+    return [
+        name
+        for name in names
+        if name is not None and name.endswith(("_hnsw_index", "_ivfflat_index"))
+    ]
+
+
+def ensure_vector_index(vector_db: PgVector) -> None:
+    """
+    Create the table's vector index if it does not exist yet.
+
+    An existing index is kept as it is, even if its parameters differ from the
+    configured ones; use reindex_vector_index to apply new parameters.
+
+    Args:
+        vector_db: PgVector table whose vector_index to create
+    """
+    index = vector_db.vector_index
+    if index is None or not vector_db.table_exists():
+        return
+    name = index_name(vector_db.table_name, index)
+    if name in _vector_index_names(vector_db):
+        return
+
+    log_info(f"Creating vector index {name}")
+    with vector_db.Session() as sess, sess.begin():
+        set_maintenance_work_mem(
+            sess,
+            index.configuration.get("maintenance_work_mem", "64MB"),
+            local=True,
+        )
+        sess.execute(
+            text(
+                create_index_sql(
+                    vector_db.table.fullname, name, index, vector_db.distance
+                )
+            )
+        )
+
+
+def reindex_vector_index(vector_db: PgVector) -> None:
+    """
+    Rebuild the table's vector index online with the configured parameters.
+
+    The new index is built CONCURRENTLY under a temporary name, then the old
+    vector indexes (of either type) are dropped CONCURRENTLY and the new one is
+    renamed into place. Searches use the old index until the swap.
+
+    Args:
+        vector_db: PgVector table whose vector_index to rebuild
+    """
+    index = vector_db.vector_index
+    old_names = _vector_index_names(vector_db)
+    schema = vector_db.schema
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with vector_db.db_engine.connect().execution_options(
+        isolation_level="AUTOCOMMIT"
+    ) as conn:
+        if index is None:
+            for old_name in old_names:
+                log_info(f"Dropping vector index {old_name}")
+                conn.execute(
+                    text(f'DROP INDEX CONCURRENTLY IF EXISTS "{schema}"."{old_name}"')
+                )
+            return
+
+        name = index_name(vector_db.table_name, index)
+        new_name = f"{name}_new"
+        set_maintenance_work_mem(
+            conn,
+            index.configuration.get("maintenance_work_mem", "64MB"),
+            local=False,
+        )
+        # Left behind (invalid) if an earlier reindex was interrupted
+        conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{schema}"."{new_name}"'))
+
+        log_info(f"Building vector index {new_name}")
+        conn.execute(
+            text(
+                create_index_sql(
+                    vector_db.table.fullname,
+                    new_name,
+                    index,
+                    vector_db.distance,
+                    concurrently=True,
+                )
+            )
+        )
+        for old_name in old_names:
+            if old_name != new_name:
+                log_info(f"Dropping vector index {old_name}")
+                conn.execute(
+                    text(f'DROP INDEX CONCURRENTLY IF EXISTS "{schema}"."{old_name}"')
+                )
+        conn.execute(text(f'ALTER INDEX "{schema}"."{new_name}" RENAME TO "{name}"'))
+    log_info(f"Vector index {name} rebuilt")
+
+
+def get_meal_plans_db() -> PgVector:
+    """PgVector table of meal plan chunks, with the configured vector index"""
+    return PgVector(
+        table_name=MEAL_PLANS_TABLE,
+        db_url=get_db_url(),
+        embedder=CachedEmbedder(),
+        # PgVector skips index creation when this is None, though it is not
+        # annotated as Optional
+        vector_index=build_vector_index(),  # type: ignore[arg-type]
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the meal plans vector index")
+    parser.add_argument(
+        "--reindex",
+        action="store_true",
+        help="Rebuild the index online with the configured parameters",
+    )
+    args = parser.parse_args()
+
+    vector_db = get_meal_plans_db()
+    if args.reindex:
+        reindex_vector_index(vector_db)
+    else:
+        ensure_vector_index(vector_db)
@@ -0,0 +1,165 @@
+"""Per-worker caches that keep authentication off the database.
+
+Verified tokens are kept in an LRU keyed by the sha256 of the token until they
+expire, so a repeated token costs a hash and a dict lookup instead of a
+signature check; revocation is still checked every time (see revocation.py).
+The user behind a token comes from its claims (stateless auth) or from the
+users and preferences cache, reloaded after user_cache_ttl_seconds.
+
+Deactivating a user with `set_user_active` notifies every worker on
+USERS_CHANNEL: the user's cache entry is dropped and the user is added to the
+worker's deactivated set, which is checked before any token is accepted, even
+a stateless one. The set is reloaded from the database whenever the listener
+(re)connects.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from hashlib import sha256
+from logging import getLogger
+from typing import Optional, Set
+
+from sqlalchemy import select, update
+
+from mealworm.api.auth.jwt import TokenData, decode_access_token
+from mealworm.api.auth.revocation import revocation_list
+from mealworm.api.settings import api_settings
+from mealworm.db.models import User
+from mealworm.db.notify import notification_listener, notify
+from mealworm.db.preferences_cache import preferences_cache
+from mealworm.db.session import AsyncSessionLocal
+
+logger = getLogger(__name__)
+
+USERS_CHANNEL = "users_changed"
+
+
+class DecodedTokenCache:
+    """Thread-safe LRU of verified tokens, keyed by token hash"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, TokenData]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def decode(self, token: str) -> Optional[TokenData]:
+        """
+        Verify and decode a token, from the cache when it was seen before.
+
+        Invalid tokens are not cached, so they cannot push valid ones out.
+
+        Args:
+            token: JWT token string
+
+        Returns:
+            TokenData if the token is valid and not expired, None otherwise
+        """
+        key = sha256(token.encode()).hexdigest()
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            token_data = self._entries.get(key)
+            if token_data is not None:
+                if token_data.expires_at is not None and token_data.expires_at <= now:
+                    del self._entries[key]
+                    return None
+                self._entries.move_to_end(key)
+                return token_data
+
+        token_data = decode_access_token(token)
+        if token_data is None or token_data.user_id is None:
+            return None
+        with self._lock:
+            self._entries[key] = token_data
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return token_data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+decoded_tokens = DecodedTokenCache(api_settings.token_cache_size)
+
+# Users deactivated in the database, rejected whatever token they present
+deactivated_users: Set[int] = set()
+
+
+async def authenticate(token: str) -> Optional[User]:
+    """
+    Resolve a token to an active user without querying the database when hot.
+
+    Args:
+        token: JWT token string
+
+    Returns:
+        The user, or None if the token is invalid or revoked, or the user is
+        unknown or inactive
+    """
+    token_data = decoded_tokens.decode(token)
+    if token_data is None or token_data.user_id is None:
+        return None
+    if token_data.user_id in deactivated_users:
+        return None
+    if token_data.jti is not None and await revocation_list.is_revoked(token_data.jti):
+        return None
+    if api_settings.stateless_auth and token_data.is_stateless:
+        return token_data.to_user()
+
+    cached = await preferences_cache.async_get(
+        token_data.user_id, max_age=api_settings.user_cache_ttl_seconds
+    )
+    if cached is None or not cached.user.is_active:
+        return None
+    return cached.user
+
+
+def handle_user_notification(payload: str) -> None:
+    data = json.loads(payload)
+    user_id = int(data["user_id"])
+    if data.get("is_active", True):
+        deactivated_users.discard(user_id)
+    else:
+        deactivated_users.add(user_id)
+    preferences_cache.invalidate(user_id)
+
+
+async def load_deactivated_users() -> None:
+    """Replace the deactivated set with the inactive users in the database"""
+    async with AsyncSessionLocal() as db:
+        user_ids = await db.scalars(select(User.id).where(User.is_active.is_(False)))
+        deactivated = set(user_ids.all())
+    deactivated_users.clear()
+    deactivated_users.update(deactivated)
+    logger.info(f"Loaded {len(deactivated)} deactivated users")
+
+
+notification_listener.subscribe(USERS_CHANNEL, handle_user_notification)
+notification_listener.on_connect(load_deactivated_users)
+
+
+async def set_user_active(user_id: int, is_active: bool) -> bool:
+    """
+    Activate or deactivate a user and tell every worker.
+
+    Args:
+        user_id: User to update
+        is_active: New active status
+
+    Returns:
+        True if the user exists
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(is_active=is_active, updated_at=datetime.utcnow())
+        )
+        if result.rowcount == 0:
+            return False
+        await notify(db, USERS_CHANNEL, {"user_id": user_id, "is_active": is_active})
+        await db.commit()
+    handle_user_notification(json.dumps({"user_id": user_id, "is_active": is_active}))
+    return True
@@ -1,27 +1,25 @@
 """Authentication dependencies for FastAPI."""
 
-from fastapi import Depends, HTTPException, status, Cookie, Header
-from sqlalchemy.orm import Session
+from fastapi import HTTPException, status, Cookie, Header
 from typing import Optional
 
-from mealworm.db.session import get_db
 from mealworm.db.models import User
-from mealworm.api.auth.jwt import decode_access_token
+from mealworm.api.auth.cache import authenticate
 
 
 async def get_current_user(
     authorization: Optional[str] = Header(None, alias="Authorization"),
     access_token: Optional[str] = Cookie(None),
-    db: Session = Depends(get_db),
 ) -> User:
     """
     Dependency to get the current authenticated user from JWT token.
     Checks Authorization header first, then falls back to httpOnly cookie.
+    Verified tokens and users are cached per worker, so hot requests do not
+    query the database (see mealworm/api/auth/cache.py).
 
     Args:
         authorization: Authorization header with Bearer token
         access_token: JWT token from httpOnly cookie
-        db: Database session
 
     Returns:
         User object
@@ -45,19 +43,12 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    token_data = decode_access_token(token)
-    if token_data is None or token_data.user_id is None:
+    user = await authenticate(token)
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.id == token_data.user_id, User.is_active).first()
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found or inactive",
-        )
-
     return user
@@ -1,34 +1,74 @@
-"""JWT token utilities for authentication."""
+"""JWT token utilities for authentication.
 
+Access tokens are short-lived and sent with every request. Refresh tokens
+live for days and are only accepted by /auth/refresh, which rotates them.
+Both carry a jti claim so they can be revoked (see revocation.py).
+"""
+
+import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Dict, Optional
 import jwt
-from passlib.context import CryptContext
 from pydantic import BaseModel
 from os import getenv
 
+from mealworm.api.settings import api_settings
+from mealworm.db.models import User
+
 # Configuration
 SECRET_KEY = getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
+ACCESS_TOKEN_EXPIRE_MINUTES = int(getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
 
 
 class TokenData(BaseModel):
     """Token payload data."""
 
     user_id: Optional[int] = None
+    # Token id used for revocation; tokens issued before revocation have none
+    jti: Optional[str] = None
+    token_type: str = ACCESS_TOKEN_TYPE
+    # User claims, present in tokens issued with stateless auth enabled
+    email: Optional[str] = None
+    created_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+    @property
+    def is_stateless(self) -> bool:
+        return self.email is not None and self.created_at is not None
+
+    def to_user(self) -> User:
+        """Build a transient User from the token claims (never added to a session)"""
+        return User(
+            id=self.user_id,
+            email=self.email,
+            created_at=self.created_at,
+            is_active=True,
+        )
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+def user_token_claims(user: User) -> Dict[str, Any]:
+    """
+    Claims identifying a user in an access token.
+
+    With stateless auth enabled, the token also carries the user fields that
+    authenticated requests use, so they are served without loading the user.
 
+    Args:
+        user: User the token is issued to
 
-def get_password_hash(password: str) -> str:
-    """Hash a password for storing."""
-    return pwd_context.hash(password)
+    Returns:
+        Claims to pass to create_access_token
+    """
+    claims: Dict[str, Any] = {"sub": str(user.id)}  # Convert to string for JWT
+    if api_settings.stateless_auth:
+        claims["email"] = user.email
+        claims["created_at"] = user.created_at.isoformat()
+    return claims
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -50,28 +90,78 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
             minutes=ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
-    to_encode.update({"exp": expire})
+    to_encode.update(
+        {"exp": expire, "jti": uuid.uuid4().hex, "type": ACCESS_TOKEN_TYPE}
+    )
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> Optional[TokenData]:
+def create_refresh_token(user_id: int) -> str:
     """
-    Decode and verify a JWT access token.
+    Create a JWT refresh token.
 
     Args:
-        token: JWT token string
+        user_id: User the token is issued to
 
     Returns:
-        TokenData object if valid, None otherwise
+        Encoded JWT token string
     """
+    to_encode = {
+        "sub": str(user_id),
+        "exp": datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        "jti": uuid.uuid4().hex,
+        "type": REFRESH_TOKEN_TYPE,
+    }
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def _decode_token(token: str, token_type: str) -> Optional[TokenData]:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        # Tokens issued before refresh tokens existed have no type
+        if payload.get("type", ACCESS_TOKEN_TYPE) != token_type:
+            return None
         user_id_str: str = payload.get("sub")
         if user_id_str is None:
             return None
         # Convert string user_id back to int
         user_id = int(user_id_str)
-        return TokenData(user_id=user_id)
+        return TokenData(
+            user_id=user_id,
+            jti=payload.get("jti"),
+            token_type=token_type,
+            email=payload.get("email"),
+            created_at=payload.get("created_at"),
+            expires_at=datetime.fromtimestamp(payload["exp"], timezone.utc)
+            if "exp" in payload
+            else None,
+        )
     except (jwt.PyJWTError, jwt.DecodeError, jwt.ExpiredSignatureError):
         return None
+
+
+def decode_access_token(token: str) -> Optional[TokenData]:
+    """
+    Decode and verify a JWT access token.
+
+    Args:
+        token: JWT token string
+
+    Returns:
+        TokenData object if valid, None otherwise
+    """
+    return _decode_token(token, ACCESS_TOKEN_TYPE)
+
+
+def decode_refresh_token(token: str) -> Optional[TokenData]:
+    """
+    Decode and verify a JWT refresh token.
+
+    Args:
+        token: JWT token string
+
+    Returns:
+        TokenData object if valid, None otherwise
+    """
+    return _decode_token(token, REFRESH_TOKEN_TYPE)
@@ -0,0 +1,175 @@
+"""Password hashing and verification in a process pool.
+
+bcrypt is deliberately slow (hundreds of milliseconds of CPU at the default
+cost), so running it in a request handler would stall every other request on
+the worker, streaming runs included. Hashes are computed in a dedicated pool
+of PASSWORD_HASH_WORKERS processes instead, and the handler only awaits the
+result.
+
+The bcrypt cost factor is BCRYPT_ROUNDS. Hashes made with another cost are
+still accepted, and replaced by a hash at the current cost on the user's next
+login. Queue and hashing times are kept for the last METRICS_WINDOW jobs.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from os import getenv
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+# bcrypt cost factor (log2 of the iterations) for new hashes
+BCRYPT_ROUNDS = int(getenv("BCRYPT_ROUNDS", "12"))
+# Processes hashing passwords; one per core by default
+PASSWORD_HASH_WORKERS = int(getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+# Jobs the queue and hashing time percentiles are computed over
+METRICS_WINDOW = 1000
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a plain password against a hashed password."""
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def get_password_hash(password: str) -> str:
+    """Hash a password for storing."""
+    return pwd_context.hash(password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify a password; also return a new hash if the stored one uses an old policy."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _timed(fn: Callable[..., Any], *args: Any) -> Tuple[float, float, Any]:
+    """Run fn in a worker process, with wall clock start and end times"""
+    started = time.time()
+    result = fn(*args)
+    return started, time.time(), result
+
+
+@dataclass
+class PasswordHashMetrics:
+    """Counters and recent timings of password jobs"""
+
+    jobs: int = 0
+    in_flight: int = 0
+    queue_seconds: Deque[float] = field(
+        default_factory=lambda: deque(maxlen=METRICS_WINDOW)
+    )
+    hash_seconds: Deque[float] = field(
+        default_factory=lambda: deque(maxlen=METRICS_WINDOW)
+    )
+
+    @staticmethod
+    def _percentiles(values: Deque[float]) -> Dict[str, float]:
+        if len(values) < 2:
+            value = values[0] * 1000 if values else 0.0
+            return {"p50_ms": round(value, 2), "p99_ms": round(value, 2)}
+        cuts = statistics.quantiles(values, n=100)
+        return {
+            "p50_ms": round(cuts[49] * 1000, 2),
+            "p99_ms": round(cuts[98] * 1000, 2),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "jobs": self.jobs,
+            "in_flight": self.in_flight,
+            "queue": self._percentiles(self.queue_seconds),
+            "hash": self._percentiles(self.hash_seconds),
+        }
+
+
+class PasswordHasher:
+    """Runs password hashing and verification in a process pool"""
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS):
+        self.workers = workers
+        self.metrics = PasswordHashMetrics()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a worker with a running event loop and open
+                # database connections is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        self.metrics.in_flight += 1
+        try:
+            submitted = time.time()
+            try:
+                started, finished, result = await loop.run_in_executor(
+                    self._get_executor(), _timed, fn, *args
+                )
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM killed); start a new pool and retry once
+                self.shutdown()
+                submitted = time.time()
+                started, finished, result = await loop.run_in_executor(
+                    self._get_executor(), _timed, fn, *args
+                )
+        finally:
+            self.metrics.in_flight -= 1
+        self.metrics.jobs += 1
+        self.metrics.queue_seconds.append(max(started - submitted, 0.0))
+        self.metrics.hash_seconds.append(finished - started)
+        return result
+
+    async def hash(self, password: str) -> str:
+        """Hash a password for storing."""
+        return await self._run(get_password_hash, password)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password against its stored hash.
+
+        Args:
+            password: Plain password
+            hashed_password: Stored hash
+
+        Returns:
+            Whether the password matches, and a new hash to store if the stored
+            one was made with another cost factor
+        """
+        return await self._run(verify_and_update_password, password, hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "rounds": BCRYPT_ROUNDS,
+            **self.metrics.to_dict(),
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher()
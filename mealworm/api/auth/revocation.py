@@ -0,0 +1,210 @@
+"""Token revocation list with a per-worker bloom filter.
+
+Revoked tokens are stored by jti in the revoked_tokens table until they would
+have expired. Each worker mirrors the table into a bloom filter: loaded when
+the notification listener (re)connects, and updated from notifications on
+TOKENS_REVOKED_CHANNEL. Checking a token that was never revoked (nearly all
+of them) is an in-memory probe. A hit, which may be a false positive (at most
+TOKEN_REVOCATION_FP_RATE of the time), is confirmed in the database.
+
+While the listener is disconnected the filter may miss revocations, so every
+check goes to the database until it is back.
+"""
+
+import asyncio
+import json
+import math
+from datetime import datetime, timezone
+from hashlib import sha256
+from logging import getLogger
+from os import getenv
+from typing import Iterable, List, Set
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql
+
+from mealworm.api.auth.jwt import TokenData
+from mealworm.db.models import RevokedToken
+from mealworm.db.notify import notification_listener, notify
+from mealworm.db.session import AsyncSessionLocal
+
+logger = getLogger(__name__)
+
+# Revoked tokens the filter is sized for; it is rebuilt larger when exceeded
+TOKEN_REVOCATION_CAPACITY = int(getenv("TOKEN_REVOCATION_CAPACITY", "100000"))
+# False positive rate of the filter at capacity
+TOKEN_REVOCATION_FP_RATE = float(getenv("TOKEN_REVOCATION_FP_RATE", "0.001"))
+
+TOKENS_REVOKED_CHANNEL = "tokens_revoked"
+
+
+class BloomFilter:
+    """Fixed-size bloom filter of strings"""
+
+    def __init__(self, capacity: int, fp_rate: float):
+        self.capacity = max(capacity, 1)
+        self.size = max(
+            8, math.ceil(-self.capacity * math.log(fp_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = sha256(key.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class RevocationList:
+    """Checks tokens against the revoked_tokens table through a bloom filter"""
+
+    def __init__(
+        self,
+        capacity: int = TOKEN_REVOCATION_CAPACITY,
+        fp_rate: float = TOKEN_REVOCATION_FP_RATE,
+    ):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self._filter = BloomFilter(capacity, fp_rate)
+        self._rebuilding = False
+        # jtis added while a load is reading the database, one list per load
+        self._loading: List[List[str]] = []
+
+    async def load(self) -> None:
+        """Rebuild the filter from the unexpired revoked tokens in the database"""
+        added: List[str] = []
+        self._loading.append(added)
+        try:
+            async with AsyncSessionLocal() as db:
+                jtis = (
+                    await db.scalars(
+                        select(RevokedToken.jti).where(
+                            RevokedToken.expires_at > datetime.utcnow()
+                        )
+                    )
+                ).all()
+            bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.fp_rate)
+            # Revocations that arrived during the query may not be in its result;
+            # no await between here and the swap, so none can be missed
+            for jti in [*jtis, *added]:
+                bloom.add(jti)
+            self._filter = bloom
+        finally:
+            self._loading.remove(added)
+        logger.info(f"Loaded {len(jtis)} revoked tokens into the revocation filter")
+
+    async def _rebuild(self) -> None:
+        try:
+            await self.load()
+        except Exception as e:
+            logger.error(f"Failed to rebuild the revocation filter: {e}", exc_info=True)
+        finally:
+            self._rebuilding = False
+
+    def add(self, jti: str) -> None:
+        self._filter.add(jti)
+        for added in self._loading:
+            added.append(jti)
+        # Past capacity the false positive rate climbs; rebuild a larger filter
+        # (expired tokens drop out too)
+        if self._filter.count > self._filter.capacity and not self._rebuilding:
+            self._rebuilding = True
+            asyncio.get_running_loop().create_task(self._rebuild())
+
+    async def _is_revoked_in_db(self, jti: str) -> bool:
+        async with AsyncSessionLocal() as db:
+            found = await db.scalar(
+                select(RevokedToken.jti).where(RevokedToken.jti == jti)
+            )
+        return found is not None
+
+    async def is_revoked(self, jti: str) -> bool:
+        """
+        Check whether a token was revoked.
+
+        Args:
+            jti: Token id
+
+        Returns:
+            True if the token is in the revocation list
+        """
+        if notification_listener.connected and jti not in self._filter:
+            return False
+        return await self._is_revoked_in_db(jti)
+
+    def handle_notification(self, payload: str) -> None:
+        for jti in json.loads(payload)["jtis"]:
+            self.add(jti)
+
+    async def revoke(self, tokens: List[TokenData]) -> Set[str]:
+        """
+        Revoke tokens in every worker.
+
+        Args:
+            tokens: Decoded tokens to revoke; tokens without a jti are skipped
+
+        Returns:
+            jtis revoked by this call (tokens already revoked are left out)
+        """
+        rows = [
+            {
+                "jti": token.jti,
+                "user_id": token.user_id,
+                "token_type": token.token_type,
+                # Stored naive UTC like the other timestamps
+                "expires_at": (
+                    token.expires_at.astimezone(timezone.utc).replace(tzinfo=None)
+                    if token.expires_at
+                    else datetime.utcnow()
+                ),
+            }
+            for token in tokens
+            if token.jti is not None
+        ]
+        if not rows:
+            return set()
+
+        async with AsyncSessionLocal() as db:
+            revoked = set(
+                (
+                    await db.scalars(
+                        postgresql.insert(RevokedToken)
+                        .values(rows)
+                        .on_conflict_do_nothing()
+                        .returning(RevokedToken.jti)
+                    )
+                ).all()
+            )
+            # Expired tokens are rejected anyway; keep the table (and filters) small
+            await db.execute(
+                delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow())
+            )
+            if revoked:
+                await notify(db, TOKENS_REVOKED_CHANNEL, {"jtis": sorted(revoked)})
+            await db.commit()
+
+        for jti in revoked:
+            self.add(jti)
+        return revoked
+
+
+revocation_list = RevocationList()
+
+notification_listener.subscribe(
+    TOKENS_REVOKED_CHANNEL, revocation_list.handle_notification
+)
+notification_listener.on_connect(revocation_list.load)
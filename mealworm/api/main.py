@@ -1,11 +1,18 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware
 
+from mealworm.agents.pool import warm_agent_pool
+from mealworm.api.auth.passwords import password_hasher
 from mealworm.api.routes.v1_router import v1_router
 from mealworm.api.settings import api_settings
+from mealworm.db.notify import notification_listener
+from mealworm.db.session import async_db_engine
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +30,24 @@ async def global_exception_handler(request: Request, exc: Exception) -> JSONResp
     )
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Start background work for the lifetime of the app.
+    Agent pool warming runs in the background so startup is not delayed.
+    The notification listener keeps this worker's caches in sync with the
+    other workers. The password hashing processes and the database
+    connections of the async engine are closed on shutdown.
+    """
+    warm_task = asyncio.create_task(warm_agent_pool())
+    listener_task = notification_listener.start()
+    yield
+    warm_task.cancel()
+    listener_task.cancel()
+    password_hasher.shutdown()
+    await async_db_engine.dispose()
+
+
 def create_app() -> FastAPI:
     """
     Create a FastAPI App
@@ -35,6 +60,7 @@ def create_app() -> FastAPI:
         docs_url="/docs" if api_settings.docs_enabled else None,
         redoc_url="/redoc" if api_settings.docs_enabled else None,
         openapi_url="/openapi.json" if api_settings.docs_enabled else None,
+        lifespan=lifespan,
     )
 
     # Global handler: any unhandled exception returns JSON 500 from our app (CORS gets applied)
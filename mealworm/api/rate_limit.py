@@ -0,0 +1,326 @@
+"""Token-bucket rate limiting and concurrency caps for expensive API routes."""
+
+import math
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from logging import getLogger
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from mealworm.api.auth.dependencies import get_current_user
+from mealworm.api.settings import ApiSettings, api_settings
+from mealworm.db.models import User
+from mealworm.db.session import SessionLocal
+
+logger = getLogger(__name__)
+
+GLOBAL_RUNS_KEY = "runs:global"
+
+
+def too_many_requests(retry_after: float, detail: str) -> HTTPException:
+    """Build a 429 response with a Retry-After header (whole seconds, at least 1)."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+@dataclass(frozen=True)
+class RouteLimit:
+    """Token bucket parameters for a single route."""
+
+    per_minute: float
+    burst: int
+
+    @property
+    def rate(self) -> float:
+        """Refill rate in tokens per second."""
+        return self.per_minute / 60.0
+
+
+class RateLimitBackend(ABC):
+    """Storage for token buckets and concurrency slots."""
+
+    @abstractmethod
+    async def take_token(self, key: str, rate: float, capacity: int) -> float:
+        """
+        Take one token from the bucket stored under `key`.
+
+        Args:
+            key: Bucket key
+            rate: Refill rate in tokens per second
+            capacity: Maximum number of tokens the bucket holds
+
+        Returns:
+            0.0 if a token was taken, otherwise seconds until one is available
+        """
+
+    @abstractmethod
+    async def acquire_slot(self, key: str, limit: int, ttl: float) -> Optional[str]:
+        """
+        Acquire one of `limit` concurrency slots stored under `key`.
+
+        Args:
+            key: Slot group key
+            limit: Maximum number of slots held at once
+            ttl: Seconds after which an unreleased slot is reclaimed
+
+        Returns:
+            A lease id if a slot was acquired, otherwise None
+        """
+
+    @abstractmethod
+    async def release_slot(self, key: str, lease_id: str) -> None:
+        """Release a slot acquired with `acquire_slot`."""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Rate limit state kept in this process. Limits apply per worker."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # key -> (tokens, last refill time)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        # key -> {lease_id: expiry time}
+        self._slots: Dict[str, Dict[str, float]] = {}
+
+    async def take_token(self, key: str, rate: float, capacity: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (float(capacity), now))
+            tokens = min(float(capacity), tokens + (now - last) * rate)
+            if tokens >= 1.0:
+                self._buckets[key] = (tokens - 1.0, now)
+                return 0.0
+            self._buckets[key] = (tokens, now)
+            return (1.0 - tokens) / rate
+
+    async def acquire_slot(self, key: str, limit: int, ttl: float) -> Optional[str]:
+        now = time.monotonic()
+        with self._lock:
+            leases = self._slots.setdefault(key, {})
+            for lease_id in [k for k, expiry in leases.items() if expiry <= now]:
+                del leases[lease_id]
+            if len(leases) >= limit:
+                return None
+            lease_id = uuid.uuid4().hex
+            leases[lease_id] = now + ttl
+            return lease_id
+
+    async def release_slot(self, key: str, lease_id: str) -> None:
+        with self._lock:
+            self._slots.get(key, {}).pop(lease_id, None)
+
+
+class PostgresRateLimitBackend(RateLimitBackend):
+    """
+    Rate limit state kept in Postgres so every worker shares the same limits.
+
+    Buckets are refilled and decremented in a single upsert using the database
+    clock, so workers with skewed clocks still agree. Slot acquisition is
+    serialised per key with a transaction-scoped advisory lock.
+    """
+
+    _TAKE_TOKEN_SQL = text(
+        """
+        INSERT INTO rate_limit_buckets AS b (key, tokens, updated_at)
+        VALUES (:key, :capacity - 1, clock_timestamp())
+        ON CONFLICT (key) DO UPDATE SET
+            tokens = LEAST(
+                :capacity,
+                b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * :rate
+            ) - 1,
+            updated_at = clock_timestamp()
+        WHERE LEAST(
+            :capacity,
+            b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * :rate
+        ) >= 1
+        RETURNING tokens
+        """
+    )
+    _AVAILABLE_TOKENS_SQL = text(
+        """
+        SELECT LEAST(
+            :capacity,
+            tokens + EXTRACT(EPOCH FROM clock_timestamp() - updated_at) * :rate
+        )
+        FROM rate_limit_buckets
+        WHERE key = :key
+        """
+    )
+
+    def _take_token(self, key: str, rate: float, capacity: int) -> float:
+        params = {"key": key, "rate": rate, "capacity": capacity}
+        with SessionLocal() as db:
+            taken = db.execute(self._TAKE_TOKEN_SQL, params).first()
+            db.commit()
+            if taken is not None:
+                return 0.0
+            available = db.execute(self._AVAILABLE_TOKENS_SQL, params).scalar() or 0.0
+        return max(0.0, (1.0 - float(available)) / rate)
+
+    def _acquire_slot(self, key: str, limit: int, ttl: float) -> Optional[str]:
+        with SessionLocal() as db:
+            db.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": key}
+            )
+            db.execute(
+                text(
+                    "DELETE FROM rate_limit_leases "
+                    "WHERE key = :key AND expires_at < clock_timestamp()"
+                ),
+                {"key": key},
+            )
+            held = db.execute(
+                text("SELECT count(*) FROM rate_limit_leases WHERE key = :key"),
+                {"key": key},
+            ).scalar_one()
+            if held >= limit:
+                db.rollback()
+                return None
+            lease_id = uuid.uuid4().hex
+            db.execute(
+                text(
+                    "INSERT INTO rate_limit_leases (id, key, expires_at) "
+                    "VALUES (:id, :key, clock_timestamp() + make_interval(secs => :ttl))"
+                ),
+                {"id": lease_id, "key": key, "ttl": ttl},
+            )
+            db.commit()
+            return lease_id
+
+    def _release_slot(self, key: str, lease_id: str) -> None:
+        with SessionLocal() as db:
+            db.execute(
+                text("DELETE FROM rate_limit_leases WHERE id = :id"), {"id": lease_id}
+            )
+            db.commit()
+
+    async def take_token(self, key: str, rate: float, capacity: int) -> float:
+        return await run_in_threadpool(self._take_token, key, rate, capacity)
+
+    async def acquire_slot(self, key: str, limit: int, ttl: float) -> Optional[str]:
+        return await run_in_threadpool(self._acquire_slot, key, limit, ttl)
+
+    async def release_slot(self, key: str, lease_id: str) -> None:
+        await run_in_threadpool(self._release_slot, key, lease_id)
+
+
+@dataclass
+class RunSlot:
+    """Concurrency slots held for the duration of one agent run."""
+
+    backend: RateLimitBackend
+    leases: List[Tuple[str, str]] = field(default_factory=list)
+
+    async def release(self) -> None:
+        """Release every held slot. Safe to call more than once."""
+        while self.leases:
+            key, lease_id = self.leases.pop()
+            try:
+                await self.backend.release_slot(key, lease_id)
+            except Exception as e:
+                logger.error(f"Failed to release run slot {key}: {e}")
+
+
+class RateLimiter:
+    """Applies per-route token buckets and per-user/global run caps."""
+
+    def __init__(self, backend: RateLimitBackend, settings: ApiSettings):
+        self.backend = backend
+        self.settings = settings
+        self.routes: Dict[str, RouteLimit] = {
+            "agent_runs": RouteLimit(
+                settings.agent_runs_per_minute, settings.agent_runs_burst
+            ),
+            "knowledge_load": RouteLimit(
+                settings.knowledge_load_per_minute, settings.knowledge_load_burst
+            ),
+        }
+
+    @classmethod
+    def from_settings(cls, settings: ApiSettings) -> "RateLimiter":
+        backend: RateLimitBackend
+        if settings.rate_limit_backend == "postgres":
+            backend = PostgresRateLimitBackend()
+        else:
+            backend = InMemoryRateLimitBackend()
+        return cls(backend, settings)
+
+    async def check(self, route: str, subject: str) -> None:
+        """
+        Take a token for `subject` on `route`.
+
+        Raises:
+            HTTPException: 429 with Retry-After if the bucket is empty
+        """
+        if not self.settings.rate_limit_enabled:
+            return
+        limit = self.routes[route]
+        retry_after = await self.backend.take_token(
+            f"{route}:{subject}", limit.rate, limit.burst
+        )
+        if retry_after > 0:
+            raise too_many_requests(retry_after, "Rate limit exceeded")
+
+    async def acquire_run_slot(self, user_id: int) -> RunSlot:
+        """
+        Reserve a per-user and a global run slot.
+
+        Raises:
+            HTTPException: 429 with Retry-After if either cap is reached
+        """
+        slot = RunSlot(self.backend)
+        if not self.settings.rate_limit_enabled:
+            return slot
+
+        ttl = float(self.settings.run_slot_ttl_seconds)
+        caps = [
+            (f"runs:user:{user_id}", self.settings.max_concurrent_runs_per_user),
+            (GLOBAL_RUNS_KEY, self.settings.max_concurrent_runs_global),
+        ]
+        for key, limit in caps:
+            lease_id = await self.backend.acquire_slot(key, limit, ttl)
+            if lease_id is None:
+                await slot.release()
+                raise too_many_requests(
+                    self.settings.run_slot_retry_after_seconds,
+                    "Too many concurrent runs",
+                )
+            slot.leases.append((key, lease_id))
+        return slot
+
+
+rate_limiter = RateLimiter.from_settings(api_settings)
+
+
+def rate_limit(route: str, per_user: bool = True) -> Callable:
+    """
+    Build a dependency that applies the token bucket for `route`.
+
+    Args:
+        route: Route name configured on the rate limiter
+        per_user: Key the bucket by the authenticated user; otherwise by client address
+
+    Returns:
+        FastAPI dependency callable
+    """
+    if per_user:
+
+        async def limit_user(current_user: User = Depends(get_current_user)) -> None:
+            await rate_limiter.check(route, f"user:{current_user.id}")
+
+        return limit_user
+
+    async def limit_client(request: Request) -> None:
+        host = request.client.host if request.client else "unknown"
+        await rate_limiter.check(route, f"client:{host}")
+
+    return limit_client
@@ -1,17 +1,38 @@
+import asyncio
 from enum import Enum
 from logging import getLogger
-from typing import AsyncGenerator, List, Optional
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional
 
 from agno.agent import Agent
+from agno.run.agent import RunCancelledEvent, RunErrorEvent
+from agno.run.base import RunStatus
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Request, status, Depends
 from fastapi.responses import StreamingResponse
 from opentelemetry.trace import use_span
 from pydantic import BaseModel
+from starlette.types import Receive, Scope, Send
 
+from mealworm.agents.knowledge_tasks import (
+    KnowledgeLoadProgress,
+    knowledge_load_tasks,
+)
 from mealworm.agents.meal_planner import load_meal_plans_to_vector_db
-from mealworm.agents.selector import AgentType, get_agent, get_available_agents
+from mealworm.agents.past_meals import (
+    REPEAT_MAX_REPROMPTS,
+    build_repeat_reprompt,
+    find_repeated_dinners,
+    record_generated_plan,
+)
+from mealworm.agents.pool import meal_planning_agent_pool
+from mealworm.agents.selector import (
+    AgentType,
+    get_agent,
+    get_available_agents,
+    release_agent,
+)
 from mealworm.api.auth.dependencies import get_current_user
+from mealworm.api.rate_limit import rate_limit, rate_limiter
 from mealworm.db.models import User
 
 logger = getLogger(__name__)
@@ -48,13 +69,33 @@ async def list_agents():
     return get_available_agents()
 
 
-async def chat_response_streamer(agent: Agent, message: str) -> AsyncGenerator:
+@agents_router.get("/pool", response_model=Dict[str, Dict[str, int]])
+async def get_agent_pool_stats(current_user: User = Depends(get_current_user)):
+    """
+    Returns warm agent pool counters per model.
+    Requires authentication.
+
+    Args:
+        current_user: Current authenticated user
+
+    Returns:
+        Dict mapping model id to pool size, idle/in-use agents and hit/miss counts
+    """
+    return meal_planning_agent_pool.stats()
+
+
+async def chat_response_streamer(
+    agent: Agent, message: str, errors: Optional[List[str]] = None
+) -> AsyncGenerator:
     """
     Stream agent responses chunk by chunk.
 
+    A failed run streams an error message instead of raising.
+
     Args:
         agent: The agent instance to interact with
         message: User message to process
+        errors: Collects the error of a failed run
 
     Yields:
         Text chunks from the agent response
@@ -63,10 +104,15 @@ async def chat_response_streamer(agent: Agent, message: str) -> AsyncGenerator:
 
     try:
         
-        # Use agno streaming (returns a synchronous generator)
-        response_stream = agent.run(message, stream=True)
-
-        for chunk in response_stream:
+        # Use agno async streaming, so the event loop keeps serving other requests
+        response_stream = agent.arun(message, stream=True)
+
+        async for chunk in response_stream:
+            # agno reports failed and cancelled runs as events, not exceptions
+            if isinstance(chunk, RunErrorEvent):
+                raise RuntimeError(chunk.content or "Agent run failed")
+            if isinstance(chunk, RunCancelledEvent):
+                raise RuntimeError(chunk.reason or "Agent run cancelled")
             # Filter to only stream actual response content, not tool usage narration
             if hasattr(chunk, "content") and chunk.content:
                 content = chunk.content
@@ -76,9 +122,120 @@ async def chat_response_streamer(agent: Agent, message: str) -> AsyncGenerator:
                     yield content
     except Exception as e:
         logger.error(f"Error in chat_response_streamer: {e}", exc_info=True)
+        if errors is not None:
+            errors.append(str(e))
         yield f"\n\nError: {str(e)}\n\nThis appears to be a connection issue with the AI provider. Please try again.\n" 
 
 
+async def repeat_reprompt(user_id: int, plan: str) -> Optional[str]:
+    """
+    Check a generated meal plan for dinners repeated from recent plans.
+
+    Args:
+        user_id: User the plan was generated for
+        plan: The agent's response
+
+    Returns:
+        Follow-up message asking to replace the repeated dinners, or None if
+        there are none (or the check failed)
+    """
+    try:
+        repeats = await asyncio.to_thread(find_repeated_dinners, user_id, plan)
+    except Exception as e:
+        logger.error(f"Error checking meal plan for repeats: {e}", exc_info=True)
+        return None
+    if not repeats:
+        return None
+    logger.info(
+        f"Meal plan for user {user_id} repeats {len(repeats)} dinners: "
+        + ", ".join(repeat.day for repeat in repeats)
+    )
+    return build_repeat_reprompt(plan, repeats)
+
+
+async def record_plan(user_id: int, plan: str) -> None:
+    """Record a final meal plan in the user's past meals"""
+    try:
+        await asyncio.to_thread(record_generated_plan, user_id, plan)
+    except Exception as e:
+        logger.error(f"Error recording meal plan: {e}", exc_info=True)
+
+
+async def meal_plan_streamer(agent: Agent, user_id: int, message: str) -> AsyncGenerator:
+    """
+    Stream a meal plan, then stream fixes for dinners repeated from recent plans.
+
+    Each fix is a follow-up run in the same session, separated from the
+    previous response by a horizontal rule. The final plan is recorded unless
+    a run failed.
+
+    Args:
+        agent: The agent instance to interact with
+        user_id: User the plan is generated for
+        message: User message to process
+
+    Yields:
+        Text chunks from the agent responses
+    """
+    errors: List[str] = []
+    chunks = []
+    async for chunk in chat_response_streamer(agent, message, errors):
+        chunks.append(chunk)
+        yield chunk
+    plan = "".join(chunks)
+
+    for _ in range(REPEAT_MAX_REPROMPTS):
+        if errors:
+            break
+        reprompt = await repeat_reprompt(user_id, plan)
+        if reprompt is None:
+            break
+        yield "\n\n---\n\n"
+        chunks = []
+        async for chunk in chat_response_streamer(agent, reprompt, errors):
+            chunks.append(chunk)
+            yield chunk
+        plan = "".join(chunks)
+
+    # A failed run streamed an error message, not a plan
+    if not errors:
+        await record_plan(user_id, plan)
+
+
+class ReleasingStreamingResponse(StreamingResponse):
+    """
+    Streaming response that releases run resources once it is done.
+
+    Release happens when the response finishes, fails or is cancelled, even if
+    the client disconnected before the body started streaming (when a finally
+    in the body generator would never run). The body generator is closed first,
+    so the agent is idle by the time it is released.
+
+    Args:
+        content: The response stream
+        release: Releases the run slot and pooled agent held by the stream
+    """
+
+    def __init__(
+        self, content: AsyncGenerator, release: Callable[[], Awaitable[None]], **kwargs: Any
+    ):
+        super().__init__(content, **kwargs)
+        self._content = content
+        self._release = release
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await asyncio.shield(self._close())
+
+    async def _close(self) -> None:
+        try:
+            await self._content.aclose()
+        finally:
+            await self._release()
+
+
 class RunRequest(BaseModel):
     """Request model for an running an agent"""
 
@@ -89,7 +246,11 @@ class RunRequest(BaseModel):
     session_id: Optional[str] = None
 
 
-@agents_router.post("/{agent_id}/runs", status_code=status.HTTP_200_OK)
+@agents_router.post(
+    "/{agent_id}/runs",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(rate_limit("agent_runs"))],
+)
 async def create_agent_run(
     agent_id: AgentType,
     body: RunRequest,
@@ -97,7 +258,10 @@ async def create_agent_run(
 ):
     """
     Sends a message to a specific agent and returns the response.
-    Requires authentication.
+    Requires authentication. Rate limited per user, and the number of
+    concurrent runs is capped per user and globally. Dinners that repeat the
+    user's recent plans are sent back to the agent to be replaced, and the
+    final plan is recorded in the user's past meals.
 
     Args:
         agent_id: The ID of the agent to interact with
@@ -111,6 +275,9 @@ async def create_agent_run(
         f"Agent run for {agent_id} by user {current_user.id} with model {body.model.value}"
     )
 
+    # Hold a run slot until the run (or its stream) finishes
+    slot = await rate_limiter.acquire_run_slot(current_user.id)
+
     try:
         agent: Agent = await get_agent(
             model_id=body.model.value,
@@ -119,47 +286,162 @@ async def create_agent_run(
             session_id=body.session_id,
         )
     except ValueError as e:
+        await slot.release()
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception:
+        await slot.release()
+        raise
+
+    async def release() -> None:
+        await release_agent(agent_id, body.model.value, agent)
+        await slot.release()
 
     if body.stream:
-        response = StreamingResponse(
-            chat_response_streamer(agent, body.message),
+        response = ReleasingStreamingResponse(
+            meal_plan_streamer(agent, current_user.id, body.message),
+            release,
             media_type="text/event-stream",
         )
         return response
     else:
-        # Use agno non-streaming run
-        result = agent.run(body.message, stream=False)
-        # Return the content from the agno RunResponse
-        return {
-            "content": result.content if hasattr(result, "content") else str(result)
-        }
+        try:
+            # Use agno non-streaming async run; each run is an LLM round trip
+            result = await agent.arun(body.message, stream=False)
+            # Return the content from the agno RunResponse
+            content = result.content if hasattr(result, "content") else str(result)
+
+            # Ask for new dinners where the plan repeats recent ones
+            for _ in range(REPEAT_MAX_REPROMPTS):
+                if result.status != RunStatus.completed:
+                    break
+                reprompt = await repeat_reprompt(current_user.id, content)
+                if reprompt is None:
+                    break
+                result = await agent.arun(reprompt, stream=False)
+                content = result.content if hasattr(result, "content") else str(result)
+        finally:
+            await release()
+        # Cancelled runs return their reason as content
+        if result.status == RunStatus.completed:
+            await record_plan(current_user.id, content)
+        return {"content": content}
+
+
+class KnowledgeLoadResponse(BaseModel):
+    task_id: str
+    agent_id: str
+    status: str
+    files_discovered: int
+    files_chunked: int
+    files_embedded: int
+    files_skipped: int
+    chunks: int
+    chunks_embedded: int
+    elapsed_seconds: float
+    chunks_per_second: float
+    eta_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+def _knowledge_loader(agent_id: AgentType):
+    if agent_id == AgentType.MEAL_PLANNING_AGENT:
+        return load_meal_plans_to_vector_db
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Agent {agent_id} does not have a knowledge base.",
+    )
+
+
+def _get_knowledge_load(agent_id: AgentType, task_id: str) -> KnowledgeLoadProgress:
+    progress = knowledge_load_tasks.get(task_id)
+    if progress is None or progress.agent_id != agent_id.value:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Knowledge load {task_id} not found.",
+        )
+    return progress
 
 
-@agents_router.post("/{agent_id}/knowledge/load", status_code=status.HTTP_200_OK)
-async def load_agent_knowledge(agent_id: AgentType):
+@agents_router.post(
+    "/{agent_id}/knowledge/load",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=KnowledgeLoadResponse,
+)
+async def load_agent_knowledge(
+    agent_id: AgentType,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
     """
-    Loads the knowledge base for a specific agent.
+    Starts loading the knowledge base for a specific agent in the background.
+    Requires authentication.
+
+    If a load for the agent is already running, its task is returned instead
+    of starting another one.
 
     Args:
         agent_id: The ID of the agent to load knowledge for.
+        current_user: Current authenticated user
 
     Returns:
-        A success message if the knowledge base is loaded.
+        The load task's id and progress; poll GET .../knowledge/load/{task_id}.
     """
-    if agent_id == AgentType.MEAL_PLANNING_AGENT:
-        try:
-            await load_meal_plans_to_vector_db()
-        except Exception as e:
-            logger.error(f"Error loading knowledge base for {agent_id}: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to load knowledge base for {agent_id}.",
-            )
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Agent {agent_id} does not have a knowledge base.",
-        )
+    loader = _knowledge_loader(agent_id)
+    running = knowledge_load_tasks.running(agent_id.value)
+    if running is not None:
+        return running.to_dict()
+
+    # Only starting a new load counts against the rate limit
+    await rate_limit("knowledge_load", per_user=False)(request)
+    return knowledge_load_tasks.start(agent_id.value, loader).to_dict()
+
 
-    return {"message": f"Knowledge base for {agent_id} loaded successfully."}
+@agents_router.get(
+    "/{agent_id}/knowledge/load/{task_id}",
+    response_model=KnowledgeLoadResponse,
+)
+async def get_agent_knowledge_load(
+    agent_id: AgentType,
+    task_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Returns the progress of a knowledge load.
+    Requires authentication.
+
+    Args:
+        agent_id: The ID of the agent the knowledge is loaded for.
+        task_id: Task id returned when the load was started.
+        current_user: Current authenticated user
+
+    Returns:
+        Files discovered, chunked, embedded and skipped, chunk throughput and ETA.
+    """
+    return _get_knowledge_load(agent_id, task_id).to_dict()
+
+
+@agents_router.delete(
+    "/{agent_id}/knowledge/load/{task_id}",
+    response_model=KnowledgeLoadResponse,
+)
+async def cancel_agent_knowledge_load(
+    agent_id: AgentType,
+    task_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Cancels a running knowledge load. Plans already loaded are kept.
+    Requires authentication.
+
+    Args:
+        agent_id: The ID of the agent the knowledge is loaded for.
+        task_id: Task id returned when the load was started.
+        current_user: Current authenticated user
+
+    Returns:
+        The task's progress once it stopped, or while still stopping if it
+        takes longer than a few seconds.
+    """
+    progress = _get_knowledge_load(agent_id, task_id)
+    await knowledge_load_tasks.cancel(task_id)
+    return progress.to_dict()
@@ -4,20 +4,37 @@ import logging
 import sys
 from datetime import timedelta, datetime
 from os import getenv
-
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from typing import Any, Dict, Optional
+
+from fastapi import (
+    APIRouter,
+    Cookie,
+    Depends,
+    Header,
+    HTTPException,
+    Response,
+    status,
+)
 from pydantic import BaseModel, EmailStr
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from mealworm.api.auth.dependencies import get_current_user
+from mealworm.api.auth.cache import deactivated_users
 from mealworm.api.auth.jwt import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
+    REFRESH_TOKEN_EXPIRE_DAYS,
     create_access_token,
-    get_password_hash,
-    verify_password,
+    create_refresh_token,
+    decode_access_token,
+    decode_refresh_token,
+    user_token_claims,
 )
+from mealworm.api.auth.passwords import password_hasher
+from mealworm.api.auth.revocation import revocation_list
 from mealworm.db.models import User, UserPreferences
-from mealworm.db.session import get_db
+from mealworm.db.preferences_cache import preferences_cache
+from mealworm.db.session import get_async_db
 
 logger = logging.getLogger(__name__)
 auth_router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -59,14 +76,68 @@ class AuthResponse(BaseModel):
 
     user: UserResponse
     access_token: str
+    refresh_token: str
     token_type: str = "bearer"
 
 
+class RefreshRequest(BaseModel):
+    """Refresh request body; the refresh_token cookie is used when omitted."""
+
+    refresh_token: Optional[str] = None
+
+
+def set_auth_cookie(response: Response, key: str, value: str, max_age: int) -> None:
+    """Set an httpOnly auth cookie (for browsers that support it)."""
+    # partitioned only on Python 3.14+ (Starlette raises on 3.12)
+    cookie_kwargs = {
+        "key": key,
+        "value": value,
+        "httponly": True,
+        "secure": not IS_DEVELOPMENT,
+        "samesite": "none" if not IS_DEVELOPMENT else "lax",
+        "max_age": max_age,
+    }
+    if SUPPORTS_PARTITIONED_COOKIE:
+        cookie_kwargs["partitioned"] = True
+    response.set_cookie(**cookie_kwargs)
+
+
+def issue_tokens(user: User, response: Response) -> AuthResponse:
+    """
+    Create an access and a refresh token for a user and set them as cookies.
+
+    Args:
+        user: User to sign in
+        response: FastAPI response object to set cookies
+
+    Returns:
+        AuthResponse with user object and both tokens
+    """
+    access_token = create_access_token(
+        data=user_token_claims(user),
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+    refresh_token = create_refresh_token(user.id)
+    set_auth_cookie(
+        response, "access_token", access_token, ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    )
+    set_auth_cookie(
+        response, "refresh_token", refresh_token, REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600
+    )
+
+    return AuthResponse(
+        user=UserResponse.model_validate(user),
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer",
+    )
+
+
 @auth_router.post(
     "/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED
 )
 async def register(
-    body: RegisterRequest, response: Response, db: Session = Depends(get_db)
+    body: RegisterRequest, response: Response, db: AsyncSession = Depends(get_async_db)
 ):
     """
     Register a new user.
@@ -77,59 +148,37 @@ async def register(
         db: Database session
 
     Returns:
-        AuthResponse with user object and access token
+        AuthResponse with user object and tokens
 
     Raises:
         HTTPException: If email already registered
     """
     # Check if email is already registered
-    existing_user = db.query(User).filter(User.email == body.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == body.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
     # Create new user
-    hashed_password = get_password_hash(body.password)
+    hashed_password = await password_hasher.hash(body.password)
     new_user = User(email=body.email, hashed_password=hashed_password)
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.flush()
 
     # Create default preferences for the user
     default_preferences = UserPreferences(user_id=new_user.id)
     db.add(default_preferences)
-    db.commit()
+    await db.commit()
+    await db.refresh(new_user)
 
-    # Create JWT token
-    access_token = create_access_token(
-        data={"sub": str(new_user.id)},  # Convert to string for JWT
-        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
-    )
-
-    # Set httpOnly cookie (for browsers that support it)
-    # partitioned only on Python 3.14+ (Starlette raises on 3.12)
-    cookie_kwargs = {
-        "key": "access_token",
-        "value": access_token,
-        "httponly": True,
-        "secure": not IS_DEVELOPMENT,
-        "samesite": "none" if not IS_DEVELOPMENT else "lax",
-        "max_age": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-    }
-    if SUPPORTS_PARTITIONED_COOKIE:
-        cookie_kwargs["partitioned"] = True
-    response.set_cookie(**cookie_kwargs)
-
-    return AuthResponse(
-        user=UserResponse.model_validate(new_user),
-        access_token=access_token,
-        token_type="bearer",
-    )
+    return issue_tokens(new_user, response)
 
 
 @auth_router.post("/login", response_model=AuthResponse)
-async def login(body: LoginRequest, response: Response, db: Session = Depends(get_db)):
+async def login(
+    body: LoginRequest, response: Response, db: AsyncSession = Depends(get_async_db)
+):
     """
     Login with email and password, returns user info, access token, and sets JWT cookie.
 
@@ -139,12 +188,12 @@ async def login(body: LoginRequest, response: Response, db: Session = Depends(ge
         db: Database session
 
     Returns:
-        AuthResponse with user object and access token
+        AuthResponse with user object and tokens
 
     Raises:
         HTTPException: If credentials are invalid or user is inactive
     """
-    user = db.query(User).filter(User.email == body.email).first()
+    user = await db.scalar(select(User).where(User.email == body.email))
 
     if not user:
         logger.info("Login 401: no user for email=%s", body.email)
@@ -152,7 +201,10 @@ async def login(body: LoginRequest, response: Response, db: Session = Depends(ge
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
-    if not verify_password(body.password, user.hashed_password):
+    valid, new_hash = await password_hasher.verify_and_update(
+        body.password, user.hashed_password
+    )
+    if not valid:
         logger.info("Login 401: password mismatch for email=%s", body.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -164,45 +216,118 @@ async def login(body: LoginRequest, response: Response, db: Session = Depends(ge
             status_code=status.HTTP_403_FORBIDDEN, detail="User account is inactive"
         )
 
-    # Create JWT token
-    access_token = create_access_token(
-        data={"sub": str(user.id)},  # Convert to string for JWT
-        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
-    )
+    # Replace hashes made under an older cost factor
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        await db.commit()
 
-    # Set httpOnly cookie (for browsers that support it)
-    # partitioned only on Python 3.14+ (Starlette raises on 3.12)
-    cookie_kwargs = {
-        "key": "access_token",
-        "value": access_token,
-        "httponly": True,
-        "secure": not IS_DEVELOPMENT,
-        "samesite": "none" if not IS_DEVELOPMENT else "lax",
-        "max_age": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-    }
-    if SUPPORTS_PARTITIONED_COOKIE:
-        cookie_kwargs["partitioned"] = True
-    response.set_cookie(**cookie_kwargs)
+    return issue_tokens(user, response)
 
-    return AuthResponse(
-        user=UserResponse.model_validate(user),
-        access_token=access_token,
-        token_type="bearer",
+
+@auth_router.get("/password-hashing", response_model=Dict[str, Any])
+async def get_password_hashing_stats(current_user: User = Depends(get_current_user)):
+    """
+    Returns password hashing pool settings and counters.
+    Requires authentication.
+
+    Args:
+        current_user: Current authenticated user
+
+    Returns:
+        Worker count, bcrypt rounds, job counts and p50/p99 queue and hashing times
+    """
+    return password_hasher.stats()
+
+
+@auth_router.post("/refresh", response_model=AuthResponse)
+async def refresh(
+    response: Response,
+    body: Optional[RefreshRequest] = None,
+    refresh_token: Optional[str] = Cookie(None),
+):
+    """
+    Exchange a refresh token for a new access and refresh token.
+    The refresh token is rotated: it is revoked and cannot be used again.
+
+    Args:
+        response: FastAPI response object to set cookies
+        body: Optional request body with the refresh token
+        refresh_token: Refresh token from httpOnly cookie
+
+    Returns:
+        AuthResponse with user object and tokens
+
+    Raises:
+        HTTPException: If the refresh token is missing, invalid or already used,
+            or the user is inactive
+    """
+    token = body.refresh_token if body and body.refresh_token else refresh_token
+    token_data = decode_refresh_token(token) if token else None
+    invalid = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
     )
+    if (
+        token_data is None
+        or token_data.jti is None
+        or token_data.user_id in deactivated_users
+    ):
+        raise invalid
+
+    # Revoking the token claims it, so of two concurrent refreshes only one wins
+    if token_data.jti not in await revocation_list.revoke([token_data]):
+        logger.info(
+            "Refresh 401: reused refresh token for user_id=%s", token_data.user_id
+        )
+        raise invalid
+
+    # Always read the current user: refreshes are rare and must see deactivation
+    cached = await preferences_cache.async_get(token_data.user_id, max_age=0)
+    if cached is None or not cached.user.is_active:
+        raise invalid
+
+    return issue_tokens(cached.user, response)
 
 
 @auth_router.post("/logout")
-async def logout(response: Response):
+async def logout(
+    response: Response,
+    body: Optional[RefreshRequest] = None,
+    authorization: Optional[str] = Header(None, alias="Authorization"),
+    access_token: Optional[str] = Cookie(None),
+    refresh_token: Optional[str] = Cookie(None),
+):
     """
-    Logout by clearing the JWT cookie.
+    Logout by revoking the tokens and clearing the JWT cookies.
 
     Args:
         response: FastAPI response object to clear cookies
+        body: Optional request body with the refresh token
+        authorization: Authorization header with Bearer token
+        access_token: JWT token from httpOnly cookie
+        refresh_token: Refresh token from httpOnly cookie
 
     Returns:
         Success message
     """
+    if authorization and authorization.startswith("Bearer "):
+        access_token = authorization.replace("Bearer ", "")
+    if body and body.refresh_token:
+        refresh_token = body.refresh_token
+
+    tokens = [
+        token_data
+        for token_data in (
+            decode_access_token(access_token) if access_token else None,
+            decode_refresh_token(refresh_token) if refresh_token else None,
+        )
+        if token_data is not None
+    ]
+    await revocation_list.revoke(tokens)
+
     response.delete_cookie(key="access_token")
+    response.delete_cookie(key="refresh_token")
     return {"message": "Successfully logged out"}
 
 
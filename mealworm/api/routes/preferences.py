@@ -1,13 +1,18 @@
 """User preferences API endpoints."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 
-from mealworm.db.session import get_db
+from mealworm.db.session import get_async_db
 from mealworm.db.models import User, UserPreferences
+from mealworm.db.preferences_cache import (
+    notify_preferences_changed,
+    preferences_cache,
+)
 from mealworm.api.auth.dependencies import get_current_user
 
 
@@ -81,15 +86,13 @@ class UpdatePreferencesRequest(BaseModel):
 
 
 @preferences_router.get("", response_model=PreferencesResponse)
-async def get_preferences(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
-):
+async def get_preferences(current_user: User = Depends(get_current_user)):
     """
     Get the current user's meal planning preferences.
+    Served from the preferences cache.
 
     Args:
         current_user: Current authenticated user
-        db: Database session
 
     Returns:
         UserPreferences object
@@ -97,11 +100,8 @@ async def get_preferences(
     Raises:
         HTTPException: If preferences not found
     """
-    preferences = (
-        db.query(UserPreferences)
-        .filter(UserPreferences.user_id == current_user.id)
-        .first()
-    )
+    cached = await preferences_cache.async_get(current_user.id)
+    preferences = cached.preferences if cached is not None else None
 
     if not preferences:
         raise HTTPException(
@@ -115,10 +115,11 @@ async def get_preferences(
 async def update_preferences(
     body: UpdatePreferencesRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Update the current user's meal planning preferences.
+    Cached copies are invalidated in every worker.
 
     Args:
         body: Updated preference values
@@ -131,10 +132,8 @@ async def update_preferences(
     Raises:
         HTTPException: If preferences not found
     """
-    preferences = (
-        db.query(UserPreferences)
-        .filter(UserPreferences.user_id == current_user.id)
-        .first()
+    preferences = await db.scalar(
+        select(UserPreferences).where(UserPreferences.user_id == current_user.id)
     )
 
     if not preferences:
@@ -149,7 +148,10 @@ async def update_preferences(
 
     preferences.updated_at = datetime.utcnow()
 
-    db.commit()
-    db.refresh(preferences)
+    await notify_preferences_changed(db, current_user.id, preferences.updated_at)
+    await db.commit()
+    await db.refresh(preferences)
+    # Read-your-writes in this worker without waiting for the notification
+    preferences_cache.invalidate(current_user.id, preferences.updated_at)
 
     return preferences
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import Field, field_validator
 from pydantic_core.core_schema import FieldValidationInfo
@@ -18,6 +18,32 @@ class ApiSettings(BaseSettings):
     # more origins (e.g. Vercel frontend URL, preview deployments, custom domain).
     cors_origin_list: Optional[List[str]] = Field(None, validate_default=True)
 
+    # Rate limiting for expensive routes. "memory" keeps state per worker,
+    # "postgres" shares buckets and run slots across all workers.
+    rate_limit_enabled: bool = True
+    rate_limit_backend: Literal["memory", "postgres"] = "memory"
+    # Token bucket per user and route: refill rate and burst size
+    agent_runs_per_minute: float = 6.0
+    agent_runs_burst: int = 3
+    knowledge_load_per_minute: float = 1.0
+    knowledge_load_burst: int = 1
+    # Concurrent agent runs allowed per user and across the whole deployment
+    max_concurrent_runs_per_user: int = 2
+    max_concurrent_runs_global: int = 20
+    # Run slots expire after this long in case a worker dies mid-run
+    run_slot_ttl_seconds: int = 900
+    # Retry-After hint when a concurrency cap (rather than a bucket) is hit
+    run_slot_retry_after_seconds: int = 5
+
+    # Authentication fast path. With stateless_auth, new tokens carry the user
+    # claims requests need, so authenticated requests never load the user;
+    # deactivated users are still rejected (see mealworm/api/auth/cache.py).
+    stateless_auth: bool = False
+    # Seconds a cached user is trusted for authentication without a reload
+    user_cache_ttl_seconds: float = 30.0
+    # Decoded tokens cached per worker, keyed by the token's hash
+    token_cache_size: int = 10000
+
     @field_validator("cors_origin_list", mode="before")
     def set_cors_origin_list(cls, cors_origin_list, info: FieldValidationInfo):
         # Start empty; we'll merge env-provided origins with built-in defaults.
@@ -0,0 +1,166 @@
+"""Compact in-memory representation of meals for large recipe catalogs.
+
+`Meal` carries the full Notion page JSON and page text and pays for pydantic
+validation on construction. `CompactMeal` keeps only the scalar fields in a
+slotted object, interns repeated strings (cuisines, difficulties, tags) and
+loads the raw page data and content on first access, so thousands of meals can
+be held for planning and scoring. `to_meal` converts back without loss.
+"""
+
+import sys
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from mealworm.models import Meal
+
+# Loads (page_content, raw_notion_data) for a meal id on first access
+DetailsLoader = Callable[[str], Tuple[Optional[str], Dict[str, Any]]]
+
+_UNLOADED: Any = object()
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+def _intern_all(values: Iterable[str]) -> Tuple[str, ...]:
+    return tuple(map(sys.intern, values))
+
+
+class CompactMeal:
+    """
+    A meal with slotted scalar fields and lazily loaded details.
+
+    Args:
+        id: Notion page id
+        title: Meal title
+        loader: Called with the meal id to fetch page_content and
+            raw_notion_data the first time either is read. When omitted, the
+            details passed in (or their defaults) are used.
+    """
+
+    __slots__ = (
+        "id",
+        "title",
+        "description",
+        "cuisine_type",
+        "prep_time",
+        "cook_time",
+        "difficulty",
+        "ingredients",
+        "tags",
+        "last_made",
+        "rating",
+        "_page_content",
+        "_raw_notion_data",
+        "_loader",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        description: Optional[str] = None,
+        cuisine_type: Optional[str] = None,
+        prep_time: Optional[int] = None,
+        cook_time: Optional[int] = None,
+        difficulty: Optional[str] = None,
+        ingredients: Iterable[str] = (),
+        tags: Iterable[str] = (),
+        last_made: Optional[datetime] = None,
+        rating: Optional[int] = None,
+        page_content: Optional[str] = _UNLOADED,
+        raw_notion_data: Dict[str, Any] = _UNLOADED,
+        loader: Optional[DetailsLoader] = None,
+    ):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.cuisine_type = _intern(cuisine_type)
+        self.prep_time = prep_time
+        self.cook_time = cook_time
+        self.difficulty = _intern(difficulty)
+        self.ingredients = tuple(ingredients)
+        self.tags = _intern_all(tags)
+        self.last_made = last_made
+        self.rating = rating
+        self._loader = loader
+        if loader is None:
+            page_content = None if page_content is _UNLOADED else page_content
+            raw_notion_data = {} if raw_notion_data is _UNLOADED else raw_notion_data
+        self._page_content = page_content
+        self._raw_notion_data = raw_notion_data
+
+    def _load_details(self) -> None:
+        assert self._loader is not None
+        page_content, raw_notion_data = self._loader(self.id)
+        if self._page_content is _UNLOADED:
+            self._page_content = page_content
+        if self._raw_notion_data is _UNLOADED:
+            self._raw_notion_data = raw_notion_data
+        self._loader = None
+
+    @property
+    def page_content(self) -> Optional[str]:
+        if self._page_content is _UNLOADED:
+            self._load_details()
+        return self._page_content
+
+    @property
+    def raw_notion_data(self) -> Dict[str, Any]:
+        if self._raw_notion_data is _UNLOADED:
+            self._load_details()
+        return self._raw_notion_data
+
+    @property
+    def details_loaded(self) -> bool:
+        """Whether page_content and raw_notion_data are held in memory"""
+        return (
+            self._page_content is not _UNLOADED
+            and self._raw_notion_data is not _UNLOADED
+        )
+
+    def __repr__(self) -> str:
+        return f"CompactMeal(id={self.id!r}, title={self.title!r})"
+
+    @classmethod
+    def from_meal(cls, meal: Meal) -> "CompactMeal":
+        """Build a compact meal from a Meal, keeping its details"""
+        return cls(
+            id=meal.id,
+            title=meal.title,
+            description=meal.description,
+            cuisine_type=meal.cuisine_type,
+            prep_time=meal.prep_time,
+            cook_time=meal.cook_time,
+            difficulty=meal.difficulty,
+            ingredients=meal.ingredients,
+            tags=meal.tags,
+            last_made=meal.last_made,
+            rating=meal.rating,
+            page_content=meal.page_content,
+            raw_notion_data=meal.raw_notion_data,
+        )
+
+    def to_meal(self) -> Meal:
+        """Convert back to a Meal, loading details if needed"""
+        return Meal(
+            id=self.id,
+            title=self.title,
+            description=self.description,
+            cuisine_type=self.cuisine_type,
+            prep_time=self.prep_time,
+            cook_time=self.cook_time,
+            difficulty=self.difficulty,
+            ingredients=list(self.ingredients),
+            tags=list(self.tags),
+            last_made=self.last_made,
+            rating=self.rating,
+            page_content=self.page_content,
+            raw_notion_data=self.raw_notion_data,
+        )
+
+
+def compact_meals(meals: Iterable[Meal]) -> List[CompactMeal]:
+    """Convert Meals to CompactMeals"""
+    return [CompactMeal.from_meal(meal) for meal in meals]
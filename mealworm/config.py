@@ -14,6 +14,50 @@ class Config:
         "NOTION_MCP_SSE_URL", "https://mcp.notion.com/sse"
     )
 
+    # How the Notion client talks to Notion: "mcp" runs the Notion MCP server
+    # over stdio, "rest" calls the REST API directly over pooled connections
+    NOTION_TRANSPORT: str = os.getenv("NOTION_TRANSPORT", "mcp")
+    # REST transport base URL (point at a local stub for testing) and timeout
+    NOTION_API_BASE_URL: str = os.getenv(
+        "NOTION_API_BASE_URL", "https://api.notion.com"
+    )
+    NOTION_HTTP_TIMEOUT: float = float(os.getenv("NOTION_HTTP_TIMEOUT", "30"))
+
+    # Shared rate limit for all Notion calls (Notion allows ~3 requests/second
+    # per integration) and retries for rate-limited or transient failures
+    NOTION_REQUESTS_PER_SECOND: float = float(
+        os.getenv("NOTION_REQUESTS_PER_SECOND", "3")
+    )
+    NOTION_RATE_LIMIT_BURST: int = int(os.getenv("NOTION_RATE_LIMIT_BURST", "3"))
+    NOTION_MAX_RETRIES: int = int(os.getenv("NOTION_MAX_RETRIES", "5"))
+    NOTION_BACKOFF_BASE_SECONDS: float = float(
+        os.getenv("NOTION_BACKOFF_BASE_SECONDS", "0.5")
+    )
+    NOTION_BACKOFF_MAX_SECONDS: float = float(
+        os.getenv("NOTION_BACKOFF_MAX_SECONDS", "30")
+    )
+
+    # Maximum number of Notion calls in flight at once
+    NOTION_MAX_CONCURRENCY: int = int(os.getenv("NOTION_MAX_CONCURRENCY", "8"))
+    # Limits for fetching nested blocks (toggles, nested lists, columns) of a page
+    NOTION_BLOCK_TREE_MAX_DEPTH: int = int(
+        os.getenv("NOTION_BLOCK_TREE_MAX_DEPTH", "5")
+    )
+    NOTION_BLOCK_TREE_MAX_BLOCKS: int = int(
+        os.getenv("NOTION_BLOCK_TREE_MAX_BLOCKS", "2000")
+    )
+
+    # Meal catalog sync: databases to mirror (comma-separated; empty = search
+    # the workspace) and how often to list every page to detect deletions
+    NOTION_MEAL_DATABASE_IDS = [
+        d.strip()
+        for d in os.getenv("NOTION_MEAL_DATABASE_IDS", "").split(",")
+        if d.strip()
+    ]
+    NOTION_SYNC_FULL_SCAN_HOURS: float = float(
+        os.getenv("NOTION_SYNC_FULL_SCAN_HOURS", "24")
+    )
+
     # Meal planning configuration
     DAYS_OF_WEEK = [
         "Sunday",
@@ -3,16 +3,22 @@ from sqlalchemy import (
     Integer,
     String,
     Boolean,
+    Date,
     DateTime,
     Text,
     ForeignKey,
+    Index,
     JSON,
+    Float,
+    LargeBinary,
+    UniqueConstraint,
 )
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import DeclarativeBase, relationship
 from datetime import datetime
 
-Base = declarative_base()
+
+class Base(DeclarativeBase):
+    pass
 
 
 class User(Base):
@@ -127,9 +133,14 @@ class UserPreferences(Base):
 
 
 class GeneratedMealPlan(Base):
-    """Track generated meal plans for history"""
+    """Track generated meal plans for history; one plan per user and week"""
 
     __tablename__ = "generated_meal_plans"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "week_starting", name="uq_generated_meal_plans_user_week"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -139,3 +150,128 @@ class GeneratedMealPlan(Base):
 
     # Relationships
     user = relationship("User", back_populates="meal_plans")
+
+
+class PastMeal(Base):
+    """A meal from a user's historical or generated meal plan, for repeat checks"""
+
+    __tablename__ = "past_meals"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "meal_date", "slot", name="uq_past_meals_user_slot"
+        ),
+        Index("ix_past_meals_user_week", "user_id", "week_start"),
+        # Trigram index for fuzzy name matching (requires the pg_trgm extension)
+        Index(
+            "ix_past_meals_normalized_name_trgm",
+            "normalized_name",
+            postgresql_using="gin",
+            postgresql_ops={"normalized_name": "gin_trgm_ops"},
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    week_start = Column(Date, nullable=False)
+    meal_date = Column(Date, nullable=False)
+    # breakfast, lunch, dinner or snack
+    slot = Column(String(16), nullable=False)
+    name = Column(String(500), nullable=False)
+    # Lowercased, without notes in parentheses, punctuation or filler words
+    normalized_name = Column(String(500), nullable=False)
+    # historical or generated
+    source = Column(String(16), nullable=False)
+    plan_id = Column(Integer, ForeignKey("generated_meal_plans.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class RateLimitBucket(Base):
+    """Token bucket state shared by all API workers"""
+
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(String(255), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class RateLimitLease(Base):
+    """A held concurrency slot (e.g. an in-flight agent run)"""
+
+    __tablename__ = "rate_limit_leases"
+
+    id = Column(String(36), primary_key=True)
+    key = Column(String(255), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class MealRecord(Base):
+    """Meal mirrored from a Notion meal/recipe database"""
+
+    __tablename__ = "meals"
+
+    # Notion page id
+    id = Column(String(64), primary_key=True)
+    database_id = Column(String(64), nullable=False, index=True)
+
+    title = Column(String(500), nullable=False, index=True)
+    description = Column(Text)
+    cuisine_type = Column(String(255), index=True)
+    prep_time = Column(Integer)
+    cook_time = Column(Integer)
+    difficulty = Column(String(255))
+    ingredients = Column(JSON, default=list)
+    tags = Column(JSON, default=list)
+    last_made = Column(DateTime)
+    rating = Column(Integer)
+    page_content = Column(Text)
+    raw_notion_data = Column(JSON, default=dict)
+
+    # Sync metadata
+    notion_last_edited_time = Column(DateTime(timezone=True), nullable=False)
+    synced_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    deleted_at = Column(DateTime, nullable=True)
+    # synced_at of the version last embedded into the recipe catalog
+    embedded_at = Column(DateTime, nullable=True)
+
+
+class NotionSyncState(Base):
+    """Per-database watermark for the incremental Notion meal sync"""
+
+    __tablename__ = "notion_sync_state"
+
+    database_id = Column(String(64), primary_key=True)
+    # Latest last_edited_time seen in the database
+    watermark = Column(DateTime(timezone=True))
+    last_synced_at = Column(DateTime)
+    # Last time every page id was listed to detect deletions
+    last_full_scan_at = Column(DateTime)
+
+
+class EmbeddingCacheEntry(Base):
+    """Embedding of a normalized text, keyed by embedder model and text hash"""
+
+    __tablename__ = "embedding_cache"
+
+    # Embedder class, model id and dimensions, e.g. "OpenAIEmbedder:text-embedding-3-small:1536"
+    model = Column(String(255), primary_key=True)
+    # sha256 of the normalized text
+    text_hash = Column(String(64), primary_key=True)
+    dimensions = Column(Integer, nullable=False)
+    # Little-endian float16 values
+    embedding = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class RevokedToken(Base):
+    """Revoked access and refresh tokens, kept until they would have expired"""
+
+    __tablename__ = "revoked_tokens"
+
+    # jti claim of the token
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # "access" or "refresh"
+    token_type = Column(String(16), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,109 @@
+"""Cross-worker notifications over Postgres LISTEN/NOTIFY.
+
+Each API worker runs one listener connection (started in the app lifespan)
+and dispatches notifications to the handlers subscribed to their channel.
+Writers send notifications inside their transaction with `notify`, so they are
+delivered only if the transaction commits.
+
+Notifications sent while a worker is disconnected are lost; handlers
+registered with `on_connect` run on every (re)connect so in-memory caches can
+drop whatever they may have missed.
+"""
+
+import asyncio
+import inspect
+import json
+from logging import getLogger
+from typing import Any, Callable, Dict, List
+
+import psycopg
+from psycopg import sql
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mealworm.db.url import get_db_url
+
+logger = getLogger(__name__)
+
+# Longest wait between reconnect attempts
+MAX_RECONNECT_DELAY = 30.0
+
+Handler = Callable[[str], Any]
+
+
+async def notify(db: AsyncSession, channel: str, payload: Dict[str, Any]) -> None:
+    """
+    Send a notification when the session's transaction commits.
+
+    Args:
+        db: Session whose transaction the notification belongs to
+        channel: Channel to notify
+        payload: JSON-serializable payload (Postgres limits it to 8000 bytes)
+    """
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": channel, "payload": json.dumps(payload, default=str)},
+    )
+
+
+class NotificationListener:
+    """Listens on Postgres channels and dispatches notifications to handlers"""
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._connect_handlers: List[Callable[[], Any]] = []
+        self.connected = False
+
+    def subscribe(self, channel: str, handler: Handler) -> None:
+        """Call handler(payload) for every notification on channel"""
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def on_connect(self, handler: Callable[[], Any]) -> None:
+        """Call (and await, if async) handler() every time the listener (re)connects"""
+        self._connect_handlers.append(handler)
+
+    def start(self) -> asyncio.Task:
+        return asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        """Listen until cancelled, reconnecting with backoff on errors"""
+        delay = 1.0
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    get_db_url("postgresql"), autocommit=True
+                ) as conn:
+                    for channel in self._handlers:
+                        await conn.execute(
+                            sql.SQL("LISTEN {}").format(sql.Identifier(channel))
+                        )
+                    delay = 1.0
+                    for handler in self._connect_handlers:
+                        result = handler()
+                        if inspect.isawaitable(result):
+                            await result
+                    # Set once state missed while disconnected has been reloaded
+                    self.connected = True
+                    logger.info(f"Listening on {', '.join(self._handlers)}")
+                    async for notification in conn.notifies():
+                        self._dispatch(notification.channel, notification.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Notification listener disconnected: {e}")
+            finally:
+                self.connected = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    def _dispatch(self, channel: str, payload: str) -> None:
+        for handler in self._handlers.get(channel, []):
+            try:
+                handler(payload)
+            except Exception as e:
+                logger.error(
+                    f"Error handling notification on {channel}: {e}", exc_info=True
+                )
+
+
+notification_listener = NotificationListener()
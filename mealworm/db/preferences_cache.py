@@ -0,0 +1,197 @@
+"""Read-through cache of users and their meal planning preferences.
+
+Preferences are read on every agent run and preferences page load but change
+rarely. Each worker keeps the user and preferences rows per user id, loaded in
+one joined query on a miss and tagged with the preferences' updated_at. Hot
+reads are served from memory without touching the database.
+
+Updates send a notification on PREFERENCES_CHANNEL with the new updated_at;
+every worker's listener drops entries older than that. A load that raced with
+an update is not stored, and entries also expire after PREFERENCES_CACHE_TTL
+seconds in case a notification was missed.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from os import getenv
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mealworm.db.models import User, UserPreferences
+from mealworm.db.notify import notification_listener, notify
+from mealworm.db.session import AsyncSessionLocal
+
+# Seconds an entry is trusted without a notification
+PREFERENCES_CACHE_TTL = float(getenv("PREFERENCES_CACHE_TTL", "300"))
+# Users cached per worker
+PREFERENCES_CACHE_SIZE = int(getenv("PREFERENCES_CACHE_SIZE", "10000"))
+
+PREFERENCES_CHANNEL = "preferences_changed"
+
+
+@dataclass
+class CachedUser:
+    """
+    A user and their preferences, detached from any session.
+
+    The rows are shared by every request of the worker and must not be modified.
+    """
+
+    user: User
+    preferences: Optional[UserPreferences]
+    version: Optional[datetime]
+    loaded_at: float
+
+
+class PreferencesCache:
+    """Per-worker LRU of users and preferences, invalidated by notifications"""
+
+    def __init__(
+        self, max_size: int = PREFERENCES_CACHE_SIZE, ttl: float = PREFERENCES_CACHE_TTL
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, CachedUser]" = OrderedDict()
+        # Bumped on every invalidation; loads that started before are not stored
+        self._generations: Dict[int, int] = {}
+        # Bumped on clear, invalidating every load in progress
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def _query(self, user_id: int):
+        return (
+            select(User, UserPreferences)
+            .outerjoin(UserPreferences, UserPreferences.user_id == User.id)
+            .where(User.id == user_id)
+        )
+
+    def _lookup(self, user_id: int, max_age: Optional[float]) -> Optional[CachedUser]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            age = time.monotonic() - entry.loaded_at
+            if age >= self.ttl:
+                del self._entries[user_id]
+                return None
+            if max_age is not None and age >= max_age:
+                return None
+            self._entries.move_to_end(user_id)
+            return entry
+
+    def _generation(self, user_id: int) -> Tuple[int, int]:
+        with self._lock:
+            return self._epoch, self._generations.get(user_id, 0)
+
+    def _store(
+        self, user_id: int, row, generation: Tuple[int, int]
+    ) -> Optional[CachedUser]:
+        if row is None:
+            return None
+        user, preferences = row
+        entry = CachedUser(
+            user=user,
+            preferences=preferences,
+            version=preferences.updated_at if preferences is not None else None,
+            loaded_at=time.monotonic(),
+        )
+        with self._lock:
+            if (self._epoch, self._generations.get(user_id, 0)) == generation:
+                self._entries[user_id] = entry
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_size:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._generations.pop(evicted, None)
+        return entry
+
+    async def async_get(
+        self, user_id: int, max_age: Optional[float] = None
+    ) -> Optional[CachedUser]:
+        """
+        Get a user and their preferences, loading them on a miss.
+
+        Args:
+            user_id: User to look up
+            max_age: Reload entries older than this many seconds, for callers
+                that need fresher data than the cache TTL
+
+        Returns:
+            The cached user, or None if the user does not exist
+        """
+        entry = self._lookup(user_id, max_age)
+        if entry is not None:
+            return entry
+        generation = self._generation(user_id)
+        async with AsyncSessionLocal() as db:
+            row = (await db.execute(self._query(user_id))).first()
+            db.expunge_all()
+        return self._store(user_id, row, generation)
+
+    def invalidate(self, user_id: int, version: Optional[datetime] = None) -> None:
+        """
+        Drop a user's entry unless it is already at least at `version`.
+
+        Args:
+            user_id: User whose preferences changed
+            version: updated_at of the change; None always drops the entry
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if (
+                version is not None
+                and entry is not None
+                and entry.version is not None
+                and entry.version >= version
+            ):
+                return
+            self._entries.pop(user_id, None)
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+    def handle_notification(self, payload: str) -> None:
+        data = json.loads(payload)
+        version = data.get("updated_at")
+        self.invalidate(
+            int(data["user_id"]), datetime.fromisoformat(version) if version else None
+        )
+
+
+preferences_cache = PreferencesCache()
+
+# Entries may be stale after notifications were missed while disconnected
+notification_listener.subscribe(
+    PREFERENCES_CHANNEL, preferences_cache.handle_notification
+)
+notification_listener.on_connect(preferences_cache.clear)
+
+
+async def notify_preferences_changed(
+    db: AsyncSession, user_id: int, updated_at: Optional[datetime]
+) -> None:
+    """
+    Invalidate a user's cached preferences in every worker once `db` commits.
+
+    Args:
+        db: Session of the transaction changing the preferences
+        user_id: User whose preferences changed
+        updated_at: New updated_at of the preferences
+    """
+    await notify(
+        db,
+        PREFERENCES_CHANNEL,
+        {
+            "user_id": user_id,
+            "updated_at": updated_at.isoformat() if updated_at else None,
+        },
+    )
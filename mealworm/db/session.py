@@ -1,19 +1,54 @@
-from typing import Generator
+from os import getenv
+from typing import AsyncGenerator, Generator
 
 from sqlalchemy.engine import Engine, create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
 
 from mealworm.db.url import get_db_url
 
+# Connection pool settings, applied to the sync and async engines alike
+DB_POOL_SIZE = int(getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(getenv("DB_MAX_OVERFLOW", "10"))
+# Seconds before a pooled connection is replaced (-1 keeps connections forever)
+DB_POOL_RECYCLE = int(getenv("DB_POOL_RECYCLE", "1800"))
+# Seconds to wait for a free connection before failing
+DB_POOL_TIMEOUT = float(getenv("DB_POOL_TIMEOUT", "30"))
+# Driver of the async engine used by API routes (psycopg 3 supports both modes)
+DB_ASYNC_DRIVER = getenv("DB_ASYNC_DRIVER", "postgresql+psycopg")
+
+pool_settings = {
+    "pool_pre_ping": True,
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_timeout": DB_POOL_TIMEOUT,
+}
+
 # Create SQLAlchemy Engine using a database URL
 db_url: str = get_db_url()
-db_engine: Engine = create_engine(db_url, pool_pre_ping=True)
+db_engine: Engine = create_engine(db_url, **pool_settings)
 
 # Create a SessionLocal class
 SessionLocal: sessionmaker[Session] = sessionmaker(
     autocommit=False, autoflush=False, bind=db_engine
 )
 
+# Async engine for API routes, so queries do not block the event loop
+async_db_engine: AsyncEngine = create_async_engine(
+    get_db_url(DB_ASYNC_DRIVER), **pool_settings
+)
+
+# Objects stay usable after commit: routes return them once the session is gone
+AsyncSessionLocal: async_sessionmaker[AsyncSession] = async_sessionmaker(
+    bind=async_db_engine, autoflush=False, expire_on_commit=False
+)
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -27,3 +62,14 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get an async database session.
+
+    Yields:
+        AsyncSession: An SQLAlchemy async database session.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,8 +1,9 @@
 from os import getenv
+from typing import Optional
 
 
-def get_db_url() -> str:
-    db_driver = getenv("DB_DRIVER", "postgresql+psycopg")
+def get_db_url(driver: Optional[str] = None) -> str:
+    db_driver = driver or getenv("DB_DRIVER", "postgresql+psycopg")
     db_user = getenv("DB_USER", "ai")
     db_pass = getenv("DB_PASSWORD", "ai")
     db_host = getenv("DB_HOST", "pgvector")
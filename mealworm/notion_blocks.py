@@ -0,0 +1,24 @@
+"""Compact tree representation of Notion page content."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+
+@dataclass(slots=True)
+class BlockNode:
+    """A Notion block reduced to its type, its type payload and its children"""
+
+    type: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    children: List["BlockNode"] = field(default_factory=list)
+
+    @classmethod
+    def from_block(cls, block: Dict[str, Any]) -> "BlockNode":
+        """Build a node from a raw block from the Notion API (children not included)"""
+        block_type = block.get("type", "")
+        return cls(type=block_type, data=block.get(block_type) or {})
+
+
+def count_blocks(nodes: List[BlockNode]) -> int:
+    """Count the nodes in a block tree"""
+    return sum(1 + count_blocks(node.children) for node in nodes)
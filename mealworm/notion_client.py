@@ -1,20 +1,92 @@
 import asyncio
 import json
-
-from typing import List, Dict, Any, Optional
+import threading
+from contextlib import aclosing
+from logging import getLogger
+
+from typing import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    List,
+    Dict,
+    Any,
+    Optional,
+    Set,
+    TypeVar,
+    Union,
+)
 
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from mcp import ClientSession
+from mcp.types import TextContent, Tool
 
 from mealworm.models import Meal
+from mealworm.notion_blocks import BlockNode
+from mealworm.notion_renderer import render_blocks
+from mealworm.notion_rest import NotionRESTTransport
+from mealworm.notion_scheduler import NotionAPIError, Priority, notion_scheduler
 from mealworm.config import Config
 
+T = TypeVar("T")
+
+logger = getLogger(__name__)
+
+# Largest page size the Notion API allows for paginated endpoints
+NOTION_PAGE_SIZE = 100
+
+# Block types that have children but whose content lives elsewhere
+SKIP_CHILDREN_BLOCK_TYPES = {"child_page", "child_database"}
+
+# Keywords used to discover databases that hold meals/recipes
+MEAL_DATABASE_KEYWORDS = [
+    "meal",
+    "recipe",
+    "food",
+    "cooking",
+    "kitchen",
+    "dinner",
+    "lunch",
+    "breakfast",
+]
+
 
 class NotionMCPClient:
-    """Client for interacting with Notion via local MCP server"""
+    """Client for interacting with Notion via local MCP server, or directly over
+    the REST API when NOTION_TRANSPORT=rest.
 
-    def __init__(self):
+    All calls share the process-wide Notion rate limit (see notion_scheduler).
+    Calls that still fail after retries raise NotionAPIError.
+    """
+
+    # Name of the server entry in the MultiServerMCPClient config
+    SERVER_NAME = "Notion"
+
+    def __init__(self, priority: Priority = Priority.INTERACTIVE):
         self.api_key = Config.NOTION_API_KEY
-        self.client = None
+        # Priority of this client's calls under the shared Notion rate limit;
+        # background jobs (sync, imports) yield to interactive requests
+        self.priority = priority
+        self.transport = Config.NOTION_TRANSPORT
+        self.client: Optional[Union[MultiServerMCPClient, NotionRESTTransport]] = None
+
+        # One long-lived MCP session (and npx subprocess) owned by a background
+        # event loop thread; sync and async callers both dispatch onto it.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_started = threading.Lock()
+        self._session: Optional[ClientSession] = None
+        self._session_task: Optional[asyncio.Task] = None
+        self._session_ready: Optional[asyncio.Future] = None
+        self._session_closed: Optional[asyncio.Event] = None
+        self._tools: Dict[str, Tool] = {}
+        # Bounds in-flight Notion calls; created on the background loop
+        self._call_semaphore: Optional[asyncio.Semaphore] = None
+
+        # Meal databases found by find_meal_databases
+        self._meal_databases: Optional[List[Dict[str, Any]]] = None
+
         self._initialize_client()
 
     def _initialize_client(self):
@@ -23,9 +95,16 @@ class NotionMCPClient:
             if not self.api_key:
                 raise Exception("NOTION_API_KEY environment variable is required")
 
+            if self.transport == "rest":
+                self.client = NotionRESTTransport(self.api_key)
+                print("✅ Notion REST client initialized successfully")
+                return
+            if self.transport != "mcp":
+                raise Exception(f"Unknown NOTION_TRANSPORT: {self.transport}")
+
             # Create MCP client configuration for local notion-mcp-server
             config = {
-                "Notion": {
+                self.SERVER_NAME: {
                     "transport": "stdio",
                     "command": "npx",
                     "args": ["-y", "@notionhq/notion-mcp-server"],
@@ -47,199 +126,491 @@ class NotionMCPClient:
             print(f"❌ Failed to initialize Notion MCP client: {e}")
             self.client = None
 
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop thread on first use"""
+        with self._loop_started:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="notion-mcp-loop", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+                self._loop_thread = thread
+        return self._loop
+
+    async def _hold_session(self) -> None:
+        """Open the MCP session, cache the tool registry and keep it open until closed.
+
+        The session is entered and exited in this one task, as the underlying
+        stdio transport requires.
+        """
+        assert self._session_ready is not None and self._session_closed is not None
+        try:
+            client = self.client
+            assert client is not None and not isinstance(client, NotionRESTTransport)
+            async with client.session(self.SERVER_NAME) as session:
+                tools: Dict[str, Tool] = {}
+                cursor = None
+                while True:
+                    page = await session.list_tools(cursor=cursor)
+                    tools.update({tool.name: tool for tool in page.tools})
+                    cursor = page.nextCursor
+                    if not cursor:
+                        break
+
+                self._tools = tools
+                self._session = session
+                self._session_ready.set_result(session)
+                await self._session_closed.wait()
+        except Exception as e:
+            if not self._session_ready.done():
+                self._session_ready.set_exception(e)
+            else:
+                print(f"Notion MCP session ended: {e}")
+        finally:
+            self._session = None
+            self._tools = {}
+
+    async def _ensure_session(self) -> ClientSession:
+        """Return the open MCP session, starting it if needed (runs on the background loop)"""
+        if self._session is not None:
+            return self._session
+
+        # (Re)start the session owner task unless one is already starting
+        if self._session_task is None or self._session_task.done():
+            self._session_ready = asyncio.get_running_loop().create_future()
+            self._session_closed = asyncio.Event()
+            self._session_task = asyncio.create_task(self._hold_session())
+
+        assert self._session_ready is not None
+        return await asyncio.shield(self._session_ready)
+
+    async def _invoke_tool(
+        self, tool_name: str, arguments: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Call a tool under the shared Notion rate limit, retrying rate-limited
+        and transient failures (runs on the background loop)"""
+        if self._call_semaphore is None:
+            self._call_semaphore = asyncio.Semaphore(Config.NOTION_MAX_CONCURRENCY)
+
+        async with self._call_semaphore:
+            return await notion_scheduler.run(
+                lambda: self._call_tool_once(tool_name, arguments), self.priority
+            )
+
+    async def _call_tool_once(
+        self, tool_name: str, arguments: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Make a single tool call over the REST transport or the open MCP session"""
+        if isinstance(self.client, NotionRESTTransport):
+            return await self.client.call_tool(tool_name, arguments)
+
+        session = await self._ensure_session()
+
+        if tool_name not in self._tools:
+            raise NotionAPIError(
+                f"Tool {tool_name} not found. Available tools: {list(self._tools)}"
+            )
+
+        result = await session.call_tool(tool_name, arguments)
+        text = "".join(
+            item.text for item in result.content if isinstance(item, TextContent)
+        )
+
+        if not text and result.structuredContent is not None:
+            if result.isError:
+                raise NotionAPIError("tool returned an error")
+            return result.structuredContent
+
+        # Parse JSON string results
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            if result.isError:
+                raise NotionAPIError(text or "tool returned an error")
+            # If it's not valid JSON, return as is
+            return text  # type: ignore[return-value]
+
+        # The MCP server passes Notion error bodies through as tool output
+        if isinstance(data, dict) and (result.isError or data.get("object") == "error"):
+            status = data.get("status")
+            raise NotionAPIError(
+                f"Notion API error {status}: {data.get('message', text)}",
+                status=status if isinstance(status, int) else None,
+            )
+        if result.isError:
+            raise NotionAPIError(text)
+        return data
+
     async def _call_mcp_async(
-        self, tool_name: str, arguments: Dict[str, Any] = None
+        self, tool_name: str, arguments: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Make an async call to the Notion MCP server"""
         if not self.client:
-            raise Exception("MCP client not initialized")
+            raise NotionAPIError("MCP client not initialized")
 
         try:
-            # Get tools from the client
-            tools = await self.client.get_tools()
-
-            # Find the specific tool
-            target_tool = None
-            for tool in tools:
-                if tool.name == tool_name:
-                    target_tool = tool
-                    break
-
-            if not target_tool:
-                raise Exception(
-                    f"Tool {tool_name} not found. Available tools: {[t.name for t in tools]}"
-                )
-
-            # Call the tool
-            result = await target_tool.ainvoke(arguments or {})
-
-            # Parse JSON string if the result is a string
-            if isinstance(result, str):
-                try:
-                    result = json.loads(result)
-                except json.JSONDecodeError:
-                    # If it's not valid JSON, return as is
-                    pass
-
-            return result
+            loop = self._ensure_loop()
+            coro = self._invoke_tool(tool_name, arguments or {})
+            if asyncio.get_running_loop() is loop:
+                return await coro
+            return await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(coro, loop)
+            )
+        except NotionAPIError:
+            raise
         except Exception as e:
-            raise Exception(f"Failed to call MCP tool {tool_name}: {e}")
+            raise NotionAPIError(f"Failed to call MCP tool {tool_name}: {e}") from e
 
     def _call_mcp_sync(
-        self, tool_name: str, arguments: Dict[str, Any] = None
+        self, tool_name: str, arguments: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Make a synchronous call to the Notion MCP server"""
+        if not self.client:
+            raise NotionAPIError("MCP client not initialized")
+
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._loop_thread:
+            raise NotionAPIError(
+                f"Failed to call MCP tool {tool_name}: sync call from the MCP loop thread"
+            )
+
         try:
-            # Run async function in sync context
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(self._call_mcp_async(tool_name, arguments))
-            loop.close()
-            return result
+            future = asyncio.run_coroutine_threadsafe(
+                self._invoke_tool(tool_name, arguments or {}), loop
+            )
+            return future.result()
+        except NotionAPIError:
+            raise
         except Exception as e:
-            raise Exception(f"Failed to call MCP tool {tool_name}: {e}")
-
-    def search_pages(
+            raise NotionAPIError(f"Failed to call MCP tool {tool_name}: {e}") from e
+
+    async def _close_session(self) -> None:
+        if isinstance(self.client, NotionRESTTransport):
+            await self.client.aclose()
+        if self._session_closed is not None:
+            self._session_closed.set()
+        if self._session_task is not None:
+            await self._session_task
+
+    def close(self) -> None:
+        """Close the MCP session (or REST connections), stopping the server subprocess and the loop thread"""
+        if self._loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_session(), self._loop).result(
+                timeout=10
+            )
+        except Exception as e:
+            print(f"Error closing Notion MCP session: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._loop_thread is not None:
+            self._loop_thread.join(timeout=10)
+        self._loop.close()
+        self._loop = None
+        self._loop_thread = None
+
+    def _run_sync(self, coro: Awaitable[T]) -> T:
+        """Run one of the async API methods to completion from sync code"""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()  # type: ignore[arg-type]
+
+    async def asearch_pages(
         self, query: str = "", filter_type: str = "page"
     ) -> List[Dict[str, Any]]:
         """Search for pages in Notion workspace using the 'API-post-search' tool"""
+        # Notion API expects different filter format
+        if filter_type == "page":
+            filter_obj = {"property": "object", "value": "page"}
+        elif filter_type == "database":
+            filter_obj = {"property": "object", "value": "database"}
+        else:
+            filter_obj = None
+
+        arguments: Dict[str, Any] = {"query": query}
+
+        if filter_obj:
+            arguments["filter"] = filter_obj
+
+        result = await self._call_mcp_async("API-post-search", arguments)
+        return result.get("results", [])
+
+    async def _apaginate(
+        self, tool_name: str, arguments: Dict[str, Any]
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield each page of results of a cursor-paginated tool.
+
+        The next page is requested before the current one is yielded, so the
+        network wait overlaps with whatever the caller does with the results.
+        """
+        next_page: Optional[asyncio.Future] = asyncio.ensure_future(
+            self._call_mcp_async(tool_name, arguments)
+        )
         try:
-            # Notion API expects different filter format
-            if filter_type == "page":
-                filter_obj = {"property": "object", "value": "page"}
-            elif filter_type == "database":
-                filter_obj = {"property": "object", "value": "database"}
-            else:
-                filter_obj = None
-
-            arguments = {"query": query}
-
-            if filter_obj:
-                arguments["filter"] = filter_obj
-
-            result = self._call_mcp_sync("API-post-search", arguments)
-            return result.get("results", [])
-        except Exception as e:
-            print(f"Error searching pages: {e}")
-            return []
+            while next_page is not None:
+                result = await next_page
+                next_page = None
+                if not isinstance(result, dict):
+                    return
+
+                cursor = result.get("next_cursor") if result.get("has_more") else None
+                if cursor:
+                    next_page = asyncio.ensure_future(
+                        self._call_mcp_async(
+                            tool_name, {**arguments, "start_cursor": cursor}
+                        )
+                    )
+                yield result.get("results", [])
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def aiter_database_pages(
+        self,
+        database_id: str,
+        filter: Optional[Dict[str, Any]] = None,
+        sorts: Optional[List[Dict[str, Any]]] = None,
+        page_size: int = NOTION_PAGE_SIZE,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every page of a database, following cursors, using the 'API-post-database-query' tool"""
+        arguments: Dict[str, Any] = {"database_id": database_id, "page_size": page_size}
+        if filter:
+            arguments["filter"] = filter
+        if sorts:
+            arguments["sorts"] = sorts
+
+        async for results in self._apaginate("API-post-database-query", arguments):
+            for page in results:
+                yield page
+
+    async def aiter_page_blocks(
+        self, block_id: str, page_size: int = NOTION_PAGE_SIZE
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Stream every child block of a page or block, following cursors, using the 'API-get-block-children' tool"""
+        arguments = {"block_id": block_id, "page_size": page_size}
+        async for results in self._apaginate("API-get-block-children", arguments):
+            for block in results:
+                yield block
+
+    async def aiter_meals(
+        self, pages: AsyncIterable[Dict[str, Any]]
+    ) -> AsyncIterator[Meal]:
+        """Stream meals parsed from a stream of pages, as they are parsed.
+
+        Pages are parsed (and their blocks fetched) while later pages are
+        still being downloaded. At most a bounded number of pages are in
+        flight, so memory stays flat for very large databases.
+        """
+        max_in_flight = Config.NOTION_MAX_CONCURRENCY * 2
+        pending: Set[asyncio.Future] = set()
+
+        async def drain(
+            return_when: str,
+        ) -> AsyncIterator[Meal]:
+            nonlocal pending
+            done, pending = await asyncio.wait(pending, return_when=return_when)
+            for task in done:
+                error = task.exception()
+                if isinstance(error, NotionAPIError):
+                    raise error
+                if error is not None:
+                    logger.error(f"Error parsing page to meal: {error}")
+                elif task.result():
+                    yield task.result()
 
-    def get_database_pages(self, database_id: str) -> List[Dict[str, Any]]:
-        """Get all pages from a specific database using the 'API-post-database-query' tool"""
         try:
-            arguments = {"database_id": database_id}
-
-            result = self._call_mcp_sync("API-post-database-query", arguments)
-            return result.get("results", [])
-        except Exception as e:
-            print(f"Error querying database: {e}")
-            return []
+            async for page in pages:
+                pending.add(asyncio.ensure_future(self._aparse_page_to_meal(page)))
+                if len(pending) >= max_in_flight:
+                    async for meal in drain(asyncio.FIRST_COMPLETED):
+                        yield meal
+            while pending:
+                async for meal in drain(asyncio.ALL_COMPLETED):
+                    yield meal
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def aiter_database_meals(
+        self,
+        database_id: str,
+        filter: Optional[Dict[str, Any]] = None,
+        sorts: Optional[List[Dict[str, Any]]] = None,
+    ) -> AsyncIterator[Meal]:
+        """Stream meals from a database as they are parsed"""
+        async for meal in self.aiter_meals(
+            self.aiter_database_pages(database_id, filter=filter, sorts=sorts)
+        ):
+            yield meal
+
+    async def aget_database_pages(self, database_id: str) -> List[Dict[str, Any]]:
+        """Get all pages from a specific database using the 'API-post-database-query' tool"""
+        return [page async for page in self.aiter_database_pages(database_id)]
 
-    def get_page_content(self, page_id: str) -> Dict[str, Any]:
+    async def aget_page_content(self, page_id: str) -> Dict[str, Any]:
         """Get detailed content of a specific page using the 'API-retrieve-a-page' tool"""
-        try:
-            arguments = {"page_id": page_id}
+        arguments = {"page_id": page_id}
 
-            result = self._call_mcp_sync("API-retrieve-a-page", arguments)
-            return result
-        except Exception as e:
-            print(f"Error getting page content: {e}")
-            return {}
+        return await self._call_mcp_async("API-retrieve-a-page", arguments)
 
-    def get_page_blocks(self, page_id: str) -> List[Dict[str, Any]]:
+    async def aget_page_blocks(self, page_id: str) -> List[Dict[str, Any]]:
         """Get the blocks (content) of a specific page using the 'API-get-block-children' tool"""
-        try:
-            arguments = {"block_id": page_id}
-
-            result = self._call_mcp_sync("API-get-block-children", arguments)
-
-            # Parse the result to extract blocks
-            if isinstance(result, str):
-                try:
-                    result = json.loads(result)
-                except json.JSONDecodeError:
-                    return []
-
-            # Extract blocks from the response
-            blocks = result.get("results", [])
-            return blocks
-        except Exception as e:
-            print(f"Error getting page blocks: {e}")
-            return []
-
-    def find_meal_databases(self) -> List[Dict[str, Any]]:
-        """Find databases that likely contain meal/recipe information"""
-        try:
-            # Search for databases with meal-related keywords
-            meal_keywords = [
-                "meal",
-                "recipe",
-                "food",
-                "cooking",
-                "kitchen",
-                "dinner",
-                "lunch",
-                "breakfast",
+        return [block async for block in self.aiter_page_blocks(page_id)]
+
+    async def aget_block_tree(
+        self,
+        block_id: str,
+        max_depth: int = Config.NOTION_BLOCK_TREE_MAX_DEPTH,
+        max_blocks: int = Config.NOTION_BLOCK_TREE_MAX_BLOCKS,
+    ) -> List[BlockNode]:
+        """Fetch the full block tree under a page or block.
+
+        Children of blocks with has_children are fetched recursively, with
+        sibling subtrees fetched concurrently, so the total latency is roughly
+        that of the deepest path. Stops descending below max_depth and stops
+        collecting once max_blocks blocks have been seen.
+        """
+        remaining = max_blocks
+
+        async def fetch_children(parent_id: str, depth: int) -> List[BlockNode]:
+            nonlocal remaining
+            nodes: List[BlockNode] = []
+            nested = []
+            async with aclosing(self.aiter_page_blocks(parent_id)) as blocks:
+                async for block in blocks:
+                    if remaining <= 0:
+                        break
+                    remaining -= 1
+                    node = BlockNode.from_block(block)
+                    nodes.append(node)
+                    if (
+                        block.get("has_children")
+                        and depth < max_depth
+                        and node.type not in SKIP_CHILDREN_BLOCK_TYPES
+                    ):
+                        nested.append((node, block.get("id", "")))
+
+            subtrees = await asyncio.gather(
+                *[fetch_children(child_id, depth + 1) for _, child_id in nested]
+            )
+            for (node, _), subtree in zip(nested, subtrees):
+                node.children = subtree
+            return nodes
+
+        return await fetch_children(block_id, 1)
+
+    async def afind_meal_databases(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """Find databases that likely contain meal/recipe information.
+
+        All keyword searches run concurrently, and the result is cached on the
+        client; pass refresh=True to search again.
+        """
+        if self._meal_databases is not None and not refresh:
+            return self._meal_databases
+
+        # Search for databases with meal-related keywords
+        results = await asyncio.gather(
+            *[
+                self.asearch_pages(query=keyword, filter_type="database")
+                for keyword in MEAL_DATABASE_KEYWORDS
             ]
-            databases = []
-
-            for keyword in meal_keywords:
-                results = self.search_pages(query=keyword, filter_type="database")
-                databases.extend(results)
+        )
 
-            # Remove duplicates based on ID
-            unique_databases = []
-            seen_ids = set()
+        # Remove duplicates based on ID
+        unique_databases = []
+        seen_ids = set()
+        for databases in results:
             for db in databases:
                 db_id = db.get("id", "")
                 if db_id not in seen_ids:
                     unique_databases.append(db)
                     seen_ids.add(db_id)
 
-            return unique_databases
-        except Exception as e:
-            print(f"Error finding meal databases: {e}")
-            return []
+        self._meal_databases = unique_databases
+        return unique_databases
 
-    def extract_meals_from_pages(self, pages: List[Dict[str, Any]]) -> List[Meal]:
-        """Extract meal information from Notion pages"""
-        meals = []
+    async def aextract_meals_from_pages(
+        self, pages: List[Dict[str, Any]]
+    ) -> List[Meal]:
+        """Extract meal information from Notion pages, fetching page content concurrently"""
+        results = await asyncio.gather(
+            *[self._aparse_page_to_meal(page) for page in pages],
+            return_exceptions=True,
+        )
 
-        for page in pages:
-            try:
-                meal = self._parse_page_to_meal(page)
-                if meal:
-                    meals.append(meal)
-                break
-            except Exception as e:
-                print(f"Error parsing page to meal: {e}")
-                continue
+        meals = []
+        for result in results:
+            if isinstance(result, NotionAPIError):
+                raise result
+            if isinstance(result, BaseException):
+                print(f"Error parsing page to meal: {result}")
+            elif result:
+                meals.append(result)
 
         return meals
 
+    async def _aparse_page_to_meal(self, page: Dict[str, Any]) -> Optional[Meal]:
+        """Parse a Notion page into a Meal object, fetching its blocks"""
+        if not self.get_page_title(page):
+            return None
+
+        page_id = page.get("id", "")
+        page_blocks = await self.aget_block_tree(page_id) if page_id else []
+        return self._build_meal(page, page_blocks)
+
+    def search_pages(
+        self, query: str = "", filter_type: str = "page"
+    ) -> List[Dict[str, Any]]:
+        """Sync wrapper for asearch_pages"""
+        return self._run_sync(self.asearch_pages(query, filter_type))
+
+    def get_database_pages(self, database_id: str) -> List[Dict[str, Any]]:
+        """Sync wrapper for aget_database_pages"""
+        return self._run_sync(self.aget_database_pages(database_id))
+
+    def get_page_content(self, page_id: str) -> Dict[str, Any]:
+        """Sync wrapper for aget_page_content"""
+        return self._run_sync(self.aget_page_content(page_id))
+
+    def get_page_blocks(self, page_id: str) -> List[Dict[str, Any]]:
+        """Sync wrapper for aget_page_blocks"""
+        return self._run_sync(self.aget_page_blocks(page_id))
+
+    def find_meal_databases(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """Sync wrapper for afind_meal_databases"""
+        return self._run_sync(self.afind_meal_databases(refresh))
+
+    def extract_meals_from_pages(self, pages: List[Dict[str, Any]]) -> List[Meal]:
+        """Sync wrapper for aextract_meals_from_pages"""
+        return self._run_sync(self.aextract_meals_from_pages(pages))
+
     def _parse_page_to_meal(self, page: Dict[str, Any]) -> Optional[Meal]:
-        """Parse a Notion page into a Meal object"""
+        """Sync wrapper for _aparse_page_to_meal"""
+        return self._run_sync(self._aparse_page_to_meal(page))
+
+    def get_page_title(self, page: Dict[str, Any]) -> str:
+        """Extract the plain-text title of a Notion page"""
+        properties = page.get("properties", {})
+        title_prop = (
+            properties.get("Name")
+            or properties.get("Title")
+            or properties.get("title", {})
+        )
+        if title_prop.get("type") == "title" and title_prop.get("title"):
+            return "".join([t.get("plain_text", "") for t in title_prop["title"]])
+        return ""
+
+    def _build_meal(
+        self, page: Dict[str, Any], page_blocks: List[BlockNode]
+    ) -> Optional[Meal]:
+        """Build a Meal object from a Notion page and its block tree"""
         try:
             properties = page.get("properties", {})
-
-            # Extract title
-            title_prop = (
-                properties.get("Name")
-                or properties.get("Title")
-                or properties.get("title", {})
-            )
-            title = ""
-            if title_prop.get("type") == "title" and title_prop.get("title"):
-                title = "".join([t.get("plain_text", "") for t in title_prop["title"]])
-
+            title = self.get_page_title(page)
             if not title:
                 return None
 
-            # Get page content (blocks)
-            page_id = page.get("id", "")
-            page_blocks = []
-            if page_id:
-                page_blocks = self.get_page_blocks(page_id)
-
             # Extract other properties
             meal_data = {
                 "id": page.get("id", ""),
@@ -303,88 +674,6 @@ class NotionMCPClient:
             print(f"Error parsing meal data: {e}")
             return None
 
-    def _extract_text_from_blocks(self, blocks: List[Dict[str, Any]]) -> str:
-        """Extract readable text from Notion blocks"""
-        if not blocks:
-            return ""
-
-        text_parts = []
-
-        for block in blocks:
-            block_type = block.get("type", "")
-            block_data = block.get(block_type, {})
-
-            if block_type == "paragraph":
-                # Extract text from paragraph
-                rich_text = block_data.get("rich_text", [])
-                text = "".join([t.get("plain_text", "") for t in rich_text])
-                if text.strip():
-                    text_parts.append(text)
-
-            elif block_type == "heading_1":
-                # Extract text from heading 1
-                rich_text = block_data.get("rich_text", [])
-                text = "".join([t.get("plain_text", "") for t in rich_text])
-                if text.strip():
-                    text_parts.append(f"# {text}")
-
-            elif block_type == "heading_2":
-                # Extract text from heading 2
-                rich_text = block_data.get("rich_text", [])
-                text = "".join([t.get("plain_text", "") for t in rich_text])
-                if text.strip():
-                    text_parts.append(f"## {text}")
-
-            elif block_type == "heading_3":
-                # Extract text from heading 3
-                rich_text = block_data.get("rich_text", [])
-                text = "".join([t.get("plain_text", "") for t in rich_text])
-                if text.strip():
-                    text_parts.append(f"### {text}")
-
-            elif block_type == "bulleted_list_item":
-                # Extract text from bulleted list item
-                rich_text = block_data.get("rich_text", [])
-                text = "".join([t.get("plain_text", "") for t in rich_text])
-                if text.strip():
-                    text_parts.append(f"- {text}")
-
-            elif block_type == "numbered_list_item":
-                # Extract text from numbered list item
-                rich_text = block_data.get("rich_text", [])
-                text = "".join([t.get("plain_text", "") for t in rich_text])
-                if text.strip():
-                    text_parts.append(f"1. {text}")
-
-            elif block_type == "to_do":
-                # Extract text from to-do item
-                rich_text = block_data.get("rich_text", [])
-                text = "".join([t.get("plain_text", "") for t in rich_text])
-                checked = block_data.get("checked", False)
-                if text.strip():
-                    checkbox = "[x]" if checked else "[ ]"
-                    text_parts.append(f"{checkbox} {text}")
-
-            elif block_type == "toggle":
-                # Extract text from toggle
-                rich_text = block_data.get("rich_text", [])
-                text = "".join([t.get("plain_text", "") for t in rich_text])
-                if text.strip():
-                    text_parts.append(f"<details>\n<summary>{text}</summary>")
-
-            elif block_type == "quote":
-                # Extract text from quote
-                rich_text = block_data.get("rich_text", [])
-                text = "".join([t.get("plain_text", "") for t in rich_text])
-                if text.strip():
-                    text_parts.append(f"> {text}")
-
-            elif block_type == "callout":
-                # Extract text from callout
-                rich_text = block_data.get("rich_text", [])
-                text = "".join([t.get("plain_text", "") for t in rich_text])
-                if text.strip():
-                    icon = block_data.get("icon", {}).get("emoji", "💡")
-                    text_parts.append(f"{icon} {text}")
-
-        return "\n".join(text_parts)
+    def _extract_text_from_blocks(self, blocks: List[BlockNode]) -> str:
+        """Extract readable text from a tree of Notion blocks"""
+        return render_blocks(blocks)
@@ -0,0 +1,249 @@
+"""Render trees of Notion blocks as markdown-style text.
+
+Each block type has a handler registered with `@register`; block types without
+a handler (columns, synced blocks, ...) render only their children. Rendering
+walks the tree with an explicit stack and yields one line at a time, so
+arbitrarily large or deeply nested pages can be streamed.
+"""
+
+from dataclasses import dataclass
+from io import StringIO
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from mealworm.notion_blocks import BlockNode
+
+# Prefix added to the lines of children that render indented
+CHILD_INDENT = "  "
+
+# Returns the text for a block (may span lines), or None to write nothing
+RenderFunc = Callable[[BlockNode], Optional[str]]
+
+
+@dataclass(frozen=True, slots=True)
+class BlockHandler:
+    """How one block type is rendered"""
+
+    render: RenderFunc
+    # Indent the block's children beneath it
+    indent_children: bool = False
+    # Line written after the children, when the block itself rendered text
+    closing: Optional[str] = None
+    # Render the block's children; False when `render` already covers them
+    render_children: bool = True
+
+
+RENDERERS: Dict[str, BlockHandler] = {}
+
+
+def register(
+    *block_types: str,
+    indent_children: bool = False,
+    closing: Optional[str] = None,
+    render_children: bool = True,
+) -> Callable[[RenderFunc], RenderFunc]:
+    """
+    Register a render function for one or more block types.
+
+    Args:
+        block_types: Notion block types the function renders
+        indent_children: Indent the block's children beneath it
+        closing: Line written after the block's children
+        render_children: Whether the block's children are rendered
+    """
+
+    def decorator(func: RenderFunc) -> RenderFunc:
+        handler = BlockHandler(func, indent_children, closing, render_children)
+        for block_type in block_types:
+            RENDERERS[block_type] = handler
+        return func
+
+    return decorator
+
+
+def rich_text_to_str(rich_text: List[Dict[str, Any]]) -> str:
+    """Join the plain text of a Notion rich text array"""
+    return "".join([t.get("plain_text", "") for t in rich_text])
+
+
+def _text(block: BlockNode) -> str:
+    return rich_text_to_str(block.data.get("rich_text", []))
+
+
+def _prefixed(prefix: str) -> RenderFunc:
+    # The common case for most blocks, so the rich text join is inlined
+    def render(block: BlockNode) -> Optional[str]:
+        rich_text = block.data.get("rich_text", [])
+        text = "".join([t.get("plain_text", "") for t in rich_text])
+        return prefix + text if text.strip() else None
+
+    return render
+
+
+register("paragraph")(_prefixed(""))
+register("heading_1")(_prefixed("# "))
+register("heading_2")(_prefixed("## "))
+register("heading_3")(_prefixed("### "))
+register("quote")(_prefixed("> "))
+register("bulleted_list_item", indent_children=True)(_prefixed("- "))
+register("numbered_list_item", indent_children=True)(_prefixed("1. "))
+
+
+@register("to_do", indent_children=True)
+def render_to_do(block: BlockNode) -> Optional[str]:
+    text = _text(block)
+    if not text.strip():
+        return None
+    checkbox = "[x]" if block.data.get("checked", False) else "[ ]"
+    return f"{checkbox} {text}"
+
+
+@register("toggle", indent_children=True, closing="</details>")
+def render_toggle(block: BlockNode) -> Optional[str]:
+    text = _text(block)
+    return f"<details>\n<summary>{text}</summary>" if text.strip() else None
+
+
+@register("callout")
+def render_callout(block: BlockNode) -> Optional[str]:
+    text = _text(block)
+    if not text.strip():
+        return None
+    icon = (block.data.get("icon") or {}).get("emoji", "💡")
+    return f"{icon} {text}"
+
+
+@register("code", render_children=False)
+def render_code(block: BlockNode) -> Optional[str]:
+    text = _text(block)
+    if not text.strip():
+        return None
+    language = block.data.get("language", "")
+    if language == "plain text":
+        language = ""
+    return f"```{language}\n{text}\n```"
+
+
+@register("equation", render_children=False)
+def render_equation(block: BlockNode) -> Optional[str]:
+    expression = block.data.get("expression", "")
+    return f"$$ {expression} $$" if expression.strip() else None
+
+
+@register("divider", render_children=False)
+def render_divider(block: BlockNode) -> Optional[str]:
+    return "---"
+
+
+@register("bookmark", "link_preview", "embed", render_children=False)
+def render_link(block: BlockNode) -> Optional[str]:
+    url = block.data.get("url")
+    if not url:
+        return None
+    caption = rich_text_to_str(block.data.get("caption", []))
+    return f"[{caption or url}]({url})"
+
+
+@register("table", render_children=False)
+def render_table(block: BlockNode) -> Optional[str]:
+    rows = [
+        "| "
+        + " | ".join(
+            rich_text_to_str(cell).replace("|", "\\|")
+            for cell in row.data.get("cells", [])
+        )
+        + " |"
+        for row in block.children
+        if row.type == "table_row"
+    ]
+    if not rows:
+        return None
+    if block.data.get("has_column_header"):
+        width = block.data.get("table_width") or rows[0].count(" | ") + 1
+        rows.insert(1, "|" + " --- |" * width)
+    return "\n".join(rows)
+
+
+def iter_lines(blocks: List[BlockNode], prefix: str = "") -> Iterator[str]:
+    """
+    Yield the rendered lines of a block tree, one at a time.
+
+    Args:
+        blocks: Top-level blocks
+        prefix: Prefix for every line (used for indentation)
+
+    Returns:
+        Iterator of lines without trailing newlines
+    """
+    # (remaining siblings, their prefix, line to write once they are done)
+    stack: List[Tuple[Iterator[BlockNode], str, Optional[str]]] = [
+        (iter(blocks), prefix, None)
+    ]
+    get_handler = RENDERERS.get
+    push = stack.append
+    while stack:
+        siblings, prefix, _ = stack[-1]
+        block = next(siblings, None)
+        if block is None:
+            closing = stack.pop()[2]
+            if closing is not None:
+                yield closing
+            continue
+
+        handler = get_handler(block.type)
+        if handler is None:
+            # Layout blocks (columns, synced blocks) pass their children through
+            if block.children:
+                push((iter(block.children), prefix, None))
+            continue
+
+        text = handler.render(block)
+        if text is not None:
+            if "\n" in text:
+                for line in text.split("\n"):
+                    yield prefix + line if line.strip() else line
+            else:
+                yield prefix + text
+        closing = (
+            prefix + handler.closing
+            if text is not None and handler.closing is not None
+            else None
+        )
+
+        if handler.render_children and block.children:
+            child_prefix = prefix + CHILD_INDENT if handler.indent_children else prefix
+            push((iter(block.children), child_prefix, closing))
+        elif closing is not None:
+            yield closing
+
+
+def render_to(blocks: List[BlockNode], out: TextIO) -> None:
+    """
+    Write the rendered text of a block tree to a file-like object.
+
+    Args:
+        blocks: Top-level blocks
+        out: Destination, e.g. a StringIO or an open file
+    """
+    write = out.write
+    lines = iter_lines(blocks)
+    first = next(lines, None)
+    if first is None:
+        return
+    write(first)
+    for line in lines:
+        write("\n" + line)
+
+
+def render_blocks(blocks: List[BlockNode]) -> str:
+    """
+    Render a block tree as text.
+
+    Args:
+        blocks: Top-level blocks
+
+    Returns:
+        Rendered text, one line per rendered block line
+    """
+    buffer = StringIO()
+    render_to(blocks, buffer)
+    return buffer.getvalue()
@@ -0,0 +1,134 @@
+"""Direct Notion REST API transport, used in place of the Notion MCP server."""
+
+import importlib.util
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from mealworm.config import Config
+from mealworm.notion_scheduler import NotionAPIError, parse_retry_after
+
+NOTION_VERSION = "2022-06-28"
+
+# MCP tool name -> (HTTP method, path template). Arguments named in the path
+# template fill it in; the rest go in the JSON body (POST) or query string (GET).
+TOOL_ENDPOINTS: Dict[str, Tuple[str, str]] = {
+    "API-post-search": ("POST", "/v1/search"),
+    "API-post-database-query": ("POST", "/v1/databases/{database_id}/query"),
+    "API-retrieve-a-database": ("GET", "/v1/databases/{database_id}"),
+    "API-retrieve-a-page": ("GET", "/v1/pages/{page_id}"),
+    "API-retrieve-a-block": ("GET", "/v1/blocks/{block_id}"),
+    "API-get-block-children": ("GET", "/v1/blocks/{block_id}/children"),
+    "API-get-self": ("GET", "/v1/users/me"),
+}
+
+
+def _http2_available() -> bool:
+    # httpx only speaks HTTP/2 when the optional h2 package is installed
+    return importlib.util.find_spec("h2") is not None
+
+
+class NotionRESTTransport:
+    """
+    Calls Notion REST endpoints by MCP tool name over one pooled HTTP client.
+
+    Connections are kept alive between calls (and multiplexed over HTTP/2 when
+    h2 is installed), so there is no subprocess to start and no per-call
+    connection setup.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = Config.NOTION_API_BASE_URL,
+        max_connections: int = Config.NOTION_MAX_CONCURRENCY,
+        timeout: float = Config.NOTION_HTTP_TIMEOUT,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max_connections
+        self.timeout = timeout
+        # Created on first call so it binds to the loop that uses it
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Notion-Version": NOTION_VERSION,
+                },
+                http2=_http2_available(),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=self.timeout,
+            )
+        return self._http
+
+    @property
+    def tool_names(self) -> List[str]:
+        return list(TOOL_ENDPOINTS)
+
+    async def call_tool(
+        self, tool_name: str, arguments: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Call the REST endpoint behind an MCP tool name.
+
+        Args:
+            tool_name: Notion MCP server tool name, e.g. 'API-post-search'
+            arguments: Tool arguments, as they would be passed to the MCP server
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            NotionAPIError: If the tool is unknown, the request fails or
+                Notion returns an error
+        """
+        if tool_name not in TOOL_ENDPOINTS:
+            raise NotionAPIError(
+                f"Tool {tool_name} not found. Available tools: {self.tool_names}"
+            )
+
+        method, path_template = TOOL_ENDPOINTS[tool_name]
+        params = dict(arguments)
+        path_args = {
+            name: params.pop(name)
+            for name in list(params)
+            if "{" + name + "}" in path_template
+        }
+        try:
+            path = path_template.format(**path_args)
+        except KeyError as e:
+            raise NotionAPIError(f"Missing argument {e} for {tool_name}")
+
+        try:
+            if method == "GET":
+                response = await self._client().get(path, params=params)
+            else:
+                response = await self._client().request(method, path, json=params)
+        except httpx.TransportError as e:
+            # Timeouts and dropped connections are worth retrying
+            raise NotionAPIError(f"Notion request failed: {e!r}", retryable=True)
+
+        if response.is_error:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            raise NotionAPIError(
+                f"Notion API error {response.status_code}: {message}",
+                status=response.status_code,
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+            )
+        return response.json()
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
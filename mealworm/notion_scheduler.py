@@ -0,0 +1,183 @@
+"""Shared rate limiting, prioritisation and retries for Notion API calls.
+
+Notion allows about 3 requests per second per integration. Every Notion call
+in the process takes a token from one shared bucket; waiting interactive calls
+always get the next token before background (sync/import) calls. Rate-limited
+and transient failures are retried with jittered exponential backoff, and a
+Retry-After from Notion pauses the whole bucket rather than just the caller.
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from enum import IntEnum
+from typing import Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from mealworm.config import Config
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: rate limited, and Notion/gateway hiccups
+RETRYABLE_STATUSES = {409, 429, 500, 502, 503, 504}
+
+
+class NotionAPIError(Exception):
+    """A Notion call failed"""
+
+    def __init__(
+        self,
+        message: str,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        retryable: Optional[bool] = None,
+    ):
+        super().__init__(message)
+        self.status = status
+        # Seconds Notion asked us to wait before retrying, if it said
+        self.retry_after = retry_after
+        self.retryable = (
+            status in RETRYABLE_STATUSES if retryable is None else retryable
+        )
+
+
+class Priority(IntEnum):
+    """Scheduling priority of a Notion call; lower values go first"""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class NotionScheduler:
+    """
+    Token bucket shared by every Notion call in the process.
+
+    Safe to use from several event loops (each NotionMCPClient runs its own),
+    since waiters only poll shared state under a thread lock.
+    """
+
+    def __init__(
+        self,
+        rate: float = Config.NOTION_REQUESTS_PER_SECOND,
+        burst: int = Config.NOTION_RATE_LIMIT_BURST,
+        max_retries: int = Config.NOTION_MAX_RETRIES,
+        backoff_base: float = Config.NOTION_BACKOFF_BASE_SECONDS,
+        backoff_max: float = Config.NOTION_BACKOFF_MAX_SECONDS,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        # Waiting callers as (priority, arrival order); the head takes next
+        self._waiters: List[Tuple[int, int]] = []
+        self._order = itertools.count()
+
+    def _wait_time(self, now: float) -> float:
+        """Refill the bucket and return seconds until a token can be taken"""
+        self._tokens = min(
+            float(self.burst), self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._tokens >= 1.0:
+            return 0.0
+        return (1.0 - self._tokens) / self.rate
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE) -> None:
+        """
+        Wait for a token.
+
+        Args:
+            priority: Callers with a lower priority value are served first
+        """
+        entry = (int(priority), next(self._order))
+        with self._lock:
+            heapq.heappush(self._waiters, entry)
+        try:
+            while True:
+                with self._lock:
+                    delay = self._wait_time(time.monotonic())
+                    if delay <= 0.0 and self._waiters[0] == entry:
+                        heapq.heappop(self._waiters)
+                        self._tokens -= 1.0
+                        return
+                # Callers behind the head re-check once the next token is due
+                await asyncio.sleep(delay if delay > 0.0 else 1.0 / self.rate / 4)
+        except BaseException:
+            with self._lock:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+            raise
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for `seconds`, e.g. after a Retry-After"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for retry number `attempt` (from 0)"""
+        return random.uniform(
+            0.0, min(self.backoff_max, self.backoff_base * 2**attempt)
+        )
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> T:
+        """
+        Run a Notion call under the rate limit, retrying transient failures.
+
+        Args:
+            call: Makes the request; called again for each retry
+            priority: Scheduling priority of the call
+
+        Returns:
+            The call's result
+
+        Raises:
+            NotionAPIError: If the call fails with a non-retryable error, or
+                still fails after max_retries retries
+        """
+        attempt = 0
+        while True:
+            await self.acquire(priority)
+            try:
+                return await call()
+            except NotionAPIError as e:
+                if not e.retryable or attempt >= self.max_retries:
+                    raise
+                if e.retry_after is not None:
+                    self.pause(e.retry_after)
+                    delay = e.retry_after
+                else:
+                    delay = self.backoff_delay(attempt)
+                attempt += 1
+                print(
+                    f"Notion call failed ({e}); retry {attempt}/{self.max_retries} "
+                    f"in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+
+notion_scheduler = NotionScheduler()
@@ -0,0 +1,379 @@
+"""Incremental mirror of Notion meal databases into the local `meals` table.
+
+Each run queries a database only for pages edited since the stored watermark
+(Notion's last_edited_time), so a run over an unchanged workspace costs one
+query per database. Deleted and archived pages are detected by a periodic full
+listing of page ids.
+
+Usage: python -m mealworm.notion_sync [--full-scan] [database_id ...]
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+
+from mealworm.compact_meals import CompactMeal
+from mealworm.config import Config
+from mealworm.db.models import MealRecord, NotionSyncState
+from mealworm.db.session import SessionLocal
+from mealworm.models import Meal
+from mealworm.notion_client import NotionMCPClient
+from mealworm.notion_scheduler import Priority
+
+# Rows written per INSERT ... ON CONFLICT statement
+UPSERT_BATCH_SIZE = 100
+
+# Meal fields mirrored into the meals table
+MEAL_COLUMNS = [
+    "title",
+    "description",
+    "cuisine_type",
+    "prep_time",
+    "cook_time",
+    "difficulty",
+    "ingredients",
+    "tags",
+    "last_made",
+    "rating",
+    "page_content",
+    "raw_notion_data",
+]
+
+
+# Columns read for CompactMeals; the rest are loaded on demand
+COMPACT_COLUMNS = ["id"] + [
+    column
+    for column in MEAL_COLUMNS
+    if column not in ("page_content", "raw_notion_data")
+]
+
+
+@dataclass
+class SyncResult:
+    """Outcome of syncing one database"""
+
+    database_id: str
+    upserted: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    failed: int = 0
+    full_scan: bool = False
+
+
+def parse_notion_time(value: str) -> datetime:
+    """Parse a Notion ISO 8601 timestamp into an aware datetime"""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def meal_to_row(meal: Meal, database_id: str) -> Dict[str, Any]:
+    """Convert a parsed Meal into a row for the meals table"""
+    row = {column: getattr(meal, column) for column in MEAL_COLUMNS}
+    if row["last_made"] is not None and row["last_made"].tzinfo is not None:
+        row["last_made"] = (
+            row["last_made"].astimezone(timezone.utc).replace(tzinfo=None)
+        )
+    row.update(
+        {
+            "id": meal.id,
+            "database_id": database_id,
+            "notion_last_edited_time": parse_notion_time(
+                meal.raw_notion_data["last_edited_time"]
+            ),
+            "synced_at": datetime.utcnow(),
+            "deleted_at": None,
+        }
+    )
+    return row
+
+
+def record_to_meal(record: MealRecord) -> Meal:
+    """Convert a row of the meals table back into a Meal"""
+    return Meal(
+        id=cast(str, record.id),
+        **{column: getattr(record, column) for column in MEAL_COLUMNS},
+    )
+
+
+def load_catalog_meals(
+    cuisine_type: Optional[str] = None, limit: Optional[int] = None
+) -> List[Meal]:
+    """
+    Read synced meals from the local catalog.
+
+    Args:
+        cuisine_type: Only return meals of this cuisine
+        limit: Maximum number of meals to return
+
+    Returns:
+        Meals that have not been deleted in Notion
+    """
+    with SessionLocal() as db:
+        query = db.query(MealRecord).filter(MealRecord.deleted_at.is_(None))
+        if cuisine_type is not None:
+            query = query.filter(MealRecord.cuisine_type == cuisine_type)
+        query = query.order_by(MealRecord.title)
+        if limit is not None:
+            query = query.limit(limit)
+        return [record_to_meal(record) for record in query]
+
+
+def load_meal_details(meal_id: str) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Read the page content and raw Notion page of one synced meal"""
+    with SessionLocal() as db:
+        row = (
+            db.query(MealRecord.page_content, MealRecord.raw_notion_data)
+            .filter(MealRecord.id == meal_id)
+            .first()
+        )
+    if row is None:
+        return None, {}
+    return row.page_content, row.raw_notion_data or {}
+
+
+def load_compact_catalog(
+    cuisine_type: Optional[str] = None, limit: Optional[int] = None
+) -> List[CompactMeal]:
+    """
+    Read synced meals as CompactMeals.
+
+    Only the scalar columns are read; page content and raw Notion data are
+    fetched per meal on first access.
+
+    Args:
+        cuisine_type: Only return meals of this cuisine
+        limit: Maximum number of meals to return
+
+    Returns:
+        Meals that have not been deleted in Notion
+    """
+    columns = [getattr(MealRecord, column) for column in COMPACT_COLUMNS]
+    with SessionLocal() as db:
+        query = db.query(*columns).filter(MealRecord.deleted_at.is_(None))
+        if cuisine_type is not None:
+            query = query.filter(MealRecord.cuisine_type == cuisine_type)
+        query = query.order_by(MealRecord.title)
+        if limit is not None:
+            query = query.limit(limit)
+        return [CompactMeal(**row._asdict(), loader=load_meal_details) for row in query]
+
+
+def _load_state(
+    database_id: str,
+) -> Tuple[Optional[datetime], Optional[datetime], Dict[str, datetime]]:
+    """Load the watermark, last full scan time and known page edit times"""
+    with SessionLocal() as db:
+        state = db.get(NotionSyncState, database_id)
+        known: Dict[str, datetime] = {
+            page_id: edited
+            for page_id, edited in db.query(
+                MealRecord.id, MealRecord.notion_last_edited_time
+            ).filter(
+                MealRecord.database_id == database_id,
+                MealRecord.deleted_at.is_(None),
+            )
+        }
+    if state is None:
+        return None, None, known
+    return (
+        cast(Optional[datetime], state.watermark),
+        cast(Optional[datetime], state.last_full_scan_at),
+        known,
+    )
+
+
+def _upsert_meals(rows: List[Dict[str, Any]]) -> None:
+    stmt = insert(MealRecord).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[MealRecord.id],
+        set_={column: stmt.excluded[column] for column in rows[0] if column != "id"},
+    )
+    with SessionLocal() as db:
+        db.execute(stmt)
+        db.commit()
+
+
+def _mark_deleted(database_id: str, page_ids: Iterable[str]) -> int:
+    page_ids = list(page_ids)
+    if not page_ids:
+        return 0
+    with SessionLocal() as db:
+        result = db.execute(
+            update(MealRecord)
+            .where(
+                MealRecord.database_id == database_id,
+                MealRecord.id.in_(page_ids),
+                MealRecord.deleted_at.is_(None),
+            )
+            .values(deleted_at=datetime.utcnow())
+        )
+        db.commit()
+        return result.rowcount
+
+
+def _save_state(
+    database_id: str, watermark: Optional[datetime], full_scan: bool
+) -> None:
+    now = datetime.utcnow()
+    values: Dict[str, Any] = {"watermark": watermark, "last_synced_at": now}
+    if full_scan:
+        values["last_full_scan_at"] = now
+    stmt = insert(NotionSyncState).values(database_id=database_id, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[NotionSyncState.database_id], set_=values
+    )
+    with SessionLocal() as db:
+        db.execute(stmt)
+        db.commit()
+
+
+async def sync_database(
+    client: NotionMCPClient, database_id: str, full_scan: Optional[bool] = None
+) -> SyncResult:
+    """
+    Mirror one Notion database into the meals table.
+
+    Args:
+        client: Notion client
+        database_id: Notion database id
+        full_scan: List every page to detect deletions. Defaults to doing so
+            when the last full scan is older than NOTION_SYNC_FULL_SCAN_HOURS
+
+    Returns:
+        Counts of upserted, unchanged, deleted and failed meals
+    """
+    watermark, last_full_scan_at, known = await asyncio.to_thread(
+        _load_state, database_id
+    )
+    if full_scan is None:
+        full_scan = last_full_scan_at is None or (
+            datetime.utcnow() - last_full_scan_at
+            >= timedelta(hours=Config.NOTION_SYNC_FULL_SCAN_HOURS)
+        )
+
+    # Notion rounds last_edited_time to the minute, so pages edited in the
+    # watermark's minute come back again; they are skipped below when their
+    # edit time matches what is stored.
+    query_filter = None
+    if watermark is not None and not full_scan:
+        query_filter = {
+            "timestamp": "last_edited_time",
+            "last_edited_time": {"on_or_after": watermark.isoformat()},
+        }
+    sorts = [{"timestamp": "last_edited_time", "direction": "ascending"}]
+
+    result = SyncResult(database_id=database_id, full_scan=full_scan)
+    seen: Set[str] = set()
+    new_watermark = watermark
+    # Edit times of pages handed to the parser that have not come back as meals
+    unparsed: Dict[str, datetime] = {}
+
+    async def changed_pages() -> AsyncIterator[Dict[str, Any]]:
+        nonlocal new_watermark
+        async for page in client.aiter_database_pages(
+            database_id, filter=query_filter, sorts=sorts
+        ):
+            if page.get("archived") or page.get("in_trash"):
+                continue
+            page_id = page.get("id", "")
+            edited = parse_notion_time(page["last_edited_time"])
+            seen.add(page_id)
+            if new_watermark is None or edited > new_watermark:
+                new_watermark = edited
+            if known.get(page_id) == edited:
+                result.unchanged += 1
+                continue
+            # Untitled pages are not meals; the parser skips them too
+            if not client.get_page_title(page):
+                continue
+            unparsed[page_id] = edited
+            yield page
+
+    batch: List[Dict[str, Any]] = []
+    async for meal in client.aiter_meals(changed_pages()):
+        unparsed.pop(meal.id, None)
+        batch.append(meal_to_row(meal, database_id))
+        if len(batch) >= UPSERT_BATCH_SIZE:
+            await asyncio.to_thread(_upsert_meals, batch)
+            result.upserted += len(batch)
+            batch = []
+    if batch:
+        await asyncio.to_thread(_upsert_meals, batch)
+        result.upserted += len(batch)
+
+    # Pages that failed to parse are logged and skipped by aiter_meals. Hold
+    # the watermark at the earliest of them so the next run fetches them again.
+    if unparsed:
+        result.failed = len(unparsed)
+        new_watermark = min(unparsed.values())
+
+    if full_scan:
+        result.deleted = await asyncio.to_thread(
+            _mark_deleted, database_id, set(known) - seen
+        )
+
+    await asyncio.to_thread(_save_state, database_id, new_watermark, full_scan)
+    return result
+
+
+async def sync_meal_catalog(
+    database_ids: Optional[List[str]] = None, full_scan: Optional[bool] = None
+) -> List[SyncResult]:
+    """
+    Mirror Notion meal databases into the meals table.
+
+    Args:
+        database_ids: Databases to sync. Defaults to NOTION_MEAL_DATABASE_IDS,
+            or to the databases found by find_meal_databases
+        full_scan: Force (or skip) the deletion scan for every database
+
+    Returns:
+        One SyncResult per database
+    """
+    client = NotionMCPClient(priority=Priority.BACKGROUND)
+    try:
+        if not database_ids:
+            database_ids = Config.NOTION_MEAL_DATABASE_IDS or [
+                db["id"] for db in await client.afind_meal_databases()
+            ]
+
+        results = []
+        for database_id in database_ids:
+            result = await sync_database(client, database_id, full_scan=full_scan)
+            print(
+                f"Synced {database_id}: {result.upserted} upserted, "
+                f"{result.unchanged} unchanged, {result.deleted} deleted, "
+                f"{result.failed} failed"
+                f"{' (full scan)' if result.full_scan else ''}"
+            )
+            results.append(result)
+        return results
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("database_ids", nargs="*", help="Notion database ids")
+    parser.add_argument(
+        "--full-scan",
+        action="store_true",
+        default=None,
+        help="List every page to detect deletions",
+    )
+    args = parser.parse_args()
+    asyncio.run(sync_meal_catalog(args.database_ids, full_scan=args.full_scan))
@@ -0,0 +1,161 @@
+"""Benchmark memory per meal and construction time of Meal vs CompactMeal.
+
+Each variant is built from freshly decoded synthetic rows (as they come back
+from the meals table or the Notion API); only the built objects are kept
+while measuring memory.
+
+Usage: python scripts/bench_compact_meals.py [--meals 5000]
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from mealworm.compact_meals import CompactMeal
+from mealworm.models import Meal
+
+CUISINES = ["Thai", "Italian", "Mexican", "Indian", "Japanese", "American", "Greek"]
+TAGS = ["quick", "chicken", "fish", "vegetarian", "spicy", "leftovers", "one-pot"]
+INGREDIENTS = ["chicken thighs", "garlic", "onion", "rice", "basil", "lime", "salmon"]
+
+
+def build_rows(count: int, seed: int = 0) -> List[str]:
+    """Build `count` synthetic meal rows, JSON-encoded"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        cuisine = rng.choice(CUISINES)
+        tags = rng.sample(TAGS, 3)
+        raw = {
+            "object": "page",
+            "id": f"page-{i}",
+            "created_time": "2025-01-01T00:00:00.000Z",
+            "last_edited_time": "2026-01-01T00:00:00.000Z",
+            "url": f"https://www.notion.so/page-{i}",
+            "properties": {
+                "Name": {
+                    "type": "title",
+                    "title": [{"type": "text", "plain_text": f"Meal {i}"}],
+                },
+                "Cuisine": {"type": "select", "select": {"name": cuisine}},
+                "Tags": {
+                    "type": "multi_select",
+                    "multi_select": [{"name": tag, "color": "blue"} for tag in tags],
+                },
+                "Link": {"type": "url", "url": f"https://example.com/recipe-{i}"},
+                "Rating": {"type": "number", "number": rng.randint(1, 5)},
+            },
+        }
+        rows.append(
+            json.dumps(
+                {
+                    "id": f"page-{i}",
+                    "title": f"Meal {i}",
+                    "description": "A weeknight favourite",
+                    "cuisine_type": cuisine,
+                    "prep_time": rng.randint(5, 30),
+                    "cook_time": rng.randint(10, 60),
+                    "difficulty": rng.choice(["Easy", "Medium"]),
+                    "ingredients": rng.sample(INGREDIENTS, 5),
+                    "tags": tags,
+                    "last_made": (
+                        datetime(2026, 1, 1) - timedelta(days=rng.randint(0, 365))
+                    ).isoformat(),
+                    "rating": rng.randint(1, 5),
+                    "page_content": "\n".join(
+                        f"- step {n}: " + " ".join(rng.sample(INGREDIENTS, 4))
+                        for n in range(40)
+                    ),
+                    "raw_notion_data": raw,
+                }
+            )
+        )
+    return rows
+
+
+def _scalar_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    del row["page_content"], row["raw_notion_data"]
+    row["last_made"] = datetime.fromisoformat(row["last_made"])
+    return row
+
+
+def _full_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    row["last_made"] = datetime.fromisoformat(row["last_made"])
+    return row
+
+
+def _no_details(meal_id: str):
+    return None, {}
+
+
+VARIANTS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "Meal": lambda row: Meal(**_full_row(row)),
+    "CompactMeal (details kept)": lambda row: CompactMeal(**_full_row(row)),
+    "CompactMeal (lazy details)": lambda row: CompactMeal(
+        **_scalar_row(row), loader=_no_details
+    ),
+}
+
+
+def measure(
+    rows: List[str], build: Callable[[Dict[str, Any]], Any]
+) -> Dict[str, float]:
+    """Return bytes held per meal and construction time per meal"""
+    # Timed without tracemalloc, which slows allocation down; best of 3
+    elapsed = float("inf")
+    for _ in range(3):
+        decoded = [json.loads(row) for row in rows]
+        gc.collect()
+        start = time.perf_counter()
+        meals = [build(row) for row in decoded]
+        elapsed = min(elapsed, time.perf_counter() - start)
+        del meals, decoded
+
+    gc.collect()
+    tracemalloc.start()
+    decoded = [json.loads(row) for row in rows]
+    meals = [build(row) for row in decoded]
+    # Drop the input rows so only what the meals themselves hold is counted
+    del decoded
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(meals) == len(rows)
+    return {
+        "bytes_per_meal": held / len(rows),
+        "us_per_meal": elapsed / len(rows) * 1e6,
+    }
+
+
+def check_round_trip(rows: List[str]) -> None:
+    """Check Meal -> CompactMeal -> Meal is lossless"""
+    for row in rows[:100]:
+        meal = Meal(**_full_row(json.loads(row)))
+        assert CompactMeal.from_meal(meal).to_meal() == meal
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meals", type=int, default=5000)
+    args = parser.parse_args()
+
+    rows = build_rows(args.meals)
+    check_round_trip(rows)
+
+    print(f"{args.meals} meals")
+    for name, build in VARIANTS.items():
+        result = measure(rows, build)
+        print(
+            f"{name:<28} {result['bytes_per_meal']:>8,.0f} bytes/meal "
+            f"{result['us_per_meal']:>8.1f} µs/meal"
+        )
+
+
+if __name__ == "__main__":
+    main()
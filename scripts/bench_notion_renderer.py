@@ -0,0 +1,130 @@
+"""Benchmark Notion block rendering throughput on synthetic pages.
+
+Builds a page of roughly --blocks blocks (paragraphs, headings, nested lists,
+toggles, tables and code) and renders it repeatedly. Exits non-zero when the
+best run is slower than --min-blocks-per-sec, so it can guard against
+renderer regressions in CI.
+
+Usage: python scripts/bench_notion_renderer.py [--blocks 10000] [--min-blocks-per-sec N]
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+from mealworm.notion_blocks import BlockNode, count_blocks
+from mealworm.notion_renderer import iter_lines, render_blocks
+
+WORDS = "salt pepper garlic onion simmer roast chop whisk fold sear braise".split()
+
+
+def _rich_text(rng: random.Random, words: int = 8) -> Dict[str, Any]:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return {"rich_text": [{"plain_text": text}]}
+
+
+def _list(rng: random.Random, block_type: str, depth: int) -> BlockNode:
+    node = BlockNode(block_type, _rich_text(rng))
+    if depth > 0:
+        node.children = [_list(rng, block_type, depth - 1) for _ in range(2)]
+    return node
+
+
+def _table(rng: random.Random, rows: int, columns: int) -> BlockNode:
+    return BlockNode(
+        "table",
+        {"table_width": columns, "has_column_header": True},
+        [
+            BlockNode(
+                "table_row",
+                {"cells": [_rich_text(rng, 2)["rich_text"] for _ in range(columns)]},
+            )
+            for _ in range(rows)
+        ],
+    )
+
+
+def build_page(total_blocks: int, seed: int = 0) -> List[BlockNode]:
+    """Build a synthetic page with about `total_blocks` blocks"""
+    rng = random.Random(seed)
+    page: List[BlockNode] = []
+    count = 0
+    while count < total_blocks:
+        section = [
+            BlockNode("heading_2", _rich_text(rng, 3)),
+            *[BlockNode("paragraph", _rich_text(rng, 20)) for _ in range(5)],
+            _list(rng, "bulleted_list_item", 2),
+            _list(rng, "numbered_list_item", 1),
+            BlockNode("to_do", {**_rich_text(rng), "checked": rng.random() < 0.5}),
+            BlockNode(
+                "toggle",
+                _rich_text(rng, 3),
+                [BlockNode("paragraph", _rich_text(rng)) for _ in range(3)],
+            ),
+            BlockNode(
+                "column_list",
+                children=[
+                    BlockNode("column", children=[BlockNode("quote", _rich_text(rng))])
+                    for _ in range(2)
+                ],
+            ),
+            _table(rng, rows=4, columns=3),
+            BlockNode("code", {**_rich_text(rng, 12), "language": "python"}),
+            BlockNode("divider"),
+        ]
+        page.extend(section)
+        count += count_blocks(section)
+    return page
+
+
+def bench(page: List[BlockNode], repeat: int) -> Dict[str, float]:
+    """Return the best blocks/sec for buffered and streaming rendering"""
+    blocks = count_blocks(page)
+    best_render = best_stream = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render_blocks(page)
+        best_render = min(best_render, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in iter_lines(page):
+            pass
+        best_stream = min(best_stream, time.perf_counter() - start)
+    return {
+        "blocks": blocks,
+        "render_blocks_per_sec": blocks / best_render,
+        "stream_blocks_per_sec": blocks / best_stream,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-blocks-per-sec",
+        type=float,
+        default=0.0,
+        help="Fail if buffered rendering is slower than this",
+    )
+    args = parser.parse_args()
+
+    page = build_page(args.blocks)
+    result = bench(page, args.repeat)
+    print(f"Blocks:           {result['blocks']}")
+    print(f"render_blocks:    {result['render_blocks_per_sec']:,.0f} blocks/s")
+    print(f"iter_lines:       {result['stream_blocks_per_sec']:,.0f} blocks/s")
+
+    if result["render_blocks_per_sec"] < args.min_blocks_per_sec:
+        print(
+            f"✗ Below threshold of {args.min_blocks_per_sec:,.0f} blocks/s",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""Benchmark ANN recall and query latency against exact search in Postgres.
+
+Loads --vectors synthetic embeddings (clustered like meal plan chunks, which
+repeat the same dishes and ingredients) into a scratch pgvector table, builds
+the index, then runs --queries nearest-neighbour searches for each search
+setting. Recall@k is measured against exact (brute-force) results, and p50/p99
+latency is reported next to a sequential scan for comparison.
+
+Usage:
+    python scripts/bench_vector_index.py --vectors 20000 --index hnsw \
+        --m 16 --ef-construction 64 --ef-search 20,40,80,160
+    python scripts/bench_vector_index.py --vectors 20000 --index ivfflat \
+        --lists 100 --probes 1,5,10,20
+"""
+
+import argparse
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+
+from mealworm.db.url import get_db_url
+
+TABLE = "ai.bench_vector_index"
+
+
+def build_vectors(count: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    """Unit vectors scattered around `clusters` random centres"""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centres[rng.integers(0, clusters, count)]
+    vectors += 0.6 * rng.standard_normal((count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def to_literal(vector: np.ndarray) -> str:
+    return "[" + ",".join(f"{x:.6f}" for x in vector) + "]"
+
+
+def load_table(conn: Connection, vectors: np.ndarray, batch_size: int = 1000) -> None:
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+    conn.execute(text("CREATE SCHEMA IF NOT EXISTS ai"))
+    conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    conn.execute(
+        text(
+            f"CREATE TABLE {TABLE} (id integer PRIMARY KEY, embedding vector({vectors.shape[1]}))"
+        )
+    )
+    for start in range(0, len(vectors), batch_size):
+        conn.execute(
+            text(
+                f"INSERT INTO {TABLE} (id, embedding) VALUES (:id, CAST(:embedding AS vector))"
+            ),
+            [
+                {"id": start + i, "embedding": to_literal(vector)}
+                for i, vector in enumerate(vectors[start : start + batch_size])
+            ],
+        )
+
+
+def exact_neighbours(vectors: np.ndarray, queries: np.ndarray, k: int) -> List[set]:
+    """Top-k ids by cosine similarity, computed in numpy"""
+    scores = queries @ vectors.T
+    top = np.argpartition(-scores, k, axis=1)[:, :k]
+    return [set(row.tolist()) for row in top]
+
+
+def run_queries(
+    conn: Connection,
+    queries: np.ndarray,
+    k: int,
+    settings: Dict[str, object],
+) -> Tuple[List[set], np.ndarray]:
+    """Run every query with the given session settings; returns ids and latencies"""
+    for name, value in settings.items():
+        conn.execute(text(f"SET {name} = {value}"))
+    statement = text(
+        f"SELECT id FROM {TABLE} ORDER BY embedding <=> CAST(:query AS vector) LIMIT :k"
+    )
+    literals = [to_literal(query) for query in queries]
+    # Warm up caches so the first settings measured are not penalised
+    conn.execute(statement, {"query": literals[0], "k": k}).all()
+
+    results, latencies = [], []
+    for literal in literals:
+        start = time.perf_counter()
+        ids = conn.execute(statement, {"query": literal, "k": k}).scalars().all()
+        latencies.append(time.perf_counter() - start)
+        results.append(set(ids))
+    for name in settings:
+        conn.execute(text(f"RESET {name}"))
+    return results, np.array(latencies) * 1000
+
+
+def report(
+    label: str, results: List[set], truth: List[set], latencies: np.ndarray, k: int
+) -> None:
+    recall = np.mean([len(got & want) / k for got, want in zip(results, truth)])
+    print(
+        f"{label:<24} recall@{k} {recall:6.3f}   "
+        f"p50 {np.percentile(latencies, 50):7.2f} ms   "
+        f"p99 {np.percentile(latencies, 99):7.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=1536, help="OpenAIEmbedder default")
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--index", choices=["hnsw", "ivfflat"], default="hnsw")
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=64)
+    parser.add_argument("--ef-search", default="20,40,80,160")
+    parser.add_argument("--lists", type=int, default=100)
+    parser.add_argument("--probes", default="1,5,10,20")
+    parser.add_argument("--maintenance-work-mem", default="1GB")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch table")
+    args = parser.parse_args()
+
+    vectors = build_vectors(args.vectors, args.dim, args.clusters)
+    # Queries are drawn from the same distribution, not from the table itself
+    queries = build_vectors(args.queries, args.dim, args.clusters, seed=1)
+    truth = exact_neighbours(vectors, queries, args.k)
+
+    engine = create_engine(get_db_url())
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        start = time.perf_counter()
+        load_table(conn, vectors)
+        print(
+            f"Loaded {args.vectors} x {args.dim} vectors in {time.perf_counter() - start:.1f}s"
+        )
+
+        try:
+            results, latencies = run_queries(
+                conn, queries, args.k, {"enable_indexscan": "off"}
+            )
+            report("exact (seq scan)", results, truth, latencies, args.k)
+
+            conn.execute(
+                text(f"SET maintenance_work_mem = '{args.maintenance_work_mem}'")
+            )
+            if args.index == "hnsw":
+                params = f"m = {args.m}, ef_construction = {args.ef_construction}"
+            else:
+                params = f"lists = {args.lists}"
+            start = time.perf_counter()
+            conn.execute(
+                text(
+                    f"CREATE INDEX ON {TABLE} USING {args.index} "
+                    f"(embedding vector_cosine_ops) WITH ({params})"
+                )
+            )
+            print(
+                f"Built {args.index} ({params}) in {time.perf_counter() - start:.1f}s"
+            )
+
+            setting = "hnsw.ef_search" if args.index == "hnsw" else "ivfflat.probes"
+            values = args.ef_search if args.index == "hnsw" else args.probes
+            for value in (int(v) for v in values.split(",")):
+                results, latencies = run_queries(
+                    conn, queries, args.k, {setting: value}
+                )
+                report(f"{setting}={value}", results, truth, latencies, args.k)
+        finally:
+            if not args.keep:
+                conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+
+if __name__ == "__main__":
+    main()
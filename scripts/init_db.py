@@ -1,6 +1,6 @@
 """Initialize database with tables for authentication and user preferences."""
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from mealworm.db.models import Base
 from mealworm.db.url import get_db_url
 
@@ -12,6 +12,10 @@ def init_db():
 
     engine = create_engine(db_url)
 
+    # past_meals has a trigram index
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
     print("Creating tables...")
     Base.metadata.create_all(bind=engine)
 
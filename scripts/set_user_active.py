@@ -0,0 +1,32 @@
+"""Activate or deactivate a user, invalidating their cached sessions in every API worker.
+
+Usage:
+    python scripts/set_user_active.py 7 --deactivate
+    python scripts/set_user_active.py 7 --activate
+"""
+
+import argparse
+import asyncio
+
+from mealworm.api.auth.cache import set_user_active
+from mealworm.db.session import async_db_engine
+
+
+async def main(user_id: int, is_active: bool) -> None:
+    try:
+        found = await set_user_active(user_id, is_active)
+    finally:
+        await async_db_engine.dispose()
+    if not found:
+        raise SystemExit(f"User {user_id} not found")
+    print(f"User {user_id} {'activated' if is_active else 'deactivated'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("user_id", type=int)
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--activate", dest="is_active", action="store_true")
+    group.add_argument("--deactivate", dest="is_active", action="store_false")
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id, args.is_active))
@@ -0,0 +1,20 @@
+from typing import Iterator
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from mealworm.db.url import get_db_url
+
+
+@pytest.fixture(scope="session")
+def db_engine() -> Iterator[Engine]:
+    """Engine for the database configured by DB_*; skips when it is unreachable"""
+    engine = create_engine(get_db_url(), connect_args={"connect_timeout": 2})
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:
+        pytest.skip(f"Database not available: {e}")
+    yield engine
+    engine.dispose()
@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+from agno.knowledge.embedder.base import Embedder
+
+from mealworm.agents import embedding_cache
+from mealworm.agents.embedding_cache import CachedEmbedder, _LRUCache
+
+
+@dataclass
+class FlakyEmbedder(Embedder):
+    """Returns [] like agno's embedders while `failing`, else a constant vector"""
+
+    dimensions: int = 4
+    failing: bool = True
+    calls: int = 0
+
+    def _embed(self) -> List[float]:
+        self.calls += 1
+        return [] if self.failing else [0.5] * self.dimensions
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self._embed()
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return self._embed(), None
+
+    def get_embeddings_batch(
+        self, texts: List[str], batch_size: int = 100
+    ) -> List[List[float]]:
+        return [self._embed() for _ in texts]
+
+
+@pytest.fixture
+def table(monkeypatch) -> Dict[str, bytes]:
+    """In-memory stand-in for the embedding_cache table"""
+    rows: Dict[str, bytes] = {}
+    monkeypatch.setattr(embedding_cache, "_memory_cache", _LRUCache(16))
+    monkeypatch.setattr(
+        embedding_cache,
+        "_load_cached",
+        lambda model, hashes: {h: rows[h] for h in hashes if h in rows},
+    )
+    monkeypatch.setattr(
+        embedding_cache,
+        "_store_cached",
+        lambda model, dimensions, entries: rows.update(entries),
+    )
+    return rows
+
+
+def test_failed_embedding_is_not_cached(table):
+    flaky = FlakyEmbedder()
+    embedder = CachedEmbedder(embedder=flaky)
+
+    assert embedder.get_embedding("Tacos") == []
+    assert table == {}
+
+    flaky.failing = False
+    assert embedder.get_embedding("Tacos") == [0.5] * 4
+    assert flaky.calls == 2
+    assert len(table) == 1
+
+
+def test_failed_batch_embeddings_are_not_cached(table):
+    flaky = FlakyEmbedder()
+    embedder = CachedEmbedder(embedder=flaky)
+
+    assert embedder.get_embeddings_batch(["Tacos", "Soup"]) == [[], []]
+    assert table == {}
+
+    flaky.failing = False
+    assert embedder.get_embeddings_batch(["Tacos", "Soup"]) == [[0.5] * 4] * 2
+    assert len(table) == 2
+
+
+def test_wrongly_sized_cached_embedding_is_recomputed(table):
+    flaky = FlakyEmbedder(failing=False)
+    embedder = CachedEmbedder(embedder=flaky)
+    table[embedding_cache.text_hash("Tacos")] = b""
+
+    assert embedder.get_embedding("Tacos") == [0.5] * 4
+    assert flaky.calls == 1
+    assert len(table[embedding_cache.text_hash("Tacos")]) == 4 * 2
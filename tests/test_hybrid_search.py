@@ -0,0 +1,79 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+from agno.agent import Agent
+from agno.knowledge.document import Document
+from agno.knowledge.embedder.base import Embedder
+from agno.knowledge.knowledge import Knowledge
+from agno.vectordb.pgvector import PgVector
+
+from mealworm.agents.hybrid_search import DATE_RANGE_FILTERS, meal_plan_retriever
+from mealworm.db.url import get_db_url
+
+
+@dataclass
+class WordEmbedder(Embedder):
+    """Embeds texts by which of a few food words they contain"""
+
+    dimensions: Optional[int] = 3
+
+    def get_embedding(self, text: str) -> List[float]:
+        text = text.lower()
+        return [float(word in text) + 0.01 for word in ("taco", "soup", "pasta")]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return self.get_embedding(text), None
+
+    async def async_get_embedding(self, text: str) -> List[float]:
+        return self.get_embedding(text)
+
+    async def async_get_embedding_and_usage(
+        self, text: str
+    ) -> Tuple[List[float], Optional[Dict]]:
+        return self.get_embedding_and_usage(text)
+
+
+@pytest.fixture
+def vector_db(db_engine):
+    vector_db = PgVector(
+        table_name="test_hybrid_search",
+        db_url=get_db_url(),
+        embedder=WordEmbedder(),
+    )
+    vector_db.drop()
+    vector_db.create()
+    documents = [
+        Document(
+            id=f"{user_id}-{date}",
+            content=f"Dinner ({date}): {meal}",
+            meta_data={"user_id": user_id, "date": date, "slot": "dinner"},
+        )
+        for user_id, date, meal in [
+            ("1", "2026-01-11", "Fish tacos"),
+            ("1", "2026-01-18", "Chicken tacos"),
+            ("2", "2026-01-18", "Beef tacos"),
+        ]
+    ]
+    vector_db.insert(content_hash="test", documents=documents)
+    yield vector_db
+    vector_db.drop()
+
+
+def test_retriever_applies_date_range_and_user(vector_db):
+    knowledge = Knowledge(vector_db=vector_db)
+    knowledge.add_filters({key: None for key in DATE_RANGE_FILTERS})
+    agent = Agent(
+        knowledge=knowledge, knowledge_retriever=meal_plan_retriever, user_id="1"
+    )
+
+    documents = asyncio.run(
+        agent.aget_relevant_docs_from_knowledge(
+            "tacos", num_documents=5, filters={"date_from": "2026-01-15"}
+        )
+    )
+
+    assert [document["content"] for document in documents] == [
+        "Dinner (2026-01-18): Chicken tacos"
+    ]
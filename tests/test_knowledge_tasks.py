@@ -0,0 +1,21 @@
+import asyncio
+
+from mealworm.agents.knowledge_tasks import KnowledgeLoadStatus, KnowledgeLoadTasks
+
+
+def test_cancel_returns_cancelled_status():
+    async def loader(progress):
+        progress.files_discovered = 3
+        await asyncio.sleep(60)
+
+    async def start_and_cancel():
+        tasks = KnowledgeLoadTasks()
+        progress = tasks.start("meal_planning_agent", loader)
+        await asyncio.sleep(0)
+        return await tasks.cancel(progress.task_id), tasks
+
+    progress, tasks = asyncio.run(start_and_cancel())
+
+    assert progress.status == KnowledgeLoadStatus.CANCELLED
+    assert progress.files_discovered == 3
+    assert tasks.running("meal_planning_agent") is None
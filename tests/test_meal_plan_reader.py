@@ -0,0 +1,55 @@
+from mealworm.agents.meal_plan_reader import MealPlanReader, detect_protein
+
+PLAN = """# Meal Plan: Week of January 11, 2026
+
+# Sunday
+Snack: Apple slices
+Snacks: Popcorn
+
+# Saturday
+Dinner: Ham and cheese toasties
+"""
+
+
+def test_document_ids_are_user_scoped():
+    first = MealPlanReader(user_id="1").parse(PLAN, "2026-01-11")
+    second = MealPlanReader(user_id="2").parse(PLAN, "2026-01-11")
+
+    assert [d.content for d in first] == [d.content for d in second]
+    assert not {d.id for d in first} & {d.id for d in second}
+    assert all(d.id.startswith("1-") for d in first)
+
+
+def test_repeated_slot_gets_a_unique_id():
+    documents = MealPlanReader(user_id="1").parse(PLAN, "2026-01-11")
+
+    assert [d.id for d in documents] == [
+        "1-2026-01-11-0-sunday-snack",
+        "1-2026-01-11-0-sunday-snack-2",
+        "1-2026-01-11-6-saturday-dinner",
+    ]
+
+
+def test_notes_and_eating_out_are_dropped():
+    plan = """# Meal Plan: Week of January 11, 2026
+
+# Friday
+Lunch: Eating out
+Dinner: Chicken burgers
+Serve with oven fries.
+
+## Notes / Constraints
+- No fish this week
+"""
+    (document,) = MealPlanReader().parse(plan, "2026-01-11")
+
+    assert document.meta_data["meal"] == "Chicken burgers"
+    assert document.content.endswith("Serve with oven fries.")
+    assert document.meta_data["protein"] == "chicken"
+
+
+def test_protein_keywords_match_whole_words():
+    assert detect_protein("Ham and cheese toasties", "") == "pork"
+    assert detect_protein("Grilled hamburgers", "") is None
+    assert detect_protein("Spaghetti and meatballs", "") == "beef"
+    assert detect_protein("Beans on toast", "") == "vegetarian"
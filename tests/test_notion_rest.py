@@ -0,0 +1,176 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from mealworm.config import Config
+from mealworm.notion_client import NotionMCPClient
+from mealworm.notion_rest import NotionRESTTransport
+from mealworm.notion_scheduler import NotionAPIError, NotionScheduler
+
+
+class StubNotion(BaseHTTPRequestHandler):
+    """Answers each path with the next of its queued (status, body, headers)"""
+
+    queued: Dict[str, List[Tuple[int, Dict[str, Any], Dict[str, str]]]] = {}
+    requests: List[Dict[str, Any]] = []
+
+    def _respond(self):
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        self.requests.append(
+            {
+                "method": self.command,
+                "path": url.path,
+                "query": parse_qs(url.query),
+                "body": body,
+                "authorization": self.headers.get("Authorization"),
+            }
+        )
+        queue = self.queued.get(url.path)
+        status, payload, headers = queue.pop(0) if queue else (404, {}, {})
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def notion_server():
+    StubNotion.queued = {}
+    StubNotion.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubNotion)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def ok(payload):
+    return (200, payload, {})
+
+
+@pytest.fixture
+def rest_client(notion_server, monkeypatch):
+    monkeypatch.setattr(Config, "NOTION_API_KEY", "secret")
+    monkeypatch.setattr(Config, "NOTION_TRANSPORT", "rest")
+    client = NotionMCPClient()
+    client.client = NotionRESTTransport("secret", base_url=notion_server)
+    yield client
+    client.close()
+
+
+def test_database_query_follows_cursors(rest_client):
+    StubNotion.queued["/v1/databases/db1/query"] = [
+        ok(
+            {
+                "results": [{"id": "p1"}, {"id": "p2"}],
+                "has_more": True,
+                "next_cursor": "c1",
+            }
+        ),
+        ok({"results": [{"id": "p3"}], "has_more": False, "next_cursor": None}),
+    ]
+
+    async def collect():
+        return [page["id"] async for page in rest_client.aiter_database_pages("db1")]
+
+    assert asyncio.run(collect()) == ["p1", "p2", "p3"]
+
+    first, second = StubNotion.requests
+    assert first["method"] == "POST"
+    assert first["authorization"] == "Bearer secret"
+    assert first["body"] == {"page_size": 100}
+    assert second["body"] == {"page_size": 100, "start_cursor": "c1"}
+
+
+def test_block_children_fetch(rest_client):
+    StubNotion.queued["/v1/blocks/page1/children"] = [
+        ok({"results": [{"id": "b1", "type": "paragraph"}], "has_more": False}),
+    ]
+
+    blocks = asyncio.run(rest_client.aget_page_blocks("page1"))
+
+    assert [block["id"] for block in blocks] == ["b1"]
+    (request,) = StubNotion.requests
+    assert request["method"] == "GET"
+    assert request["query"] == {"page_size": ["100"]}
+
+
+def test_rate_limited_call_is_retried(notion_server):
+    StubNotion.queued["/v1/pages/p1"] = [
+        (429, {"message": "Rate limited"}, {"Retry-After": "0"}),
+        ok({"id": "p1"}),
+    ]
+    transport = NotionRESTTransport("secret", base_url=notion_server)
+    scheduler = NotionScheduler(rate=100, burst=10, max_retries=2)
+
+    async def call():
+        try:
+            return await scheduler.run(
+                lambda: transport.call_tool("API-retrieve-a-page", {"page_id": "p1"})
+            )
+        finally:
+            await transport.aclose()
+
+    assert asyncio.run(call()) == {"id": "p1"}
+    assert len(StubNotion.requests) == 2
+
+
+def test_server_error_raises_after_retries(notion_server):
+    StubNotion.queued["/v1/pages/p1"] = [
+        (503, {"message": "Service unavailable"}, {}) for _ in range(3)
+    ]
+    transport = NotionRESTTransport("secret", base_url=notion_server)
+    scheduler = NotionScheduler(rate=100, burst=10, max_retries=2, backoff_base=0)
+
+    async def call():
+        try:
+            return await scheduler.run(
+                lambda: transport.call_tool("API-retrieve-a-page", {"page_id": "p1"})
+            )
+        finally:
+            await transport.aclose()
+
+    with pytest.raises(NotionAPIError) as error:
+        asyncio.run(call())
+    assert error.value.status == 503
+    assert error.value.retryable
+    assert "Service unavailable" in str(error.value)
+    assert len(StubNotion.requests) == 3
+
+
+def test_client_error_is_not_retryable(notion_server):
+    StubNotion.queued["/v1/pages/missing"] = [
+        (404, {"message": "Could not find page"}, {}),
+    ]
+    transport = NotionRESTTransport("secret", base_url=notion_server)
+
+    async def call():
+        try:
+            return await transport.call_tool(
+                "API-retrieve-a-page", {"page_id": "missing"}
+            )
+        finally:
+            await transport.aclose()
+
+    with pytest.raises(NotionAPIError) as error:
+        asyncio.run(call())
+    assert error.value.status == 404
+    assert not error.value.retryable
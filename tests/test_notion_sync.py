@@ -0,0 +1,82 @@
+import asyncio
+from datetime import datetime
+
+from mealworm import notion_sync
+from mealworm.models import Meal
+from mealworm.notion_client import NotionMCPClient
+
+
+def make_page(page_id, edited, title="Tacos"):
+    return {
+        "id": page_id,
+        "last_edited_time": edited,
+        "properties": {
+            "Name": {"type": "title", "title": [{"plain_text": title}]},
+        },
+    }
+
+
+class FakeClient(NotionMCPClient):
+    """Serves fixed pages; parsing a page listed in `broken` fails"""
+
+    def __init__(self, pages, broken=()):
+        self.pages = pages
+        self.broken = set(broken)
+
+    async def aiter_database_pages(self, database_id, filter=None, sorts=None):
+        for page in self.pages:
+            yield page
+
+    async def _aparse_page_to_meal(self, page):
+        if page["id"] in self.broken:
+            raise ValueError("unparseable page")
+        return Meal(
+            id=page["id"], title=self.get_page_title(page), raw_notion_data=page
+        )
+
+
+def run_sync(monkeypatch, client):
+    saved = {}
+    upserted = []
+    monkeypatch.setattr(notion_sync, "_load_state", lambda _: (None, None, {}))
+    monkeypatch.setattr(notion_sync, "_upsert_meals", upserted.extend)
+    monkeypatch.setattr(
+        notion_sync,
+        "_save_state",
+        lambda _, watermark, full_scan: saved.update(watermark=watermark),
+    )
+    result = asyncio.run(notion_sync.sync_database(client, "db", full_scan=False))
+    return result, saved["watermark"], [row["id"] for row in upserted]
+
+
+def test_watermark_held_at_earliest_failed_page(monkeypatch):
+    client = FakeClient(
+        [
+            make_page("a", "2026-01-01T10:00:00.000Z"),
+            make_page("b", "2026-01-02T10:00:00.000Z"),
+            make_page("c", "2026-01-03T10:00:00.000Z"),
+            make_page("d", "2026-01-04T10:00:00.000Z"),
+        ],
+        broken={"b", "c"},
+    )
+
+    result, watermark, upserted = run_sync(monkeypatch, client)
+
+    assert sorted(upserted) == ["a", "d"]
+    assert result.failed == 2
+    assert watermark == datetime.fromisoformat("2026-01-02T10:00:00+00:00")
+
+
+def test_watermark_passes_untitled_pages(monkeypatch):
+    client = FakeClient(
+        [
+            make_page("a", "2026-01-01T10:00:00.000Z"),
+            make_page("b", "2026-01-02T10:00:00.000Z", title=""),
+        ]
+    )
+
+    result, watermark, upserted = run_sync(monkeypatch, client)
+
+    assert upserted == ["a"]
+    assert result.failed == 0
+    assert watermark == datetime.fromisoformat("2026-01-02T10:00:00+00:00")
@@ -0,0 +1,45 @@
+from datetime import date
+from typing import Any, List
+
+from mealworm.agents import past_meals
+from mealworm.agents.past_meals import extract_meals, record_meals
+
+PLAN = """# Meal Plan: Week of January 11, 2026
+
+# Sunday
+Snack: Apple slices
+Snacks: Popcorn
+Dinner: Baja fish tacos
+"""
+
+
+class FakeSession:
+    """Captures the statements executed in place of a database session"""
+
+    statements: List[Any] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement):
+        self.statements.append(statement)
+
+    def commit(self):
+        pass
+
+
+def test_record_meals_writes_each_slot_once(monkeypatch):
+    monkeypatch.setattr(past_meals, "SessionLocal", FakeSession)
+    FakeSession.statements = []
+    meals = extract_meals(PLAN, date(2026, 1, 11))
+    assert [meal.slot for meal in meals] == ["snack", "snack", "dinner"]
+
+    record_meals(1, meals, "historical")
+
+    (statement,) = FakeSession.statements
+    rows = statement.compile().params
+    names = [value for key, value in rows.items() if key.startswith("name_")]
+    assert sorted(names) == ["Baja fish tacos", "Popcorn"]
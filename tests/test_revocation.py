@@ -0,0 +1,37 @@
+import asyncio
+
+from mealworm.api.auth import revocation
+from mealworm.api.auth.revocation import RevocationList
+
+
+class FakeSession:
+    """Returns one revoked jti, after yielding to the event loop"""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def scalars(self, statement):
+        await asyncio.sleep(0.01)
+        return self
+
+    def all(self):
+        return ["stored"]
+
+
+def test_revocation_during_load_is_kept(monkeypatch):
+    monkeypatch.setattr(revocation, "AsyncSessionLocal", FakeSession)
+    revocations = RevocationList(capacity=10)
+
+    async def revoke_during_load():
+        load = asyncio.create_task(revocations.load())
+        await asyncio.sleep(0)
+        revocations.handle_notification('{"jtis": ["notified"]}')
+        await load
+
+    asyncio.run(revoke_during_load())
+
+    assert "stored" in revocations._filter
+    assert "notified" in revocations._filter
@@ -0,0 +1,16 @@
+from sqlalchemy import text
+
+from mealworm.agents.vector_index import set_maintenance_work_mem
+
+
+def test_set_maintenance_work_mem_for_transaction(db_engine):
+    with db_engine.connect() as conn, conn.begin():
+        set_maintenance_work_mem(conn, "96MB", local=True)
+        assert conn.execute(text("SHOW maintenance_work_mem")).scalar() == "96MB"
+
+
+def test_set_maintenance_work_mem_for_session(db_engine):
+    with db_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        set_maintenance_work_mem(conn, "80MB", local=False)
+        conn.execute(text("SELECT 1"))
+        assert conn.execute(text("SHOW maintenance_work_mem")).scalar() == "80MB"